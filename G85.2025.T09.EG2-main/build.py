@@ -4,6 +4,7 @@ from pybuilder.core import use_plugin, init
 use_plugin("python.core")
 use_plugin("python.unittest")
 use_plugin("python.coverage")
+use_plugin("python.distutils")
 
 
 name = "G8X.2025.TYY.GE2"
@@ -12,4 +13,6 @@ default_task = "publish"
 
 @init
 def set_properties(project):
-    pass
+    # Carga masiva desde JSON Lines: uc3m-money transfers|deposits [fichero]
+    project.set_property("distutils_console_scripts",
+                         ["uc3m-money = uc3m_money.cli:main"])
@@ -0,0 +1,86 @@
+"""Throughput de transfer_request con varios procesos escritores (process_safe=True).
+
+Cada proceso solicita --records transferencias sobre la misma carpeta; el cerrojo de
+fichero evita perder registros y el group commit junta en una escritura los registros
+de los escritores que esperan, por lo que el throughput total crece con los escritores.
+
+Uso (desde la raiz del proyecto):
+    PYTHONPATH=src/main/python python src/benchmark/python/bench_concurrent_writers.py \
+        --writers 1,2,4,8 --records 200 --preload 10000
+"""
+import argparse
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from uc3m_money import AccountManager
+
+IBAN = "ES9121000418450200051332"
+
+
+def writer(folder: str, writer_id: int, records: int, journal: bool):
+    """Proceso escritor"""
+    manager = AccountManager(json_folder=folder, process_safe=True, journal=journal)
+    for index in range(records):
+        manager.transfer_request(IBAN, "ES6160606457126971492537",
+                                 f"Pago {writer_id} numero {index}", "ORDINARY", "01/01/2049",
+                                 10.0 + index % 9000)
+
+
+def preload(folder: str, records: int, journal: bool):
+    """Ledger inicial de records transferencias"""
+    transfers = [{"from_iban": IBAN, "to_iban": IBAN, "transfer_type": "ORDINARY",
+                  "transfer_amount": 100.0, "transfer_concept": "Pago previo",
+                  "transfer_date": "01/01/2049", "time_stamp": 1748000000.0 + index,
+                  "transfer_code": f"{index:032x}"} for index in range(records)]
+    manager = AccountManager(json_folder=folder, journal=journal)
+    if journal:
+        manager.journal.append_many(transfers)
+    else:
+        with open(manager.transactions_file, "w", encoding="utf-8") as file:
+            json.dump(transfers, file, indent=4)
+
+
+def run(writers: int, records: int, preload_records: int, journal: bool) -> dict:
+    """Lanza los escritores y mide el throughput total"""
+    folder = tempfile.mkdtemp(prefix="uc3m_money_writers_")
+    try:
+        preload(folder, preload_records, journal)
+        processes = [multiprocessing.Process(target=writer,
+                                             args=(folder, index, records, journal))
+                     for index in range(writers)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        stored = len(AccountManager(json_folder=folder, journal=journal).read_transactions())
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    expected = preload_records + writers * records
+    return {"writers": writers, "records": writers * records, "seconds": elapsed,
+            "throughput_ops": writers * records / elapsed, "lost": expected - stored}
+
+
+def main(argv=None):
+    """Ejecuta el benchmark y escribe los resultados en JSON por stdout"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", default="1,2,4,8")
+    parser.add_argument("--records", type=int, default=200, help="transferencias por escritor")
+    parser.add_argument("--preload", type=int, default=10000, help="transferencias previas")
+    parser.add_argument("--journal", action="store_true", help="usar transactions.jsonl")
+    args = parser.parse_args(argv)
+    results = []
+    for writers in (int(value) for value in args.writers.split(",")):
+        result = run(writers, args.records, args.preload, args.journal)
+        print(f"{writers} escritores: {result['throughput_ops']:.1f} ops/s, "
+              f"perdidos {result['lost']}", file=sys.stderr)
+        results.append(result)
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark de deposit_into_account con y sin WAL de ingresos.
+
+Compara la reescritura de deposits.json en cada ingreso con el WAL en sus tres modos
+de durabilidad (fsync en cada registro, por lotes y sin fsync) y escribe en JSON el
+throughput y la latencia p50/p99 de cada modo.
+
+Uso (desde la raiz del proyecto):
+    PYTHONPATH=src/main/python python src/benchmark/python/bench_deposit_wal.py \
+        --deposits 2000 --output bench_wal.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from bench_report import write_report
+from uc3m_money import AccountManager
+
+MODES = ("rewrite", "always", "batch", "none")
+
+
+def bench_mode(mode: str, deposits: int, work_folder: str) -> dict:
+    """Ingresa deposits ficheros con el modo indicado, incluido el checkpoint final"""
+    folder = os.path.join(work_folder, mode)
+    os.makedirs(folder)
+    input_files = []
+    for index in range(deposits):
+        input_file = os.path.join(folder, f"deposit_{index}.json")
+        with open(input_file, "w", encoding="utf-8") as file:
+            json.dump({"IBAN": "ES9121000418450200051332",
+                       "AMOUNT": f"EUR {100 + index}.00"}, file)
+        input_files.append(input_file)
+
+    manager = AccountManager(json_folder=folder,
+                             deposit_wal=None if mode == "rewrite" else mode)
+    latencies = []
+    start = time.perf_counter()
+    for input_file in input_files:
+        call_start = time.perf_counter()
+        manager.deposit_into_account(input_file)
+        latencies.append(time.perf_counter() - call_start)
+    manager.close()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {"mode": mode, "deposits": deposits,
+            "throughput_ops": deposits / elapsed if elapsed else None,
+            "p50_ms": latencies[int(0.50 * (deposits - 1))] * 1000,
+            "p99_ms": latencies[int(0.99 * (deposits - 1))] * 1000}
+
+
+def main(argv=None):
+    """Ejecuta el benchmark y escribe los resultados en JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deposits", type=int, default=2000,
+                        help="ingresos por modo")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help="modos separados por comas (rewrite = sin WAL)")
+    parser.add_argument("--output", help="fichero JSON de resultados (por defecto stdout)")
+    args = parser.parse_args(argv)
+
+    work_folder = tempfile.mkdtemp(prefix="uc3m_money_bench_wal_")
+    try:
+        results = []
+        for mode in args.modes.split(","):
+            result = bench_mode(mode, args.deposits, work_folder)
+            results.append(result)
+            print(f"{mode:8} {result['throughput_ops']:10.1f} ops/s, "
+                  f"p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms",
+                  file=sys.stderr)
+        write_report(results, args.output)
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Benchmark de las operaciones principales de uc3m_money sobre ledgers sinteticos.
+
+Mide transfer_request, deposit_into_account, calculate_balance, calculate_balances
+(con grupos de BALANCE_GROUP IBAN) y validate_iban con
+1k, 10k, 100k y 1M registros ya guardados, y escribe en JSON el throughput, la
+latencia p50/p99 y el pico de memoria de cada operacion.
+
+Uso (desde la raiz del proyecto):
+    PYTHONPATH=src/main/python python src/benchmark/python/bench_hot_paths.py \
+        --sizes 1000,10000 --calls 50 --storage journal --output bench.json
+"""
+
+# pylint: disable=too-many-locals
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from bench_report import make_iban, write_report
+from uc3m_money import AccountManager, MemoryStorage
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+STORAGES = {
+    "json": {},
+    "journal": {"journal": True},
+    "streaming": {"streaming": True},
+    "balance_index": {"balance_index": True},
+    "ledger_snapshot": {"ledger_snapshot": True},
+    "sqlite": {},
+    "memory": {},
+}
+MEMORY_CALLS = 3
+# IBAN por llamada a calculate_balances
+BALANCE_GROUP = 10
+
+
+class SyntheticLedger:
+    """Genera los ficheros de datos de una carpeta con size registros cada uno"""
+
+    def __init__(self, size: int, seed: int = 97):
+        self.size = size
+        self.generator = random.Random(seed)
+        self.ibans = [make_iban(self.generator) for _ in range(max(10, size // 100))]
+
+    def transfers(self):
+        """Transferencias ya guardadas (formato TransferRequest.to_json)"""
+        return [{"from_iban": self.generator.choice(self.ibans),
+                 "to_iban": self.generator.choice(self.ibans),
+                 "transfer_type": "ORDINARY",
+                 "transfer_amount": 100.0,
+                 "transfer_concept": "Pago sintetico",
+                 "transfer_date": "01/01/2049",
+                 "time_stamp": 1748000000.0 + index,
+                 "transfer_code": f"{index:032x}"} for index in range(self.size)]
+
+    def deposits(self):
+        """Ingresos ya guardados (formato de deposits.json)"""
+        return [{"alg": "SHA-256", "typ": "DEPOSIT",
+                 "iban": self.generator.choice(self.ibans),
+                 "amount": "100.00", "deposit_date": 1748000000.0 + index,
+                 "deposit_signature": f"{index:064x}"} for index in range(self.size)]
+
+    def movements(self):
+        """Movimientos de transactions2.json"""
+        return [{"IBAN": self.generator.choice(self.ibans),
+                 "amount": f"{self.generator.uniform(-500, 500):+.2f}"}
+                for _ in range(self.size)]
+
+    def populate(self, manager: AccountManager):
+        """Guarda el ledger sintetico con el almacen del gestor"""
+        manager.storage.add_transfers(self.transfers())
+        manager.storage.add_deposits(self.deposits())
+        manager.storage.add_movements(self.movements())
+
+
+def measure(operation, calls: int) -> dict:
+    """Ejecuta operation(i) calls veces y calcula throughput, p50, p99 y pico de memoria"""
+    latencies = []
+    start = time.perf_counter()
+    for index in range(calls):
+        call_start = time.perf_counter()
+        operation(index)
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    # La memoria se mide aparte porque tracemalloc ralentiza las llamadas
+    tracemalloc.start()
+    for index in range(calls, calls + MEMORY_CALLS):
+        operation(index)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {"calls": calls,
+            "throughput_ops": calls / elapsed if elapsed else None,
+            "p50_ms": latencies[int(0.50 * (calls - 1))] * 1000,
+            "p99_ms": latencies[int(0.99 * (calls - 1))] * 1000,
+            "peak_memory_bytes": peak}
+
+
+def bench_size(size: int, calls: int, storage: str, work_folder: str) -> list:
+    """Mide las operaciones con un ledger de size registros"""
+    folder = os.path.join(work_folder, f"ledger_{size}")
+    os.makedirs(folder)
+    options = dict(STORAGES[storage])
+    if storage == "sqlite":
+        options["database"] = os.path.join(folder, "uc3m_money.db")
+    elif storage == "memory":
+        options["storage"] = MemoryStorage()
+    manager = AccountManager(json_folder=folder, **options)
+    ledger = SyntheticLedger(size)
+    ledger.populate(manager)
+
+    total_calls = calls + MEMORY_CALLS
+    deposit_files = []
+    for index in range(total_calls):
+        deposit_file = os.path.join(folder, f"deposit_{index}.json")
+        with open(deposit_file, "w", encoding="utf-8") as file:
+            json.dump({"IBAN": ledger.ibans[index % len(ledger.ibans)],
+                       "AMOUNT": f"EUR {100 + index}.00"}, file)
+        deposit_files.append(deposit_file)
+    ibans = ledger.ibans
+
+    operations = {
+        "transfer_request": lambda i: manager.transfer_request(
+            ibans[i % len(ibans)], ibans[(i + 1) % len(ibans)], f"Pago numero {i}",
+            "ORDINARY", "01/01/2049", 10.0 + i),
+        "deposit_into_account": lambda i: manager.deposit_into_account(deposit_files[i]),
+        "calculate_balance": lambda i: manager.calculate_balance(ibans[i % len(ibans)]),
+        "calculate_balances": lambda i: manager.calculate_balances(
+            ibans[j % len(ibans)] for j in range(i * BALANCE_GROUP, (i + 1) * BALANCE_GROUP)),
+        "validate_iban": lambda i: manager.validate_iban(ibans[i % len(ibans)]),
+    }
+    results = []
+    for name, operation in operations.items():
+        result = {"operation": name, "records": size, "storage": storage}
+        result.update(measure(operation, calls))
+        results.append(result)
+        print(f"{name:22} {size:>8} registros: {result['throughput_ops']:10.1f} ops/s, "
+              f"p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms, "
+              f"pico {result['peak_memory_bytes'] / 1024:.0f} KiB", file=sys.stderr)
+    manager.close()
+    return results
+
+
+def main(argv=None):
+    """Ejecuta el benchmark y escribe los resultados en JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="tamaños de ledger separados por comas")
+    parser.add_argument("--calls", type=int, default=100,
+                        help="llamadas medidas por operacion y tamaño")
+    parser.add_argument("--storage", choices=sorted(STORAGES), default="json")
+    parser.add_argument("--output", help="fichero JSON de resultados (por defecto stdout)")
+    args = parser.parse_args(argv)
+
+    work_folder = tempfile.mkdtemp(prefix="uc3m_money_bench_")
+    try:
+        results = []
+        for size in (int(size) for size in args.sizes.split(",")):
+            results.extend(bench_size(size, args.calls, args.storage, work_folder))
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
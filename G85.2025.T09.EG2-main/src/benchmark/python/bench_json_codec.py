@@ -0,0 +1,85 @@
+"""Benchmark del formato de los ficheros JSON guardados.
+
+Compara el formato original (json con indent=4) con el compacto de json_codec, con
+json de la biblioteca estandar y con orjson si esta instalado, sobre transferencias,
+ingresos y saldos sinteticos. Escribe en JSON el tamaño del fichero y los tiempos
+de codificacion y decodificacion de cada formato.
+
+Uso (desde la raiz del proyecto):
+    PYTHONPATH=src/main/python python src/benchmark/python/bench_json_codec.py \
+        --records 100000 --output bench_codec.json
+"""
+
+import argparse
+import random
+import sys
+import time
+from unittest import mock
+from bench_report import make_iban, write_report
+from uc3m_money import json_codec
+
+REPEAT = 3
+
+
+def datasets(records: int) -> dict:
+    """Transferencias, ingresos y saldos con el formato de sus ficheros"""
+    generator = random.Random(97)
+    ibans = [make_iban(generator) for _ in range(max(10, records // 100))]
+    transfers = [{"from_iban": generator.choice(ibans), "to_iban": generator.choice(ibans),
+                  "transfer_type": "ORDINARY", "transfer_amount": 10.0 + index % 9990,
+                  "transfer_concept": "Pago sintetico", "transfer_date": "01/01/2049",
+                  "time_stamp": 1748000000.0 + index, "transfer_code": f"{index:032x}"}
+                 for index in range(records)]
+    deposits = [{"alg": "SHA-256", "typ": "DEPOSIT", "iban": generator.choice(ibans),
+                 "amount": f"{100 + index % 1000}.00", "deposit_date": 1748000000.0 + index,
+                 "deposit_signature": f"{index:064x}"} for index in range(records)]
+    balances = [{"iban": iban, "saldos": round(generator.uniform(-1e4, 1e4), 2),
+                 "timestamp": 1748000000.0} for iban in ibans]
+    return {"transactions.json": transfers, "deposits.json": deposits,
+            "saldos.json": balances}
+
+
+def best_time(function, *args) -> float:
+    """Mejor tiempo de REPEAT ejecuciones de function(*args)"""
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_format(name: str, data: list, codec: str) -> dict:
+    """Tamaño y tiempos de un fichero con el formato indicado"""
+    pretty = codec == "indent4"
+    backend = json_codec.orjson if codec == "orjson" else None
+    with mock.patch.object(json_codec, "orjson", backend):
+        raw = json_codec.dumps(data, pretty)
+        return {"file": name, "format": codec, "records": len(data), "bytes": len(raw),
+                "encode_ms": best_time(json_codec.dumps, data, pretty) * 1000,
+                "decode_ms": best_time(json_codec.loads, raw) * 1000}
+
+
+def main(argv=None):
+    """Ejecuta el benchmark y escribe los resultados en JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000,
+                        help="transferencias e ingresos por fichero")
+    parser.add_argument("--output", help="fichero JSON de resultados (por defecto stdout)")
+    args = parser.parse_args(argv)
+
+    codecs = ["indent4", "compact"] + (["orjson"] if json_codec.orjson is not None else [])
+    results = []
+    for name, data in datasets(args.records).items():
+        for codec in codecs:
+            result = bench_format(name, data, codec)
+            results.append(result)
+            print(f"{name:18} {codec:8} {result['bytes'] / 1024:10.0f} KiB, "
+                  f"codificar {result['encode_ms']:8.1f} ms, "
+                  f"decodificar {result['decode_ms']:8.1f} ms", file=sys.stderr)
+
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
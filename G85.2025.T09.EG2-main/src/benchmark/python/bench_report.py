@@ -0,0 +1,23 @@
+"""Utilidades comunes de los benchmarks: datos sinteticos e informe JSON."""
+
+import json
+import platform
+
+
+def make_iban(generator):
+    """IBAN español valido con BBAN aleatorio"""
+    bban = "".join(generator.choice("0123456789") for _ in range(20))
+    check = 98 - int(bban + "142800") % 97
+    return f"ES{check:02d}{bban}"
+
+
+def write_report(results: list, output: str = None):
+    """Escribe los resultados con la version de Python y la plataforma en output
+    (o en stdout si no se indica)"""
+    report = json.dumps({"python": platform.python_version(), "platform": platform.platform(),
+                         "results": results}, indent=4)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(report)
+    else:
+        print(report)
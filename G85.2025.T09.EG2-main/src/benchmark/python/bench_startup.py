@@ -0,0 +1,100 @@
+"""Benchmark del arranque en frio de uc3m_money.
+
+Lanza procesos nuevos de Python con -X importtime para cada escenario (solo el
+interprete, importar el paquete, crear el AccountManager y validar un IBAN) y escribe
+en JSON la mediana del tiempo total de cada proceso y los modulos que mas tardan en
+importarse, como lo pagaria un trabajo de cron o una invocacion de la linea de comandos.
+
+Uso (desde la raiz del proyecto):
+    PYTHONPATH=src/main/python python src/benchmark/python/bench_startup.py \
+        --runs 20 --output bench_startup.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from bench_report import write_report
+
+SCENARIOS = {
+    "python": "pass",
+    "import": "import uc3m_money",
+    "account_manager": "import sys, uc3m_money; "
+                       "uc3m_money.AccountManager(json_folder=sys.argv[1])",
+    "validate_iban": "import sys, uc3m_money; "
+                     "uc3m_money.AccountManager(json_folder=sys.argv[1])"
+                     ".validate_iban('ES9121000418450200051332')",
+}
+TOP_IMPORTS = 10
+
+
+def parse_importtime(stderr: str):
+    """Tiempo acumulado (microsegundos) de cada modulo de la salida de -X importtime y
+    suma de los modulos de primer nivel (el tiempo total de importacion)"""
+    cumulative = {}
+    total_imports = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        if not total.strip().isdigit():
+            continue
+        cumulative[name.strip()] = int(total)
+        # Los modulos importados por otro van indentados bajo el
+        if not name[1:].startswith(" "):
+            total_imports += int(total)
+    return cumulative, total_imports
+
+
+def bench_scenario(code: str, runs: int, json_folder: str) -> dict:
+    """Mediana del tiempo de proceso y modulos mas lentos de importar"""
+    env = dict(os.environ)
+    env.pop("UC3M_MONEY_PROFILE", None)
+    elapsed = []
+    import_totals = []
+    imports = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code, json_folder],
+                                env=env, capture_output=True, text=True, check=True)
+        elapsed.append(time.perf_counter() - start)
+        cumulative, total_imports = parse_importtime(result.stderr)
+        import_totals.append(total_imports)
+        for name, micros in cumulative.items():
+            imports.setdefault(name, []).append(micros)
+    medians = {name: statistics.median(values) for name, values in imports.items()}
+    slowest = sorted(medians.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+    return {"runs": runs,
+            "p50_ms": statistics.median(elapsed) * 1000,
+            "min_ms": min(elapsed) * 1000,
+            "imports_ms": statistics.median(import_totals) / 1000,
+            "slowest_imports_ms": {name: micros / 1000 for name, micros in slowest}}
+
+
+def main(argv=None):
+    """Ejecuta el benchmark y escribe los resultados en JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="procesos por escenario")
+    parser.add_argument("--output", help="fichero JSON de resultados (por defecto stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="uc3m_money_bench_") as work_folder:
+        for name, code in SCENARIOS.items():
+            # Carpeta que no existe: el arranque no debe crearla
+            json_folder = os.path.join(work_folder, name)
+            result = {"scenario": name}
+            result.update(bench_scenario(code, args.runs, json_folder))
+            result["folder_created"] = os.path.exists(json_folder)
+            results.append(result)
+            print(f"{name:16} p50 {result['p50_ms']:7.1f} ms, "
+                  f"importaciones {result['imports_ms']:6.1f} ms, "
+                  f"carpeta creada: {result['folder_created']}", file=sys.stderr)
+    write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Micro-benchmark de validate_iban: version original frente a la version por bloques.
+
+Uso (desde la raiz del proyecto):
+    PYTHONPATH=src/main/python python src/benchmark/python/bench_validate_iban.py
+"""
+import random
+import timeit
+from uc3m_money.iban_validator import validate_iban, _check_iban
+
+
+def legacy_validate_iban(iban):
+    """Implementacion original (lista de caracteres + entero grande)"""
+    if not isinstance(iban, str):
+        return False
+    iban = iban.replace(" ", "").upper()
+    if not iban.startswith("ES"):
+        return False
+    if len(iban) != 24:
+        return False
+    if not iban[2:].isdigit():
+        return False
+    rearranged_iban = iban[4:] + iban[:4]
+    numeric_iban = []
+    for ch in rearranged_iban:
+        if ch.isdigit():
+            numeric_iban.append(str(ch))
+        else:
+            numeric_iban.append(str(ord(ch) - 55))
+    numeric_iban = ''.join(numeric_iban)
+    return int(numeric_iban) % 97 == 1
+
+
+def make_ibans(count, distinct, seed=97):
+    """Genera count IBAN sacados de un conjunto de distinct IBAN distintos"""
+    generator = random.Random(seed)
+    pool = ["ES" + "".join(generator.choice("0123456789") for _ in range(22))
+            for _ in range(distinct)]
+    return [generator.choice(pool) for _ in range(count)]
+
+
+def run(function, ibans, repeat=5):
+    """Mejor tiempo por llamada en nanosegundos"""
+    best = min(timeit.repeat(lambda: [function(iban) for iban in ibans],
+                             number=1, repeat=repeat))
+    return best / len(ibans) * 1e9
+
+
+def main():
+    """Compara las dos versiones con trafico repetido y con IBAN siempre distintos"""
+    scenarios = {"hot (2.000 distintos)": make_ibans(200000, 2000),
+                 "cold (todos distintos)": make_ibans(200000, 200000)}
+    for name, ibans in scenarios.items():
+        assert [validate_iban(iban) for iban in ibans] == \
+               [legacy_validate_iban(iban) for iban in ibans]
+        legacy = run(legacy_validate_iban, ibans)
+        _check_iban.cache_clear()
+        current = run(validate_iban, ibans)
+        uncached = run(_check_iban.__wrapped__, ibans)
+        print(f"{name}: original {legacy:.0f} ns, por bloques sin cache {uncached:.0f} ns, "
+              f"con cache {current:.0f} ns, mejora x{legacy / current:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,69 @@
 """UC3M LOGISTICS MODULE WITH ALL THE FEATURES REQUIRED FOR ACCESS CONTROL"""
 
-from .transfer_request import TransferRequest
-from .account_manager import AccountManager
-from .account_management_exception import AccountManagementException
-from .account_deposit import AccountDeposit
+import importlib
+
+# Nombre publico -> submodulo que lo define. Los submodulos se importan la primera vez
+# que se usa el nombre (PEP 562), asi "import uc3m_money" no carga asyncio, sqlite3...
+_LAZY_ATTRIBUTES = {
+    "TransferRequest": "transfer_request",
+    "AccountManager": "account_manager",
+    "AccountManagementException": "account_management_exception",
+    "AccountDeposit": "account_deposit",
+    "TransferJournal": "transfer_journal",
+    "TransferIndex": "transfer_index",
+    "SqliteStorage": "sqlite_storage",
+    "LedgerReader": "ledger_reader",
+    "BalanceIndex": "balance_index",
+    "validate_iban": "iban_validator",
+    "validate_ibans": "iban_validator",
+    "AsyncAccountManager": "async_account_manager",
+    "DepositWal": "deposit_wal",
+    "Metrics": "metrics",
+    "Profiler": "profiling",
+    "StorageBackend": "storage_backend",
+    "JsonFileStorage": "json_storage",
+    "JournalStorage": "json_storage",
+    "MemoryStorage": "memory_storage",
+    "LedgerSnapshot": "ledger_snapshot",
+    "ValidationPipeline": "validation",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+# Solo para pylint y los IDE: en ejecucion es False (sin importar typing) y los nombres
+# se resuelven con __getattr__
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .transfer_request import TransferRequest
+    from .account_manager import AccountManager
+    from .account_management_exception import AccountManagementException
+    from .account_deposit import AccountDeposit
+    from .transfer_journal import TransferJournal
+    from .transfer_index import TransferIndex
+    from .sqlite_storage import SqliteStorage
+    from .ledger_reader import LedgerReader
+    from .balance_index import BalanceIndex
+    from .iban_validator import validate_iban, validate_ibans
+    from .async_account_manager import AsyncAccountManager
+    from .deposit_wal import DepositWal
+    from .metrics import Metrics
+    from .profiling import Profiler
+    from .storage_backend import StorageBackend
+    from .json_storage import JsonFileStorage, JournalStorage
+    from .memory_storage import MemoryStorage
+    from .ledger_snapshot import LedgerSnapshot
+    from .validation import ValidationPipeline
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + module_name, __name__), name)
+    # Las siguientes consultas ya no pasan por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+"""MODULE: __main__. python -m uc3m_money: carga masiva desde JSON Lines (ver cli)"""
+import sys
+from uc3m_money.cli import main
+
+sys.exit(main())
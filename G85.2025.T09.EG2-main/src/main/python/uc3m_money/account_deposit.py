@@ -4,6 +4,9 @@ import hashlib
 
 class AccountDeposit():
     """Class representing the information required for shipping of an order"""
+    __slots__ = ("__alg", "__type", "__to_iban", "__deposit_amount", "__deposit_date",
+                 "__deposit_signature")
+
     def __init__(self,
                  to_iban: str,
                  deposit_amount):
@@ -13,6 +16,7 @@ class AccountDeposit():
         self.__deposit_amount = deposit_amount
         justnow = datetime.now(timezone.utc)
         self.__deposit_date = datetime.timestamp(justnow)
+        self.__deposit_signature = None
 
     def to_json(self):
         """returns the object data in json format"""
@@ -25,9 +29,8 @@ class AccountDeposit():
 
     def __signature_string(self):
         """Composes the string to be used for generating the key for the date"""
-        return "{alg:" + str(self.__alg) +",typ:" + str(self.__type) +",iban:" + \
-               str(self.__to_iban) + ",amount:" + str(self.__deposit_amount) + \
-               ",deposit_date:" + str(self.__deposit_date) + "}"
+        return (f"{{alg:{self.__alg},typ:{self.__type},iban:{self.__to_iban},"
+                f"amount:{self.__deposit_amount},deposit_date:{self.__deposit_date}}}")
 
     @property
     def to_iban(self):
@@ -37,6 +40,7 @@ class AccountDeposit():
     @to_iban.setter
     def to_iban(self, value):
         self.__to_iban = value
+        self.__deposit_signature = None
 
     @property
     def deposit_amount(self):
@@ -45,6 +49,7 @@ class AccountDeposit():
     @deposit_amount.setter
     def deposit_amount(self, value):
         self.__deposit_amount = value
+        self.__deposit_signature = None
 
     @property
     def deposit_date(self):
@@ -53,9 +58,13 @@ class AccountDeposit():
     @deposit_date.setter
     def deposit_date( self, value ):
         self.__deposit_date = value
+        self.__deposit_signature = None
 
 
     @property
     def deposit_signature( self ):
-        """Returns the sha256 signature of the date"""
-        return hashlib.sha256(self.__signature_string().encode()).hexdigest()
+        """Returns the sha256 signature of the date, computed once until a setter runs"""
+        if self.__deposit_signature is None:
+            self.__deposit_signature = hashlib.sha256(
+                self.__signature_string().encode()).hexdigest()
+        return self.__deposit_signature
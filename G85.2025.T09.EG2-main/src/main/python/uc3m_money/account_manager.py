@@ -5,62 +5,281 @@
 # pylint: disable=too-many-positional-arguments
 # pylint: disable=too-many-locals
 # pylint: disable=too-many-branches
-from io import TextIOWrapper
+# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-public-methods
 import json
 import os
 import hashlib
 from datetime import datetime, UTC
 from datetime import timezone
 from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money import json_codec
 from uc3m_money.transfer_request import TransferRequest
+from uc3m_money.json_storage import JsonFileStorage, JournalStorage
+from uc3m_money.storage_backend import StorageBackend
+from uc3m_money.iban_validator import validate_iban, validate_ibans
+from uc3m_money.validation import ValidationPipeline, check_transfer, check_deposit, \
+    ERROR_MESSAGES
+from uc3m_money.group_commit import GroupCommit
+from uc3m_money.metrics import Metrics, NO_METRICS, TRANSFER_OPERATION, DEPOSIT_OPERATION, \
+    BALANCE_OPERATION
+from uc3m_money.profiling import Profiler
+
+# Ruta a la carpeta JsonFiles dentro de /src
+DEFAULT_JSON_FOLDER = os.path.join(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")), "JsonFiles")
+
+
+def read_deposit(input_file: str, metrics=NO_METRICS) -> dict:
+    """
+    Lee, valida y firma un ingreso a cuenta desde un archivo JSON.
+    Devuelve el registro para deposits.json o lanza AccountManagementException.
+    """
+
+    if not os.path.exists(input_file):
+        raise AccountManagementException("ERROR input file not found")
+    try:
+        with metrics.timer(DEPOSIT_OPERATION, "read"):
+            with open(input_file, "rb") as file:
+                raw = file.read()
+        metrics.count(DEPOSIT_OPERATION, "records_read")
+        metrics.count(DEPOSIT_OPERATION, "bytes_read", len(raw))
+        with metrics.timer(DEPOSIT_OPERATION, "parse"):
+            data = json_codec.loads(raw)
+
+    except json.JSONDecodeError as exc:
+        raise AccountManagementException("ERROR invalid JSON format") from exc
+    except Exception as exc:
+        raise AccountManagementException("ERROR reading input file") from exc
+
+    return sign_deposit(data, metrics)
+
+
+def sign_deposit(data: dict, metrics=NO_METRICS) -> dict:
+    """
+    Valida y firma un ingreso ya leido ({"IBAN", "AMOUNT"}, el contenido del archivo JSON).
+    Devuelve el registro para deposits.json o lanza AccountManagementException.
+    """
+    with metrics.timer(DEPOSIT_OPERATION, "validation"):
+        error = check_deposit(data)
+        if error is not None:
+            raise AccountManagementException(ERROR_MESSAGES[error])
+        amount = float(data["AMOUNT"][4:])
+
+    return sign_valid_deposit(data["IBAN"], amount, metrics)
+
+
+def sign_valid_deposit(iban: str, amount: float, metrics=NO_METRICS) -> dict:
+    """Firma un ingreso ya validado (con sign_deposit o ValidationPipeline.deposits) y
+    devuelve el registro para deposits.json"""
+    deposit_date = datetime.now(UTC).timestamp()
+
+    deposit_dict = {
+        "alg": "SHA-256",
+        "typ": "DEPOSIT",
+        "iban": iban,
+        "amount": f"{amount:.2f}",
+        "deposit_date": deposit_date
+    }
+
+    deposit_str = (
+        f"{{alg:{deposit_dict['alg']},typ:{deposit_dict['typ']},"
+        f"iban:{deposit_dict['iban']},amount:{deposit_dict['amount']},"
+        f"deposit_date:{deposit_dict['deposit_date']}}}"
+    )
+
+    with metrics.timer(DEPOSIT_OPERATION, "hashing"):
+        signature = hashlib.sha256(deposit_str.encode()).hexdigest()
 
-
+    deposit_dict["deposit_signature"] = signature
+    return deposit_dict
+
+
+def validate_transfer(today: datetime,
+                      from_iban: str,
+                      to_iban: str,
+                      concept: str,
+                      transfer_type: str,
+                      date: str,
+                      amount: float) -> TransferRequest:
+    """Valida los datos de una transferencia (con la fecha de hoy today) y devuelve
+    la TransferRequest o lanza AccountManagementException"""
+    error = check_transfer(today, from_iban, to_iban, concept, transfer_type, date, amount)
+    if error is not None:
+        raise AccountManagementException(ERROR_MESSAGES[error])
+    return TransferRequest(from_iban, transfer_type, to_iban, concept, date, amount)
+
+
+def _deposit_worker(input_file: str):
+    """Procesa un fichero en un proceso del pool: (fichero, registro, error)"""
+    try:
+        return input_file, read_deposit(input_file), None
+    except AccountManagementException as exc:
+        return input_file, None, exc.message
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # deposit_into_account propagaria esta misma excepcion
+        return input_file, None, f"{type(exc).__name__}: {exc}"
+
+
+def _check_storage_options(storage, database, journal: bool, streaming: bool,
+                           balance_index: bool, deposit_wal: str, ledger_snapshot: bool,
+                           process_safe: bool):
+    """Lanza ValueError si se combinan opciones de almacen en las que una anularia a otra
+    sin avisar (storage frente a los atajos, database frente a los ficheros JSON o
+    balance_index frente a streaming y ledger_snapshot) o que no son seguras juntas
+    (process_safe con deposit_wal)"""
+    json_options = [name for name, value in (("journal", journal), ("streaming", streaming),
+                                             ("balance_index", balance_index),
+                                             ("deposit_wal", deposit_wal is not None),
+                                             ("ledger_snapshot", ledger_snapshot)) if value]
+    if storage is not None and (database is not None or json_options):
+        raise ValueError("storage cannot be combined with "
+                         + ", ".join((["database"] if database is not None else [])
+                                     + json_options))
+    if database is not None and json_options:
+        raise ValueError("database cannot be combined with " + ", ".join(json_options))
+    if balance_index and (streaming or ledger_snapshot):
+        raise ValueError("balance_index cannot be combined with streaming or ledger_snapshot")
+    if process_safe and deposit_wal is not None:
+        # Cada proceso tendria su propio DepositWal sobre el mismo deposits.wal: el paso
+        # a deposits.json de uno podria pisar el de otro y vaciar registros ajenos
+        raise ValueError("process_safe cannot be combined with deposit_wal")
 
 
 class AccountManager:
     """Class for managing account transactions"""
 
-    def __init__(self):
-        """Define the JSON file to store transactions"""
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-        # Ruta a la carpeta JsonFiles dentro de /src
-        json_folder = os.path.join(project_root, "JsonFiles")
-        os.makedirs(json_folder, exist_ok=True)
+    def __init__(self, journal: bool = False, database: str = None, streaming: bool = False,
+                 balance_index: bool = False, json_folder: str = None,
+                 process_safe: bool = False, deposit_wal: str = None,
+                 wal_checkpoint: int = 1000, metrics: bool = False,
+                 profile: int = None, profile_folder: str = None,
+                 storage: StorageBackend = None, ledger_snapshot: bool = False,
+                 wal_batch_records: int = 100, wal_batch_ms: int = 50):
+        """Define the JSON file to store transactions.
+        storage es el almacen de datos (JsonFileStorage, JournalStorage, MemoryStorage,
+        SqliteStorage o cualquier otro StorageBackend). journal, database, streaming,
+        balance_index, deposit_wal, wal_checkpoint, wal_batch_records, wal_batch_ms y
+        ledger_snapshot son atajos para crear el almacen:
+        Con journal=True las transferencias se guardan en transactions.jsonl (JSON Lines)
+        añadiendo una linea por transferencia en lugar de reescribir todo el fichero.
+        Con database (ruta a un fichero SQLite) transferencias, ingresos, movimientos y
+        saldos se guardan en esa base de datos en lugar de en los ficheros JSON.
+        Con streaming=True calculate_balance recorre transactions2.json elemento a elemento
+        en lugar de cargarlo entero en memoria.
+        Con balance_index=True calculate_balance mantiene un agregado por IBAN guardado
+        en transactions2.json.idx y solo procesa los movimientos nuevos.
+        Con ledger_snapshot=True calculate_balance suma sobre una copia binaria por
+        columnas de transactions2.json (transactions2.json.snap) en lugar de parsear JSON.
+        json_folder permite usar otra carpeta en lugar de src/JsonFiles.
+        Con process_safe=True las escrituras de transferencias e ingresos se hacen con un
+        cerrojo de fichero y agrupadas (group commit), para poder usar varios procesos a
+        la vez sobre la misma carpeta sin perder registros.
+        Con deposit_wal ("always", "batch" o "none") los ingresos se añaden a deposits.wal
+        con ese modo de fsync (en "batch", cada wal_batch_records registros o como mucho
+        wal_batch_ms milisegundos despues del primero sin sincronizar) y se pasan a
+        deposits.json (con renombrado atomico) cada wal_checkpoint registros (con None
+        solo en close()), en close() y en el primer uso si quedaron pendientes.
+        Con metrics=True se miden las fases de transfer_request, deposit_into_account y
+        calculate_balance (ver stats() y dump_metrics()); sin ellas no se mide nada.
+        Con profile=N (o la variable de entorno UC3M_MONEY_PROFILE=N) una de cada N
+        llamadas a los metodos publicos se perfila con cProfile y tracemalloc y deja un
+        .prof y un informe .txt en profile_folder (o UC3M_MONEY_PROFILE_DIR; por defecto
+        la carpeta profiles dentro de json_folder).
+        Las combinaciones en las que una opcion anularia a otra (storage con los atajos,
+        database con las opciones de los ficheros JSON, balance_index con streaming o
+        ledger_snapshot) y process_safe con deposit_wal, cuyo WAL no se comparte entre
+        procesos, lanzan ValueError."""
+        _check_storage_options(storage, database, journal, streaming, balance_index,
+                               deposit_wal, ledger_snapshot, process_safe)
+        if json_folder is None:
+            json_folder = DEFAULT_JSON_FOLDER
+        # Sin E/S en el constructor: las carpetas se crean al escribir por primera vez
+        self.json_folder = json_folder
+        self.metrics = Metrics() if metrics else NO_METRICS
+        self.ledger_file = os.path.join(json_folder, "transactions2.json")
         self.transactions_file = os.path.join(json_folder, "transactions.json")
+        self.deposits_file = os.path.join(json_folder, "deposits.json")
+        if storage is None:
+            if database is not None:
+                # pylint: disable-next=import-outside-toplevel
+                from uc3m_money.sqlite_storage import SqliteStorage
+                storage = SqliteStorage(database)
+            else:
+                storage_class = JournalStorage if journal else JsonFileStorage
+                storage = storage_class(json_folder, streaming, balance_index, deposit_wal,
+                                        wal_checkpoint, ledger_snapshot=ledger_snapshot,
+                                        wal_batch_records=wal_batch_records,
+                                        wal_batch_ms=wal_batch_ms)
+        if self.metrics.enabled:
+            storage.metrics = self.metrics
+        self.storage = storage
+        self.__transfer_commit = None
+        self.__deposit_commit = None
+        if process_safe:
+            self.__transfer_commit = GroupCommit(json_folder, "transactions",
+                                                 self.__flush_transfers)
+            self.__deposit_commit = GroupCommit(json_folder, "deposits", self.__flush_deposits)
+        if profile_folder is None:
+            profile_folder = os.path.join(json_folder, "profiles")
+        if profile:
+            self.profiler = Profiler(profile, profile_folder)
+        else:
+            self.profiler = Profiler.from_environment(profile_folder)
+        if self.profiler is not None:
+            # Se envuelven en la instancia los metodos publicos (tambien los estaticos)
+            for name in dir(AccountManager):
+                if not name.startswith("_") and callable(getattr(AccountManager, name)):
+                    setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
+
+    @property
+    def database(self):
+        """Almacen SQLite, o None si se usa otro almacen"""
+        # pylint: disable-next=import-outside-toplevel
+        from uc3m_money.sqlite_storage import SqliteStorage
+        return self.storage if isinstance(self.storage, SqliteStorage) else None
+
+    @property
+    def journal(self):
+        """Diario de transferencias (TransferJournal) del almacen, si lo tiene"""
+        return getattr(self.storage, "journal", None)
+
+    @property
+    def transfer_index(self):
+        """Indice persistente de transfer_code del almacen, si lo tiene"""
+        return getattr(self.storage, "transfer_index", None)
+
+    @property
+    def balance_index(self):
+        """Agregado incremental de saldos (BalanceIndex) del almacen, si lo tiene"""
+        return getattr(self.storage, "balance_index", None)
+
+    @property
+    def deposit_wal(self):
+        """WAL de ingresos (DepositWal) del almacen, si lo tiene"""
+        return getattr(self.storage, "deposit_wal", None)
+
+    def stats(self) -> dict:
+        """Latencias por operacion y fase y contadores de registros y bytes"""
+        return self.metrics.stats()
+
+    def dump_metrics(self, path: str = None) -> str:
+        """Escribe las metricas en formato de texto de Prometheus y devuelve la ruta"""
+        if path is None:
+            path = os.path.join(self.json_folder, "metrics.prom")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.metrics.dump(path)
+        return path
 
     @staticmethod
     def validate_iban(iban):
-        """Valida que sea un str"""
-        if not isinstance(iban, str):
-            return False
-
-        # Valida las mayúsculas y quita los espacios
-        iban = iban.replace(" ", "").upper()
-
-        # Valida que comienza con ES
-        if not iban.startswith("ES"):
-            return False
-
-        # Valida la longitud del IBAN
-        if len(iban) != 24:
-            return False
-
-        # Validacion de que los dígitos luego de ES
-        if not iban[2:].isdigit():
-            return False
+        """Valida un IBAN español"""
+        return validate_iban(iban)
 
-        rearranged_iban = iban[4:] + iban[:4]
-
-        numeric_iban = []
-        for ch in rearranged_iban:
-            if ch.isdigit():
-                numeric_iban.append(str(ch))  # Mantiene los números iguales
-            else:
-                numeric_iban.append(str(ord(ch) - 55))  # Convierte letras
-
-        numeric_iban = ''.join(numeric_iban)
-
-        return int(numeric_iban) % 97 == 1
+    @staticmethod
+    def validate_ibans(ibans):
+        """Valida en bloque una lista o array de IBAN y devuelve una lista de bool"""
+        return validate_ibans(ibans)
 
     def transfer_request(self,
                          from_iban: str,
@@ -70,183 +289,249 @@ class AccountManager:
                          date: str,
                          amount: float):
         """ Verifica los datos de la solicitud de transferencia y la registra en un archivo JSON """
-        if not self.validate_iban(from_iban):
-            raise AccountManagementException("ERROR from iban not valid")
-        if not self.validate_iban(to_iban):
-            raise AccountManagementException("ERROR to iban not valid")
-        if not (10 <= len(concept) <= 30 and len(concept.split()) >= 2):
-            raise AccountManagementException("ERROR concept not valid")
-        if transfer_type not in {"ORDINARY", "URGENT", "INMEDIATE"}:
-            raise AccountManagementException("ERROR transfer type not valid")
-        try:
-            transfer_date = datetime.strptime(date, "%d/%m/%Y")
-            today = datetime.today()
-            if not (2025 <= transfer_date.year < 2051 and transfer_date >= today):
-                raise AccountManagementException("ERROR date not valid")
-        except ValueError as exc:
-            raise AccountManagementException("ERROR date not valid") from exc
-        if not (10.00 <= amount <= 10000.00 and len(str(amount).split(".")) <= 2):
-            raise AccountManagementException("ERROR amount not valid")
-        transfer = TransferRequest(from_iban, transfer_type, to_iban, concept, date, amount)
-        transfer_code = transfer.transfer_code
-
-        transfer_data = transfer.to_json()
-
-        # Guardar en JSON
-        if os.path.exists(self.transactions_file):
-            with open(self.transactions_file, "r", encoding="utf-8") as file:
-                try:
-                    transactions = json.load(file)
-                except json.JSONDecodeError:
-                    transactions = []
-        else:
-            transactions = []
-
-        if transfer_data in transactions:
-            raise AccountManagementException("ERROR transfer already exists")
-
-        transactions.append(transfer_data)
-        with open(self.transactions_file, "w", encoding="utf-8") as file:  # type: TextIOWrapper
-            json.dump(transactions, file, indent=4)
-
-        return transfer_code
-
+        with self.metrics.timer(TRANSFER_OPERATION, "validation"):
+            transfer = validate_transfer(datetime.today(), from_iban, to_iban, concept,
+                                         transfer_type, date, amount)
+        with self.metrics.timer(TRANSFER_OPERATION, "hashing"):
+            transfer_data = transfer.to_json()
+        result = self.__commit_transfers([transfer_data])[0]
+        if result.startswith("ERROR"):
+            raise AccountManagementException(result)
+        return result
+
+    def transfer_requests(self, transfers, rejected_file: str = None) -> list:
+        """
+        Procesa un lote de transferencias (tuplas en el orden de transfer_request o dicts
+        con sus mismos nombres de parametro) y guarda las aceptadas en una sola escritura.
+        Devuelve, para cada elemento, su transfer_code o el mensaje de error. Las
+        rechazadas en la validacion se añaden con su motivo a rejected_file (JSON Lines).
+        """
+        results = []
+        valid_positions = []
+        valid_transfers = []
+        pipeline = ValidationPipeline(rejected_file, self.metrics)
+        # La fecha de hoy se calcula una sola vez para todo el lote
+        for transfer, _, error in pipeline.transfers(transfers, datetime.today()):
+            if transfer is None:
+                results.append(error)
+                continue
+            valid_positions.append(len(results))
+            with self.metrics.timer(TRANSFER_OPERATION, "hashing"):
+                valid_transfers.append(transfer.to_json())
+            results.append(None)
+
+        if valid_transfers:
+            for position, result in zip(valid_positions,
+                                        self.__commit_transfers(valid_transfers)):
+                results[position] = result
+        return results
+
+    def store_transfers(self, transfers_data: list) -> list:
+        """
+        Guarda transferencias ya validadas con validate_transfer (p. ej. en otros procesos)
+        en formato TransferRequest.to_json, descartando las repetidas. Devuelve, para cada
+        una, su transfer_code o "ERROR transfer already exists".
+        """
+        if not transfers_data:
+            return []
+        return self.__commit_transfers(transfers_data)
+
+    def __commit_transfers(self, transfers_data: list) -> list:
+        """Guarda transferencias validadas (agrupadas con otros procesos si process_safe)"""
+        if self.__transfer_commit is not None:
+            return self.__transfer_commit.submit(transfers_data)
+        return self.__deduplicate_and_store(transfers_data)
+
+    def __flush_transfers(self, records: list) -> list:
+        """Group commit: guarda de una vez las transferencias de varios escritores"""
+        results = self.__deduplicate_and_store([data for record in records for data in record])
+        grouped = []
+        for record in records:
+            grouped.append(results[:len(record)])
+            results = results[len(record):]
+        return grouped
+
+    def __deduplicate_and_store(self, transfers_data: list) -> list:
+        """
+        Descarta las transferencias repetidas (en la lista o ya guardadas) y guarda el resto
+        con una sola escritura. Devuelve, para cada una, su transfer_code o el error.
+        """
+        results = []
+        accepted = []
+        batch_codes = set()
+        for transfer_data in transfers_data:
+            transfer_code = transfer_data["transfer_code"]
+            # Duplicados: busqueda por transfer_code en el indice persistente
+            if transfer_code in batch_codes or self.__transfer_exists(transfer_code):
+                results.append("ERROR transfer already exists")
+                continue
+            batch_codes.add(transfer_code)
+            accepted.append(transfer_data)
+            results.append(transfer_code)
+        if accepted:
+            self.__store_transfers(accepted)
+        return results
+
+    def __transfer_exists(self, transfer_code: str) -> bool:
+        """Comprueba si el codigo ya esta guardado"""
+        return self.storage.has_transfer(transfer_code)
+
+    def __store_transfers(self, transfers_data: list):
+        """Guarda las transferencias ya validadas"""
+        self.metrics.count(TRANSFER_OPERATION, "records_written", len(transfers_data))
+        self.storage.add_transfers(transfers_data)
+
+    def read_transactions(self) -> list:
+        """Devuelve la lista de transferencias guardadas, sea cual sea el almacen"""
+        return self.storage.load_transfers()
 
     def deposit_into_account(self, input_file: str) -> str:
         """
         Procesa un ingreso a cuenta desde un archivo JSON.
         Devuelve la firma (SHA-256) del ingreso o lanza AccountManagementException.
         """
+        deposit_dict = read_deposit(input_file, self.metrics)
+        self.__store_deposits([deposit_dict])
+        return deposit_dict["deposit_signature"]
 
-        if not os.path.exists(input_file):
-            raise AccountManagementException("ERROR input file not found")
-        try:
-            with open(input_file, "r", encoding="utf-8") as file:
-                data = json.load(file)
-
-        except json.JSONDecodeError as exc:
-            raise AccountManagementException("ERROR invalid JSON format") from exc
-        except Exception as exc:
-            raise AccountManagementException("ERROR reading input file") from exc
-
-        if "IBAN" not in data or "AMOUNT" not in data:
-            raise AccountManagementException("ERROR invalid input structure")
-
-        iban = data["IBAN"]
-        amount_str = data["AMOUNT"]
-
-        if not self.validate_iban(iban):
-            raise AccountManagementException("ERROR IBAN not valid")
-
-        if not amount_str.startswith("EUR "):
-            raise AccountManagementException("ERROR amount format invalid")
-
-        amount = float(amount_str[4:])
-
-        deposit_date = datetime.now(UTC).timestamp()
-
-        deposit_dict = {
-            "alg": "SHA-256",
-            "typ": "DEPOSIT",
-            "iban": iban,
-            "amount": f"{amount:.2f}",
-            "deposit_date": deposit_date
-        }
-
-        deposit_str = (
-            f"{{alg:{deposit_dict['alg']},typ:{deposit_dict['typ']},"
-            f"iban:{deposit_dict['iban']},amount:{deposit_dict['amount']},"
-            f"deposit_date:{deposit_dict['deposit_date']}}}"
-        )
-
-        signature = hashlib.sha256(deposit_str.encode()).hexdigest()
-
-        deposit_dict["deposit_signature"] = signature
-
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-        deposits_path = os.path.join(project_root, "JsonFiles", "deposits.json")
-
-        if os.path.exists(deposits_path):
-            with open(deposits_path, "r", encoding="utf-8") as f:
-                deposits = json.load(f)
-
+    def deposit_directory(self, path: str, workers: int = None, batch_size: int = 1000) -> dict:
+        """
+        Procesa todos los ficheros .json de un directorio como ingresos.
+        Un pool de procesos lee, valida y firma los ficheros en paralelo y este proceso
+        guarda los aceptados por lotes de batch_size. Devuelve un resumen
+        {"accepted": {fichero: firma}, "rejected": {fichero: mensaje de error}}.
+        """
+        if not os.path.isdir(path):
+            raise AccountManagementException("ERROR input directory not found")
+        input_files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                             if name.endswith(".json"))
+        return self.deposit_files(input_files, workers, batch_size)
+
+    def deposit_files(self, input_files: list, workers: int = None,
+                      batch_size: int = 1000) -> dict:
+        """Procesa una lista de ficheros de ingreso con el mismo resumen que deposit_directory"""
+        summary = {"accepted": {}, "rejected": {}}
+        batch = []
+        if workers == 1:
+            results = map(_deposit_worker, input_files)
+            pool = None
         else:
-            deposits = []
-        deposits.append(deposit_dict)
-
-        with open(deposits_path, "w", encoding="utf-8") as file:  # type: TextIOWrapper
-            json.dump(deposits, file, indent=4)
-
-        return signature
+            # Se importa aqui: multiprocessing tarda en cargarse y solo se usa en este caso
+            # pylint: disable-next=import-outside-toplevel
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(_deposit_worker, input_files, chunksize=64)
+        try:
+            for input_file, deposit_dict, error in results:
+                if error is not None:
+                    summary["rejected"][input_file] = error
+                    continue
+                summary["accepted"][input_file] = deposit_dict["deposit_signature"]
+                batch.append(deposit_dict)
+                if len(batch) >= batch_size:
+                    self.__store_deposits(batch)
+                    batch = []
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        if batch:
+            self.__store_deposits(batch)
+        return summary
+
+    def store_deposits(self, deposits_data: list) -> list:
+        """Guarda ingresos ya firmados con sign_deposit (p. ej. en otros procesos) con una
+        sola escritura y devuelve sus firmas"""
+        if deposits_data:
+            self.__store_deposits(deposits_data)
+        return [deposit_data["deposit_signature"] for deposit_data in deposits_data]
+
+    def __store_deposits(self, deposits_data: list):
+        """Guarda ingresos ya firmados con una sola escritura"""
+        if self.__deposit_commit is not None:
+            self.__deposit_commit.submit(deposits_data)
+            return
+        self.__write_deposits(deposits_data)
+
+    def __flush_deposits(self, records: list) -> list:
+        """Group commit: guarda de una vez los ingresos de varios escritores"""
+        self.__write_deposits([data for record in records for data in record])
+        return [True] * len(records)
+
+    def __write_deposits(self, deposits_data: list):
+        """Añade los ingresos al almacen"""
+        self.metrics.count(DEPOSIT_OPERATION, "records_written", len(deposits_data))
+        self.storage.add_deposits(deposits_data)
+
+    def checkpoint_deposits(self):
+        """Hace persistentes los ingresos pendientes del almacen (el WAL de ingresos)"""
+        self.storage.flush()
+
+    def read_deposits(self) -> list:
+        """Devuelve los ingresos guardados, incluidos los que aun estan en el WAL"""
+        return self.storage.load_deposits()
+
+    def close(self):
+        """Hace persistente lo pendiente y cierra el almacen"""
+        self.storage.close()
 
     def calculate_balance(self, iban_number: str) -> bool:
         """
-        Calcula el saldo total de un IBAN a partir del archivo transactions2.json.
+        Calcula el saldo total de un IBAN a partir de sus movimientos (transactions2.json).
         Guarda o actualiza el resultado en saldos.json acumulando el saldo anterior.
         """
-        if not self.validate_iban(iban_number):
-            raise AccountManagementException("ERROR iban not valid")
-
-        # Ruta a JSON
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-        json_folder = os.path.join(project_root, "JsonFiles")
-        transactions_path = os.path.join(json_folder, "transactions2.json")
-
-        if not os.path.exists(transactions_path):
-            raise AccountManagementException("ERROR file not found")
-
-        try:
-            with open(transactions_path, "r", encoding="utf-8") as file:
-                transactions = json.load(file)
-        except Exception as exc:
-            raise AccountManagementException("ERROR reading transaction file") from exc
-
-        # Buscar y sumar movimientos del IBAN
-        amounts = []
-        for entry in transactions:
-            if entry.get("IBAN") == iban_number:
-                try:
-                    amounts.append(float(entry.get("amount")))
-                except (ValueError, TypeError):
-                    continue
+        with self.metrics.timer(BALANCE_OPERATION, "validation"):
+            if not self.validate_iban(iban_number):
+                raise AccountManagementException("ERROR iban not valid")
 
-        if not amounts:
+        total_balance, count = self.storage.iban_movements(iban_number)
+        if not count:
             raise AccountManagementException("ERROR iban not found")
 
-        total_balance = sum(amounts)
         timestamp = datetime.now(timezone.utc).timestamp()
-
-        # Guardar en saldos.json acumulando el saldo
-        balances_path = os.path.join(json_folder, "saldos.json")
-        if os.path.exists(balances_path):
-            try:
-                with open(balances_path, "r", encoding="utf-8") as file:
-                    balances = json.load(file)
-            except json.JSONDecodeError:
-                balances = []
-        else:
-            balances = []
-
-        # Buscar si ya existe una entrada para ese IBAN
-        iban_found = False
-        for entry in balances:
-            if entry.get("iban") == iban_number:
-                # Acumular el nuevo saldo
-                entry["saldos"] = round(entry.get("saldos", 0.0) + total_balance, 2)
-                entry["timestamp"] = timestamp
-                iban_found = True
-                break
-
-        # Si no estaba, lo añadimos como nuevo
-        if not iban_found:
-            balances.append({
-                "iban": iban_number,
-                "saldos": round(total_balance, 2),
-                "timestamp": timestamp
-            })
-
-        # Guardar de vuelta
-        with open(balances_path, "w", encoding="utf-8") as f: # type: TextIOWrapper
-            json.dump(balances, f, indent=4)
-
+        self.storage.accumulate_balance(iban_number, total_balance, timestamp)
+        self.metrics.count(BALANCE_OPERATION, "records_written")
         return True
+
+    def calculate_balances(self, ibans) -> list:
+        """
+        Calcula el saldo de varios IBAN con una sola lectura de los movimientos y una
+        sola escritura de saldos.json, con los mismos saldos que calculate_balance uno a
+        uno (un IBAN repetido se acumula otra vez). Devuelve, para cada IBAN, True o el
+        mensaje de error de calculate_balance; si no se pueden leer los movimientos
+        lanza AccountManagementException sin guardar ningun saldo.
+        """
+        ibans = list(ibans)
+        results = []
+        for iban_number in ibans:
+            with self.metrics.timer(BALANCE_OPERATION, "validation"):
+                results.append(None if self.validate_iban(iban_number)
+                               else "ERROR iban not valid")
+        requested = {iban_number for iban_number, result in zip(ibans, results)
+                     if result is None}
+        if not requested:
+            return results
+
+        totals = self.storage.movements_by_iban(requested)
+        balances = []
+        for position, iban_number in enumerate(ibans):
+            if results[position] is not None:
+                continue
+            total_balance, count = totals[iban_number]
+            if not count:
+                results[position] = "ERROR iban not found"
+                continue
+            balances.append((iban_number, total_balance))
+            results[position] = True
+
+        if balances:
+            timestamp = datetime.now(timezone.utc).timestamp()
+            self.storage.accumulate_balances(balances, timestamp)
+            self.metrics.count(BALANCE_OPERATION, "records_written", len(balances))
+        return results
+
+    def migrate_to_database(self) -> bool:
+        """Importa una sola vez los ficheros JSON de JsonFiles a la base de datos SQLite.
+        Devuelve False (sin importar nada) si esta carpeta ya se habia importado."""
+        if self.database is None:
+            raise AccountManagementException("ERROR database not configured")
+        return self.database.migrate_from_json(self.json_folder)
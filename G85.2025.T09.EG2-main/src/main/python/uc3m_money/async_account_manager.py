@@ -0,0 +1,159 @@
+"""MODULE: async_account_manager. Fachada asyncio de AccountManager"""
+
+# pylint: disable=too-many-arguments
+# pylint: disable=too-many-positional-arguments
+import asyncio
+from uc3m_money.account_manager import AccountManager
+from uc3m_money.account_management_exception import AccountManagementException
+
+TRANSFER = "transfer"
+DEPOSIT = "deposit"
+BALANCE = "balance"
+
+
+class AsyncAccountManager:
+    """Versiones awaitable de transfer_request, deposit_into_account y calculate_balance.
+    Todo el trabajo con ficheros (validacion, firmas, lectura y escritura) se hace en
+    hilos fuera del bucle de eventos, y un unico escritor agrupa las peticiones que
+    llegan a la vez en una sola escritura por tipo."""
+
+    def __init__(self, manager: AccountManager = None, max_batch: int = 1000):
+        self.manager = manager if manager is not None else AccountManager()
+        self.max_batch = max_batch
+        self.__queue = None
+        self.__writer = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    def start(self):
+        """Arranca la tarea escritora en el bucle de eventos actual"""
+        if self.__writer is None:
+            self.__queue = asyncio.Queue()
+            self.__writer = asyncio.create_task(self.__write_loop())
+
+    async def close(self):
+        """Espera a que se escriba lo pendiente y detiene el escritor"""
+        if self.__writer is not None:
+            await self.__queue.put(None)
+            await self.__writer
+            self.__writer = None
+
+    async def transfer_request(self,
+                               from_iban: str,
+                               to_iban: str,
+                               concept: str,
+                               transfer_type: str,
+                               date: str,
+                               amount: float) -> str:
+        """Registra una transferencia y devuelve su transfer_code"""
+        return await self.__submit(TRANSFER, {"from_iban": from_iban,
+                                              "to_iban": to_iban,
+                                              "concept": concept,
+                                              "transfer_type": transfer_type,
+                                              "date": date,
+                                              "amount": amount})
+
+    async def deposit_into_account(self, input_file: str) -> str:
+        """Procesa un fichero de ingreso y devuelve su firma"""
+        return await self.__submit(DEPOSIT, input_file)
+
+    async def calculate_balance(self, iban_number: str) -> bool:
+        """Calcula y guarda el saldo del IBAN"""
+        return await self.__submit(BALANCE, iban_number)
+
+    async def __submit(self, kind: str, payload):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.__queue.put((kind, payload, future))
+        return await future
+
+    async def __write_loop(self):
+        """Escritor unico: agrupa lo que hay en la cola y lo procesa por tipo"""
+        while True:
+            item = await self.__queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch and not self.__queue.empty():
+                item = self.__queue.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            await self.__write_batch(batch)
+            if stop:
+                return
+
+    async def __write_batch(self, batch: list):
+        transfers = [(payload, future) for kind, payload, future in batch if kind == TRANSFER]
+        deposits = [(payload, future) for kind, payload, future in batch if kind == DEPOSIT]
+        balances = [(payload, future) for kind, payload, future in batch if kind == BALANCE]
+        if transfers:
+            await self.__run(transfers, self.__write_transfers)
+        if deposits:
+            await self.__run(deposits, self.__write_deposits)
+        if balances:
+            await self.__run(balances, self.__write_balances)
+
+    @staticmethod
+    async def __run(requests: list, writer):
+        """Ejecuta writer en un hilo y entrega a cada peticion su resultado o su error"""
+        payloads = [payload for payload, _ in requests]
+        try:
+            results = await asyncio.to_thread(writer, payloads)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            results = [exc] * len(requests)
+        for (_, future), result in zip(requests, results):
+            if future.cancelled():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def __write_transfers(self, transfers: list) -> list:
+        """Valida y guarda el grupo de transferencias con una sola escritura"""
+        results = []
+        for result in self.manager.transfer_requests(transfers):
+            if result.startswith("ERROR"):
+                results.append(AccountManagementException(result))
+            else:
+                results.append(result)
+        return results
+
+    def __write_deposits(self, input_files: list) -> list:
+        """Lee, firma y guarda el grupo de ingresos con una sola escritura
+        (una por ronda si el mismo fichero se ha pedido varias veces)"""
+        rounds = [[]]
+        for input_file in input_files:
+            if input_file in rounds[-1]:
+                rounds.append([])
+            rounds[-1].append(input_file)
+        results = []
+        for files in rounds:
+            summary = self.manager.deposit_files(files, workers=1, batch_size=len(files))
+            for input_file in files:
+                if input_file in summary["rejected"]:
+                    results.append(AccountManagementException(summary["rejected"][input_file]))
+                else:
+                    results.append(summary["accepted"][input_file])
+        return results
+
+    def __write_balances(self, ibans: list) -> list:
+        """Calcula los saldos pedidos con una sola lectura de los movimientos y una sola
+        escritura de los saldos"""
+        try:
+            results = self.manager.calculate_balances(ibans)
+        except AccountManagementException as exc:
+            # Error del fichero de movimientos: lo reciben los IBAN validos
+            return [exc if self.manager.validate_iban(iban_number)
+                    else AccountManagementException("ERROR iban not valid")
+                    for iban_number in ibans]
+        return [AccountManagementException(result) if isinstance(result, str) else result
+                for result in results]
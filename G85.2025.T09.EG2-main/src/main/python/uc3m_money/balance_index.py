@@ -0,0 +1,195 @@
+"""MODULE: balance_index. Agregado incremental por IBAN de transactions2.json"""
+import hashlib
+import os
+from uc3m_money import json_codec
+from uc3m_money.ledger_reader import LedgerReader
+
+# Tamaño de los bloques del ledger con huella SHA-256 propia (ver BalanceIndex)
+DIGEST_BLOCK_BYTES = 1 << 20
+# Bloques finales (anteriores a la marca) que se comprueban en cada cambio del fichero
+TAIL_CHECK_BLOCKS = 2
+# Lineas de cambios tras las que el indice se reescribe entero (compactacion)
+COMPACT_DELTAS = 64
+
+
+def valid_movements(movements):
+    """Genera (iban, importe) de los movimientos con IBAN e importe numerico"""
+    for entry in movements:
+        iban = entry.get("IBAN")
+        if not isinstance(iban, str):
+            continue
+        try:
+            amount = float(entry.get("amount"))
+        except (ValueError, TypeError):
+            # Igual que calculate_balance: los importes no numericos no suman
+            continue
+        yield iban, amount
+
+
+def accumulate_movements(sums: dict, movements) -> set:
+    """Suma a sums ({iban: (suma, numero)}) los importes validos de los movimientos y
+    devuelve los IBAN que han cambiado"""
+    changed = set()
+    for iban, amount in valid_movements(movements):
+        total_balance, count = sums.get(iban, (0, 0))
+        sums[iban] = (total_balance + amount, count + 1)
+        changed.add(iban)
+    return changed
+
+
+class BalanceIndex:
+    """Suma y numero de importes validos por IBAN, con una marca (watermark) del punto
+    del fichero hasta el que ya se han aplicado. Las consultas posteriores solo leen
+    los elementos añadidos despues de la marca.
+    Los bytes anteriores a la marca se guardan como huellas SHA-256 por bloques de
+    DIGEST_BLOCK_BYTES. Cuando el fichero cambia (tamaño o mtime) solo se comprueban los
+    TAIL_CHECK_BLOCKS ultimos bloques, salvo si el fichero ha encogido o su mtime ha
+    retrocedido, en cuyo caso se comprueban todos; si alguno no coincide (o el fichero
+    es mas corto que la marca) el agregado se recalcula desde el principio. Por tanto
+    no se detecta una edicion en su sitio anterior a esos bloques que no encoja el
+    fichero ni retrase su mtime (p. ej. cambiar a mano un importe antiguo por otro de
+    igual longitud); para esos casos se borra transactions2.json.idx.
+    El indice es JSON Lines: la primera linea es el estado completo y cada
+    actualizacion añade una linea solo con la marca, los bloques que cambian y los IBAN
+    tocados; cada COMPACT_DELTAS lineas se reescribe entero. Los agregados se guardan
+    por columnas (ibans, totals, counts), que se leen mas rapido que un objeto."""
+
+    def __init__(self, ledger_file: str):
+        self.ledger_file = ledger_file
+        self.index_file = ledger_file + ".idx"
+        self.__state = None
+        self.__deltas = None
+
+    def totals(self, iban: str):
+        """Devuelve (suma, numero de importes) del IBAN con el fichero al dia"""
+        self.update()
+        total_balance, count = self.__state["sums"].get(iban, (0, 0))
+        return total_balance, count
+
+    def totals_many(self, ibans) -> dict:
+        """Devuelve {iban: (suma, numero de importes)} de varios IBAN con el fichero al dia"""
+        self.update()
+        return {iban: self.__state["sums"].get(iban, (0, 0)) for iban in ibans}
+
+    def update(self):
+        """Aplica al agregado los elementos nuevos del fichero"""
+        if self.__state is None:
+            self.__load()
+        stat = os.stat(self.ledger_file)
+        if (stat.st_size, stat.st_mtime_ns) == (self.__state["size"], self.__state["mtime_ns"]):
+            return
+        if not self.__prefix_unchanged(stat):
+            self.__state = self.__empty_state()
+            self.__deltas = None
+        start = self.__state["offset"]
+
+        sums = self.__state["sums"]
+        reader = LedgerReader(self.ledger_file, offset=start)
+        try:
+            changed = accumulate_movements(sums, reader)
+        except Exception:
+            # El agregado en memoria queda a medias: se vuelve a cargar el guardado
+            self.__state = None
+            raise
+
+        # Solo se recalculan las huellas desde el bloque de la marca anterior
+        first_block = start // DIGEST_BLOCK_BYTES
+        blocks = self.__block_digests(first_block, reader.offset)
+        self.__state["blocks"][first_block:] = blocks
+        self.__state["offset"] = reader.offset
+        self.__state["size"] = stat.st_size
+        self.__state["mtime_ns"] = stat.st_mtime_ns
+        self.__save({"offset": reader.offset, "size": stat.st_size,
+                     "mtime_ns": stat.st_mtime_ns, "first_block": first_block,
+                     "blocks": blocks, **self.__columns(changed)})
+
+    def __prefix_unchanged(self, stat) -> bool:
+        """Comprueba las huellas de los bloques anteriores a la marca: las ultimas, o
+        todas si el fichero ha encogido o su mtime ha retrocedido"""
+        offset = self.__state["offset"]
+        if stat.st_size < offset:
+            return False
+        blocks = self.__state["blocks"]
+        first_block = max(0, len(blocks) - TAIL_CHECK_BLOCKS)
+        if self.__state["size"] is not None and (
+                stat.st_size < self.__state["size"]
+                or stat.st_mtime_ns < self.__state["mtime_ns"]):
+            first_block = 0
+        return self.__block_digests(first_block, offset) == blocks[first_block:]
+
+    def __block_digests(self, first_block: int, end: int) -> list:
+        """Huellas de los bloques desde first_block hasta el byte end (el ultimo puede
+        ser parcial)"""
+        digests = []
+        with open(self.ledger_file, "rb") as file:
+            position = first_block * DIGEST_BLOCK_BYTES
+            file.seek(position)
+            while position < end:
+                chunk = file.read(min(DIGEST_BLOCK_BYTES, end - position))
+                if not chunk:
+                    break
+                digests.append(hashlib.sha256(chunk).hexdigest())
+                position += len(chunk)
+        return digests
+
+    def __load(self):
+        """Carga el estado completo y le aplica las lineas de cambios"""
+        self.__state = self.__empty_state()
+        # None: el fichero del indice no vale para añadir lineas y se reescribe entero
+        self.__deltas = None
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, "rb") as file:
+                state = json_codec.loads(file.readline())
+                state["sums"] = dict(zip(state.pop("ibans"),
+                                         zip(state.pop("totals"), state.pop("counts"))))
+                if not isinstance(state["blocks"], list):
+                    return
+                deltas = 0
+                for line in file:
+                    try:
+                        delta = json_codec.loads(line)
+                    except ValueError:
+                        # Ultima linea a medias (escritura interrumpida): se descarta y
+                        # el indice se reescribe en el siguiente guardado
+                        self.__state = state
+                        return
+                    state["blocks"][delta["first_block"]:] = delta["blocks"]
+                    state["sums"].update(zip(delta["ibans"],
+                                             zip(delta["totals"], delta["counts"])))
+                    for key in ("offset", "size", "mtime_ns"):
+                        state[key] = delta[key]
+                    deltas += 1
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # Indice dañado o de un formato anterior: se recalcula
+            return
+        self.__state = state
+        self.__deltas = deltas
+
+    def __save(self, delta: dict):
+        """Añade la linea de cambios, o reescribe el indice si toca compactarlo"""
+        if self.__deltas is not None and self.__deltas < COMPACT_DELTAS:
+            with open(self.index_file, "ab") as file:
+                file.write(json_codec.dumps(delta, allow_nan=True) + b"\n")
+            self.__deltas += 1
+            return
+        state = {key: value for key, value in self.__state.items() if key != "sums"}
+        state.update(self.__columns(self.__state["sums"]))
+        temp_file = self.index_file + ".tmp"
+        with open(temp_file, "wb") as file:
+            # allow_nan: un importe "nan" o "inf" deja sumas que orjson guardaria como null
+            file.write(json_codec.dumps(state, allow_nan=True) + b"\n")
+        os.replace(temp_file, self.index_file)
+        self.__deltas = 0
+
+    def __columns(self, ibans) -> dict:
+        """Agregados de los IBAN indicados por columnas"""
+        sums = self.__state["sums"]
+        ibans = list(ibans)
+        return {"ibans": ibans, "totals": [sums[iban][0] for iban in ibans],
+                "counts": [sums[iban][1] for iban in ibans]}
+
+    @staticmethod
+    def __empty_state() -> dict:
+        return {"offset": 0, "size": None, "mtime_ns": None, "blocks": [], "sums": {}}
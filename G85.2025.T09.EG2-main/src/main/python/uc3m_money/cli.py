@@ -0,0 +1,298 @@
+"""MODULE: cli. Carga masiva de transferencias o ingresos desde JSON Lines"""
+
+# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-arguments
+# pylint: disable=too-many-positional-arguments
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from uc3m_money import json_codec
+from uc3m_money.account_manager import AccountManager, sign_valid_deposit
+from uc3m_money.validation import ValidationPipeline, ERROR_MESSAGES, ERROR_CODES, \
+    JSON_FORMAT_NOT_VALID, TRANSFER_DATA_NOT_VALID
+
+TRANSFERS = "transfers"
+DEPOSITS = "deposits"
+DEFAULT_BATCH_SIZE = 1000
+# --deposit-wal off: los ingresos se guardan reescribiendo deposits.json
+WAL_OFF = "off"
+JOURNAL_FILE = "transactions.jsonl"
+# Lotes en vuelo por proceso del pool: acota la memoria con entradas de cualquier tamaño
+BATCHES_PER_WORKER = 2
+
+
+def validate_batch(kind: str, first_line: int, lines: list) -> list:
+    """
+    Parsea, valida y firma un lote de lineas JSON Lines (en un proceso del pool o en
+    este) con ValidationPipeline. Devuelve (numero de linea, registro, codigo de error,
+    error, entrada) por cada linea no vacia: el registro es TransferRequest.to_json o
+    el de deposits.json, o None si hay error, y la entrada (solo de las rechazadas) es
+    el objeto leido o el texto de la linea si no es JSON.
+    """
+    results = []
+    line_numbers = []
+    items = []
+    for line_number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            data = json_codec.loads(line)
+        except ValueError:
+            # JSONDecodeError, o UnicodeDecodeError si la linea no es UTF-8 valido
+            results.append((line_number, None, JSON_FORMAT_NOT_VALID,
+                            ERROR_MESSAGES[JSON_FORMAT_NOT_VALID],
+                            line.decode("utf-8", "replace").strip()))
+            continue
+        if kind == TRANSFERS and not isinstance(data, dict):
+            # Una transferencia por linea como objeto con los parametros de transfer_request
+            results.append((line_number, None, TRANSFER_DATA_NOT_VALID,
+                            ERROR_MESSAGES[TRANSFER_DATA_NOT_VALID], data))
+            continue
+        line_numbers.append(line_number)
+        items.append(data)
+
+    pipeline = ValidationPipeline()
+    if kind == TRANSFERS:
+        checked = [(transfer and transfer.to_json(), code, error)
+                   for transfer, code, error in pipeline.transfers(items)]
+    else:
+        checked = [(value and sign_valid_deposit(*value), code, error)
+                   for value, code, error in pipeline.deposits(items)]
+    for line_number, data, (record, code, error) in zip(line_numbers, items, checked):
+        results.append((line_number, record, code, error, None if code is None else data))
+    results.sort(key=lambda result: result[0])
+    return results
+
+
+def read_batches(lines, batch_size: int):
+    """Agrupa las lineas en lotes (numero de la primera linea, lineas) sin leer de mas"""
+    lines = iter(lines)
+    first_line = 1
+    while True:
+        batch = list(itertools.islice(lines, batch_size))
+        if not batch:
+            return
+        yield first_line, batch
+        first_line += len(batch)
+
+
+class BulkLoader:
+    """Valida los lotes (en un pool de procesos si workers > 1) y los guarda en orden
+    con el AccountManager, escribiendo el resultado de cada linea, las lineas rechazadas
+    con su motivo y el progreso"""
+
+    def __init__(self, manager: AccountManager, kind: str, results_file=None,
+                 progress_file=sys.stderr, progress_seconds: float = 1.0,
+                 rejected_file=None):
+        self.manager = manager
+        self.kind = kind
+        self.results_file = results_file
+        self.rejected_file = rejected_file
+        self.progress_file = progress_file
+        self.progress_seconds = progress_seconds
+        self.records = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.__start = time.perf_counter()
+        self.__last_progress = self.__start
+
+    def run(self, batches, workers: int = 1) -> dict:
+        """Procesa todos los lotes y devuelve el resumen"""
+        if workers <= 1:
+            for first_line, lines in batches:
+                self.store(validate_batch(self.kind, first_line, lines))
+        else:
+            # Se importa aqui: multiprocessing tarda en cargarse y solo se usa con workers
+            # pylint: disable-next=import-outside-toplevel
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for first_line, lines in batches:
+                    pending.append(pool.submit(validate_batch, self.kind, first_line, lines))
+                    if len(pending) >= workers * BATCHES_PER_WORKER:
+                        self.store(pending.popleft().result())
+                while pending:
+                    self.store(pending.popleft().result())
+        self.report(final=True)
+        return self.summary()
+
+    def store(self, results: list):
+        """Guarda los registros validos de un lote con una sola escritura"""
+        records = [result[1] for result in results if result[1] is not None]
+        if self.kind == TRANSFERS:
+            stored = iter(self.manager.store_transfers(records))
+        else:
+            stored = iter(self.manager.store_deposits(records))
+        lines = []
+        rejected = []
+        for line_number, record, code, error, data in results:
+            if record is not None:
+                result = next(stored)
+                if result.startswith("ERROR"):
+                    # Repetida: se rechaza al guardarla
+                    result, code, error, data = None, ERROR_CODES.get(result), result, record
+            else:
+                result = None
+            if error is None:
+                self.accepted += 1
+                lines.append({"line": line_number, "result": result})
+            else:
+                self.rejected += 1
+                lines.append({"line": line_number, "error": error})
+                rejected.append({"line": line_number, "code": code, "error": error,
+                                 "record": data})
+        self.records += len(results)
+        if self.results_file is not None:
+            self.results_file.write("".join(json.dumps(line) + "\n" for line in lines))
+        if self.rejected_file is not None:
+            self.rejected_file.write("".join(json.dumps(line, default=str) + "\n"
+                                             for line in rejected))
+        self.report()
+
+    def summary(self) -> dict:
+        """Registros procesados, aceptados y rechazados y throughput"""
+        elapsed = time.perf_counter() - self.__start
+        return {"records": self.records, "accepted": self.accepted,
+                "rejected": self.rejected, "seconds": round(elapsed, 3),
+                "records_per_second": round(self.records / elapsed, 1) if elapsed else None}
+
+    def report(self, final: bool = False):
+        """Escribe el progreso cada progress_seconds segundos (y siempre al terminar)"""
+        if self.progress_file is None:
+            return
+        now = time.perf_counter()
+        if not final and (not self.progress_seconds or
+                          now - self.__last_progress < self.progress_seconds):
+            return
+        self.__last_progress = now
+        summary = self.summary()
+        self.progress_file.write(
+            f"{summary['records']} registros ({summary['accepted']} aceptados, "
+            f"{summary['rejected']} rechazados), {summary['records_per_second']} reg/s\n")
+        self.progress_file.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argumentos de la linea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="uc3m-money",
+        description="Carga masiva de transferencias o ingresos desde JSON Lines",
+        epilog="Por defecto se guarda en los mismos ficheros que AccountManager(): cada "
+               "lote reescribe transactions.json o deposits.json entero (memoria "
+               "proporcional al fichero y trabajo total cuadratico). Con --journal y "
+               "--deposit-wal cada lote solo se añade al final de transactions.jsonl o "
+               "deposits.wal y la memoria no crece con lo ya guardado, pero esos "
+               "ficheros solo los leen los gestores creados con journal=True o "
+               "deposit_wal: una carpeta usa siempre el mismo almacen de transferencias "
+               "(la carga se rechaza si ya existe el del otro modo). deposits.wal se "
+               "pasa a deposits.json al terminar, tambien con Ctrl+C o SIGTERM; si el "
+               "proceso muere sin terminar, la siguiente carga lo recupera.")
+    parser.add_argument("kind", choices=[TRANSFERS, DEPOSITS],
+                        help="transfers: un objeto con los parametros de transfer_request "
+                             "por linea; deposits: un objeto {\"IBAN\", \"AMOUNT\"} por linea")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="fichero JSON Lines (por defecto o con -, la entrada estandar)")
+    parser.add_argument("--json-folder", help="carpeta de datos (por defecto src/JsonFiles)")
+    parser.add_argument("--journal", action=argparse.BooleanOptionalAction, default=False,
+                        help="guardar las transferencias añadiendolas a transactions.jsonl "
+                             "en lugar de reescribir transactions.json en cada lote")
+    parser.add_argument("--database", help="guardar en esta base de datos SQLite")
+    parser.add_argument("--deposit-wal", choices=["always", "batch", "none", WAL_OFF],
+                        default=WAL_OFF,
+                        help="añadir los ingresos a deposits.wal con este modo de fsync "
+                             "(por defecto off: se reescribe deposits.json en cada lote)")
+    parser.add_argument("--wal-batch-records", type=int, default=100,
+                        help="en modo batch, fsync de deposits.wal cada N ingresos")
+    parser.add_argument("--wal-batch-ms", type=int, default=50,
+                        help="en modo batch, fsync como mucho N milisegundos despues del "
+                             "primer ingreso sin sincronizar")
+    parser.add_argument("--wal-checkpoint", type=int,
+                        help="pasar deposits.wal a deposits.json cada N ingresos "
+                             "(por defecto solo al terminar)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="lineas por lote (una escritura por lote)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos que validan y firman los lotes en paralelo")
+    parser.add_argument("--results", help="fichero JSON Lines con el resultado de cada linea")
+    parser.add_argument("--rejected",
+                        help="fichero JSON Lines con las lineas rechazadas, su codigo de "
+                             "error y el mensaje")
+    parser.add_argument("--progress", type=float, default=1.0,
+                        help="segundos entre informes de progreso (0: solo al terminar)")
+    parser.add_argument("--quiet", action="store_true", help="sin informes de progreso")
+    return parser
+
+
+def check_transfer_store(parser, manager: AccountManager, journal: bool):
+    """Rechaza cargar transferencias en un almacen si la carpeta ya usa el otro: los
+    duplicados solo se buscan en el propio y los lectores solo leen uno de los dos"""
+    journal_file = os.path.join(manager.json_folder, JOURNAL_FILE)
+    if journal and os.path.exists(manager.transactions_file):
+        parser.error("--journal: ya existe " + manager.transactions_file
+                     + " (cargue sin --journal)")
+    if not journal and os.path.exists(journal_file):
+        parser.error("ya existe " + journal_file + " (cargue con --journal)")
+
+
+def recover_deposit_wal(json_folder: str):
+    """Pasa a deposits.json los ingresos que dejo en deposits.wal una carga con
+    --deposit-wal que no llego a terminar"""
+    if os.path.exists(os.path.join(json_folder, "deposits.wal")):
+        manager = AccountManager(json_folder=json_folder, deposit_wal="none")
+        manager.checkpoint_deposits()
+        manager.close()
+
+
+def exit_on_signal(signum, _frame):
+    """Manejador de SIGTERM: termina como una salida normal para cerrar el gestor"""
+    raise SystemExit(128 + signum)
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de uc3m-money y de python -m uc3m_money"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.workers < 1:
+        parser.error("--batch-size y --workers deben ser al menos 1")
+
+    with contextlib.ExitStack() as stack:
+        try:
+            # Las lineas se leen en binario: json_codec decodifica bytes
+            input_file = (sys.stdin.buffer if args.input == "-"
+                          else stack.enter_context(open(args.input, "rb")))
+            results_file = (stack.enter_context(open(args.results, "w", encoding="utf-8"))
+                            if args.results else None)
+            rejected_file = (stack.enter_context(open(args.rejected, "w", encoding="utf-8"))
+                             if args.rejected else None)
+        except OSError as exc:
+            parser.error(str(exc))
+        if args.database:
+            # El diario y el WAL son de los ficheros JSON: SQLite ya inserta por lotes
+            manager = AccountManager(database=args.database, json_folder=args.json_folder)
+        else:
+            manager = AccountManager(
+                journal=args.journal, json_folder=args.json_folder,
+                deposit_wal=None if args.deposit_wal == WAL_OFF else args.deposit_wal,
+                wal_checkpoint=args.wal_checkpoint, wal_batch_records=args.wal_batch_records,
+                wal_batch_ms=args.wal_batch_ms)
+            if args.kind == TRANSFERS:
+                check_transfer_store(parser, manager, args.journal)
+            if args.deposit_wal == WAL_OFF:
+                recover_deposit_wal(manager.json_folder)
+        if threading.current_thread() is threading.main_thread():
+            # SIGTERM sale como Ctrl+C por el ExitStack: close pasa el WAL a deposits.json
+            previous = signal.signal(signal.SIGTERM, exit_on_signal)
+            stack.callback(signal.signal, signal.SIGTERM, previous)
+        stack.callback(manager.close)
+        loader = BulkLoader(manager, args.kind, results_file,
+                            None if args.quiet else sys.stderr, args.progress, rejected_file)
+        summary = loader.run(read_batches(input_file, args.batch_size), args.workers)
+    print(json.dumps(summary))
+    return 0
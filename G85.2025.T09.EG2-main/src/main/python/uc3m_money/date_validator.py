@@ -0,0 +1,23 @@
+"""MODULE: date_validator. Validacion de las fechas dd/mm/YYYY de las transferencias"""
+from datetime import datetime
+from functools import lru_cache
+
+DATE_FORMAT = "%d/%m/%Y"
+DATE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(date: str) -> datetime:
+    """Convierte la fecha con strptime. Un lote solo trae unos cientos de fechas
+    distintas y se memorizan; las no validas lanzan ValueError y no se guardan"""
+    return datetime.strptime(date, DATE_FORMAT)
+
+
+def validate_date(date: str, today: datetime) -> bool:
+    """Comprueba que la fecha es valida, de 2025 a 2050 y no anterior a today
+    (que se calcula una vez por lote con datetime.today())"""
+    try:
+        transfer_date = parse_date(date)
+    except ValueError:
+        return False
+    return 2025 <= transfer_date.year < 2051 and transfer_date >= today
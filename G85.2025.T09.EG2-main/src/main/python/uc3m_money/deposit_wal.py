@@ -0,0 +1,101 @@
+"""MODULE: deposit_wal. Registro de escritura anticipada (WAL) de ingresos"""
+
+# pylint: disable=too-many-instance-attributes
+import os
+import threading
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money import json_codec
+
+ALWAYS = "always"
+BATCH = "batch"
+NONE = "none"
+DURABILITY_MODES = (ALWAYS, BATCH, NONE)
+
+
+class DepositWal:
+    """Fichero JSON Lines al que se añaden los ingresos antes de pasarlos a deposits.json.
+    Durabilidad: "always" hace fsync tras cada escritura, "batch" cada batch_records
+    registros o como mucho batch_ms milisegundos despues del primero sin sincronizar,
+    y "none" deja la sincronizacion al sistema operativo."""
+
+    def __init__(self, wal_file: str, durability: str = BATCH,
+                 batch_records: int = 100, batch_ms: int = 50):
+        if durability not in DURABILITY_MODES:
+            raise AccountManagementException("ERROR durability mode not valid")
+        self.wal_file = wal_file
+        self.durability = durability
+        self.batch_records = batch_records
+        self.batch_ms = batch_ms
+        self.__file = None
+        self.__pending = 0
+        self.__unsynced = 0
+        self.__timer = None
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        """Registros escritos en el WAL desde el ultimo vaciado"""
+        return self.__pending
+
+    def append(self, records: list):
+        """Añade los registros al WAL y sincroniza segun el modo de durabilidad"""
+        with self.__lock:
+            if self.__file is None:
+                self.__pending = len(self.records())
+                self.__file = open(self.wal_file, "ab")  # pylint: disable=consider-using-with
+            self.__file.write(b"".join(json_codec.dumps(record) + b"\n" for record in records))
+            self.__file.flush()
+            self.__pending += len(records)
+            self.__unsynced += len(records)
+            if self.durability == ALWAYS or (self.durability == BATCH and
+                                             self.__unsynced >= self.batch_records):
+                self.__sync()
+            elif self.durability == BATCH and self.__timer is None:
+                self.__timer = threading.Timer(self.batch_ms / 1000, self.sync)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    def sync(self):
+        """Fuerza el fsync de lo escrito"""
+        with self.__lock:
+            self.__sync()
+
+    def records(self) -> list:
+        """Registros del WAL; una ultima linea incompleta (escritura interrumpida) se ignora"""
+        if not os.path.exists(self.wal_file):
+            return []
+        records = []
+        with open(self.wal_file, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                records.append(json_codec.loads(line))
+        return records
+
+    def truncate(self):
+        """Vacia el WAL una vez que sus registros estan a salvo en deposits.json"""
+        with self.__lock:
+            self.__close()
+            with open(self.wal_file, "w", encoding="utf-8") as file:
+                file.flush()
+                os.fsync(file.fileno())
+            self.__pending = 0
+
+    def close(self):
+        """Sincroniza y cierra el fichero"""
+        with self.__lock:
+            self.__close()
+
+    def __close(self):
+        self.__sync()
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __sync(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        if self.__file is not None and self.__unsynced:
+            if self.durability != NONE:
+                os.fsync(self.__file.fileno())
+            self.__unsynced = 0
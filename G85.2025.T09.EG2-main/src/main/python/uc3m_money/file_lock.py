@@ -0,0 +1,56 @@
+"""MODULE: file_lock. Bloqueo exclusivo entre procesos sobre un fichero"""
+import os
+import threading
+try:
+    import fcntl
+    msvcrt = None  # pylint: disable=invalid-name
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Cerrojo exclusivo (advisory) sobre lock_file, valido entre procesos e hilos"""
+
+    def __init__(self, lock_file: str):
+        self.lock_file = lock_file
+        # flock no excluye a los hilos de un mismo proceso (y msvcrt solo por
+        # descriptor): los hilos se excluyen con un Lock y el descriptor de cada
+        # adquisicion es propio del hilo que la tiene
+        self.__thread_lock = threading.Lock()
+        self.__local = threading.local()
+
+    def __enter__(self):
+        self.__thread_lock.acquire()  # pylint: disable=consider-using-with
+        try:
+            file = open(self.lock_file, "a+b")  # pylint: disable=consider-using-with
+            try:
+                if fcntl is not None:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+                else:
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            except BaseException:
+                file.close()
+                raise
+        except BaseException:
+            self.__thread_lock.release()
+            raise
+        self.__local.file = file
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        file = self.__local.file
+        self.__local.file = None
+        try:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            file.close()
+        finally:
+            self.__thread_lock.release()
+
+    def __repr__(self):
+        return "FileLock(" + os.path.basename(self.lock_file) + ")"
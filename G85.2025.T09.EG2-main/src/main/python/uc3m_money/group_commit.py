@@ -0,0 +1,70 @@
+"""MODULE: group_commit. Escritura agrupada entre procesos con un cerrojo de fichero"""
+
+# pylint: disable=too-few-public-methods
+import json
+import os
+import time
+import uuid
+from uc3m_money.file_lock import FileLock
+
+PENDING = ".pending"
+DONE = ".done"
+
+
+class GroupCommit:
+    """Agrupa las escrituras de varios procesos en una sola.
+    Cada escritor deja su registro en la carpeta de espera y pide el cerrojo; quien lo
+    obtiene escribe de una vez todos los registros pendientes (los suyos y los de los
+    escritores que esperan) con flush y deja a cada uno su resultado. Los que obtienen
+    el cerrojo despues encuentran su resultado ya escrito."""
+
+    def __init__(self, folder: str, name: str, flush):
+        """flush(lista de registros JSON) los guarda de una vez y devuelve el
+        resultado (serializable en JSON) de cada uno"""
+        self.spool_folder = os.path.join(folder, name + ".spool")
+        self.lock = FileLock(os.path.join(folder, name + ".lock"))
+        self.__flush = flush
+
+    def submit(self, record):
+        """Encola el registro y espera a que este guardado; devuelve su resultado"""
+        os.makedirs(self.spool_folder, exist_ok=True)
+        ticket = f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex}"
+        self.__write(os.path.join(self.spool_folder, ticket + PENDING), record)
+        done_file = os.path.join(self.spool_folder, ticket + DONE)
+        with self.lock:
+            if not os.path.exists(done_file):
+                try:
+                    self.__flush_pending()
+                except Exception:
+                    # Sin guardar: se retira el registro propio y el resto lo reintentan
+                    # sus escritores cuando obtengan el cerrojo
+                    pending_file = os.path.join(self.spool_folder, ticket + PENDING)
+                    if os.path.exists(pending_file):
+                        os.remove(pending_file)
+                    raise
+            with open(done_file, "r", encoding="utf-8") as file:
+                result = json.load(file)
+            os.remove(done_file)
+        return result
+
+    def __flush_pending(self):
+        """Con el cerrojo tomado: guarda todos los registros pendientes de una vez"""
+        tickets = sorted(name[:-len(PENDING)] for name in os.listdir(self.spool_folder)
+                         if name.endswith(PENDING))
+        records = []
+        for ticket in tickets:
+            with open(os.path.join(self.spool_folder, ticket + PENDING), "r",
+                      encoding="utf-8") as file:
+                records.append(json.load(file))
+        results = self.__flush(records)
+        for ticket, result in zip(tickets, results):
+            self.__write(os.path.join(self.spool_folder, ticket + DONE), result)
+            os.remove(os.path.join(self.spool_folder, ticket + PENDING))
+
+    @staticmethod
+    def __write(path: str, data):
+        """Escritura atomica: los lectores nunca ven un fichero a medias"""
+        temp_file = path + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_file, path)
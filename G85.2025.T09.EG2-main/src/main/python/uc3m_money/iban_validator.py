@@ -0,0 +1,96 @@
+"""MODULE: iban_validator. Validacion de IBAN españoles, individual y masiva"""
+from functools import lru_cache
+from uc3m_money.lazy_numpy import numpy
+
+IBAN_LENGTH = 24
+CHUNK_SIZE = 65536
+IBAN_CACHE_SIZE = 8192
+
+
+def validate_iban(iban):
+    """Valida que sea un str y consulta la cache de resultados recientes"""
+    if not isinstance(iban, str):
+        return False
+    return _check_iban(iban)
+
+
+@lru_cache(maxsize=IBAN_CACHE_SIZE)
+def _check_iban(iban: str) -> bool:
+    """Valida un IBAN; los IBAN de contrapartida se repiten mucho y se memorizan"""
+    # Valida las mayúsculas y quita los espacios
+    iban = iban.replace(" ", "").upper()
+
+    # Valida que comienza con ES, la longitud y que luego de ES solo hay dígitos
+    if not iban.startswith("ES") or len(iban) != IBAN_LENGTH or not iban[2:].isdigit():
+        return False
+
+    if not iban.isascii():
+        # Dígitos Unicode: se mantiene la conversion original a entero
+        return int(iban[4:] + "1428" + iban[2:4]) % 97 == 1
+
+    # Numero reordenado: BBAN (20 dígitos) + "ES" (1428) + dígitos de control,
+    # reducido modulo 97 por bloques de como mucho 9 dígitos, sin enteros grandes
+    remainder = int(iban[4:13]) % 97
+    remainder = (remainder * 1000000000 + int(iban[13:22])) % 97
+    remainder = (remainder * 100 + int(iban[22:24])) % 97
+    remainder = (remainder * 10000 + 1428) % 97
+    remainder = (remainder * 100 + int(iban[2:4])) % 97
+    return remainder == 1
+
+
+def validate_ibans(ibans):
+    """
+    Valida una lista o array de IBAN y devuelve una lista de bool con el mismo
+    resultado que validate_iban para cada elemento, este o no instalado numpy. Con numpy
+    el modulo 97 se calcula por bloques sobre matrices de digitos uint8; sin numpy se
+    valida uno a uno.
+    """
+    np = numpy()
+    if np is None:
+        return [validate_iban(iban) for iban in ibans]
+    if not isinstance(ibans, list):
+        ibans = list(ibans)
+    mask = np.zeros(len(ibans), dtype=bool)
+    for start in range(0, len(ibans), CHUNK_SIZE):
+        positions = []
+        candidates = []
+        for position, iban in enumerate(ibans[start:start + CHUNK_SIZE], start):
+            if not isinstance(iban, str):
+                continue
+            normalized = iban.replace(" ", "").upper()
+            if len(normalized) != IBAN_LENGTH:
+                continue
+            if not normalized.isascii():
+                # Digitos Unicode (isdigit) solo los trata la version escalar
+                mask[position] = validate_iban(iban)
+                continue
+            positions.append(position)
+            candidates.append(normalized)
+        if positions:
+            rows = np.frombuffer("".join(candidates).encode("ascii"), dtype=np.uint8)
+            mask[positions] = _validate_rows(np, rows.reshape(-1, IBAN_LENGTH))
+    return mask.tolist()
+
+
+def _mod97_weights():
+    """Pesos 10^k mod 97 de cada columna 2..23 del IBAN en el numero reordenado
+    (BBAN + "ES" como 1428 + digitos de control) y aporte constante de "1428"."""
+    # Posicion de cada digito en el numero de 26 cifras, de izquierda a derecha
+    positions = [24, 25] + list(range(20))
+    weights = [pow(10, 25 - position, 97) for position in positions]
+    constant = sum(int(digit) * pow(10, 25 - position, 97)
+                   for position, digit in zip(range(20, 24), "1428")) % 97
+    return weights, constant
+
+
+MOD97_WEIGHTS, MOD97_CONSTANT = _mod97_weights()
+
+
+def _validate_rows(np, rows):
+    """Valida una matriz (n, 24) de codigos ASCII de IBAN ya normalizados"""
+    digits = rows[:, 2:]
+    valid = (rows[:, 0] == ord("E")) & (rows[:, 1] == ord("S"))
+    valid &= ((digits >= ord("0")) & (digits <= ord("9"))).all(axis=1)
+    remainder = ((digits - ord("0")).astype(np.int32) @ np.array(MOD97_WEIGHTS, dtype=np.int32)
+                 + MOD97_CONSTANT) % 97
+    return valid & (remainder == 1)
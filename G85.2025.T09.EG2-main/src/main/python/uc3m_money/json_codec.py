@@ -0,0 +1,40 @@
+"""MODULE: json_codec. Codificacion compacta de los ficheros JSON guardados"""
+
+# pylint: disable=no-member
+import json
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin el se usa json de la biblioteca estandar
+    orjson = None
+
+COMPACT_SEPARATORS = (",", ":")
+
+
+def dumps(data, pretty: bool = False, allow_nan: bool = False) -> bytes:
+    """
+    Codifica data como JSON en UTF-8. Por defecto sin espacios ni saltos de linea
+    (con orjson si esta instalado); con pretty=True con el formato indent=4 original.
+    Con allow_nan=True se usa siempre json, que escribe NaN e Infinity (orjson los
+    convertiria en null).
+    """
+    if pretty:
+        return json.dumps(data, indent=4).encode("utf-8")
+    if orjson is not None and not allow_nan:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # Tipos que orjson no admite (enteros de mas de 64 bits, claves no str...)
+            pass
+    return json.dumps(data, separators=COMPACT_SEPARATORS).encode("utf-8")
+
+
+def loads(raw: bytes):
+    """Decodifica JSON en UTF-8 escrito en cualquier formato (compacto o indentado).
+    Lanza json.JSONDecodeError si no es JSON valido."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # NaN, Infinity u otros casos que solo acepta json: se reintenta con json
+            pass
+    return json.loads(raw.decode("utf-8"))
@@ -0,0 +1,383 @@
+"""MODULE: json_storage. Almacenes de AccountManager sobre los ficheros JSON de una carpeta"""
+
+# pylint: disable=too-many-arguments
+# pylint: disable=too-many-positional-arguments
+# pylint: disable=too-many-instance-attributes
+import json
+import os
+from uc3m_money import json_codec
+from uc3m_money.account_management_exception import AccountManagementException
+from uc3m_money.transfer_journal import TransferJournal
+from uc3m_money.transfer_index import TransferIndex
+from uc3m_money.ledger_reader import LedgerReader
+from uc3m_money.balance_index import BalanceIndex
+from uc3m_money.ledger_snapshot import LedgerSnapshot
+from uc3m_money.deposit_wal import DepositWal
+from uc3m_money.metrics import NO_METRICS, TRANSFER_OPERATION, DEPOSIT_OPERATION, \
+    BALANCE_OPERATION
+
+
+class JsonFileStorage:
+    """
+    Almacen con el formato original: transactions.json, deposits.json,
+    transactions2.json (movimientos) y saldos.json dentro de json_folder.
+    Con streaming=True los movimientos se recorren elemento a elemento en lugar de
+    cargar el fichero entero; con balance_index=True se mantiene un agregado por IBAN
+    en transactions2.json.idx y solo se procesan los movimientos nuevos; con
+    ledger_snapshot=True los saldos se suman sobre la copia binaria por columnas
+    transactions2.json.snap (ver LedgerSnapshot), que se regenera si el ledger cambia.
+    Los ficheros se escriben en JSON compacto (ver json_codec; con pretty=True con el
+    formato indent=4 original) y se leen en cualquiera de los dos formatos.
+    Con deposit_wal ("always", "batch" o "none") los ingresos se añaden a deposits.wal
+    con ese modo de fsync (en "batch", cada wal_batch_records registros o wal_batch_ms
+    milisegundos, ver DepositWal) y se pasan a deposits.json (con renombrado atomico)
+    cada wal_checkpoint registros (con None solo en flush() o close()), en flush() o
+    close() y en el primer uso si quedaron pendientes.
+    El constructor no hace E/S: json_folder se crea al escribir por primera vez.
+    """
+
+    def __init__(self, json_folder: str, streaming: bool = False, balance_index: bool = False,
+                 deposit_wal: str = None, wal_checkpoint: int = 1000, metrics=NO_METRICS,
+                 pretty: bool = False, ledger_snapshot: bool = False,
+                 wal_batch_records: int = 100, wal_batch_ms: int = 50):
+        self.json_folder = json_folder
+        self.metrics = metrics
+        self.pretty = pretty
+        self.streaming = streaming
+        self.transactions_file = os.path.join(json_folder, "transactions.json")
+        self.deposits_file = os.path.join(json_folder, "deposits.json")
+        self.ledger_file = os.path.join(json_folder, "transactions2.json")
+        self.balances_file = os.path.join(json_folder, "saldos.json")
+        self.transfer_index = TransferIndex(self.transactions_file, self.load_transfers)
+        self.balance_index = BalanceIndex(self.ledger_file) if balance_index else None
+        self.ledger_snapshot = LedgerSnapshot(self.ledger_file) if ledger_snapshot else None
+        self.wal_checkpoint = wal_checkpoint
+        self.deposit_wal = None
+        if deposit_wal is not None:
+            self.deposit_wal = DepositWal(os.path.join(json_folder, "deposits.wal"),
+                                          deposit_wal, wal_batch_records, wal_batch_ms)
+        self.__folder_created = False
+        self.__wal_recovered = False
+
+    def create_folder(self):
+        """Crea json_folder (una vez) antes de escribir en el"""
+        if not self.__folder_created:
+            os.makedirs(self.json_folder, exist_ok=True)
+            self.__folder_created = True
+
+    def has_transfer(self, transfer_code: str) -> bool:
+        """Busca el codigo en el indice persistente de transferencias"""
+        # La primera consulta puede escribir el indice
+        self.create_folder()
+        return transfer_code in self.transfer_index
+
+    def add_transfers(self, transfers_data: list):
+        """Añade las transferencias a transactions.json y al indice"""
+        self.create_folder()
+        if os.path.exists(self.transactions_file):
+            try:
+                transactions = self.read_json(TRANSFER_OPERATION, self.transactions_file)
+            except json.JSONDecodeError:
+                transactions = []
+        else:
+            transactions = []
+
+        transactions.extend(transfers_data)
+        self.write_json(TRANSFER_OPERATION, self.transactions_file, transactions)
+        self.transfer_index.add_many([data["transfer_code"] for data in transfers_data])
+
+    def load_transfers(self) -> list:
+        """Devuelve la lista de transactions.json"""
+        if not os.path.exists(self.transactions_file):
+            return []
+        with open(self.transactions_file, "rb") as file:
+            raw = file.read()
+        try:
+            return json_codec.loads(raw)
+        except json.JSONDecodeError:
+            return []
+
+    def add_deposits(self, deposits_data: list):
+        """Añade los ingresos a deposits.json (o al WAL)"""
+        self.create_folder()
+        if self.deposit_wal is not None:
+            self.__recover_wal()
+            with self.metrics.timer(DEPOSIT_OPERATION, "write"):
+                self.deposit_wal.append(deposits_data)
+            if (self.wal_checkpoint is not None
+                    and len(self.deposit_wal) >= self.wal_checkpoint):
+                self.flush()
+            return
+
+        deposits = self.__load_deposits_file()
+        deposits.extend(deposits_data)
+        self.write_json(DEPOSIT_OPERATION, self.deposits_file, deposits, atomic=True)
+
+    def load_deposits(self) -> list:
+        """Devuelve los ingresos guardados, incluidos los que aun estan en el WAL"""
+        if self.deposit_wal is not None:
+            self.__recover_wal()
+        deposits = self.__load_deposits_file()
+        if self.deposit_wal is not None:
+            deposits.extend(self.deposit_wal.records())
+        return deposits
+
+    def flush(self):
+        """
+        Pasa a deposits.json los ingresos del WAL y lo vacia. deposits.json se escribe
+        en un temporal sincronizado que se renombra encima, asi que una caida deja el
+        fichero anterior o el nuevo, nunca uno a medias. Los registros ya presentes
+        (caida entre el renombrado y el vaciado del WAL) no se duplican.
+        """
+        if self.deposit_wal is None:
+            return
+        self.__wal_recovered = True
+        records = self.deposit_wal.records()
+        if not records:
+            return
+        deposits = self.__load_deposits_file()
+        signatures = {deposit.get("deposit_signature") for deposit in deposits}
+        deposits.extend(record for record in records
+                        if record.get("deposit_signature") not in signatures)
+        self.write_json(DEPOSIT_OPERATION, self.deposits_file, deposits,
+                        atomic=True, durable=True)
+        self.deposit_wal.truncate()
+
+    def close(self):
+        """Pasa el WAL a deposits.json y lo cierra"""
+        if self.ledger_snapshot is not None:
+            self.ledger_snapshot.close()
+        if self.deposit_wal is not None:
+            self.flush()
+            self.deposit_wal.close()
+
+    def add_movements(self, movements: list):
+        """Añade movimientos al final de transactions2.json"""
+        self.create_folder()
+        ledger = []
+        if os.path.exists(self.ledger_file):
+            ledger = self.read_json(BALANCE_OPERATION, self.ledger_file)
+        ledger.extend(movements)
+        self.write_json(BALANCE_OPERATION, self.ledger_file, ledger)
+
+    def iban_movements(self, iban: str):
+        """Suma y numero de importes validos del IBAN en transactions2.json"""
+        if not os.path.exists(self.ledger_file):
+            raise AccountManagementException("ERROR file not found")
+
+        if self.balance_index is not None:
+            try:
+                with self.metrics.timer(BALANCE_OPERATION, "read"):
+                    return self.balance_index.totals(iban)
+            except (OSError, ValueError) as exc:
+                raise AccountManagementException("ERROR reading transaction file") from exc
+        if self.ledger_snapshot is not None:
+            try:
+                with self.metrics.timer(BALANCE_OPERATION, "read"):
+                    totals = self.ledger_snapshot.totals(iban)
+            except (OSError, ValueError) as exc:
+                raise AccountManagementException("ERROR reading transaction file") from exc
+            if totals is not None:
+                return totals
+        if self.streaming:
+            with self.metrics.timer(BALANCE_OPERATION, "read"):
+                return self.__stream_iban_amounts(iban)
+        return self.__load_iban_amounts(iban)
+
+    def movements_by_iban(self, ibans: set) -> dict:
+        """Suma y numero de importes validos de cada IBAN con una sola lectura de
+        transactions2.json (o del indice o la copia por columnas)"""
+        if not os.path.exists(self.ledger_file):
+            raise AccountManagementException("ERROR file not found")
+
+        if self.balance_index is not None:
+            try:
+                with self.metrics.timer(BALANCE_OPERATION, "read"):
+                    return self.balance_index.totals_many(ibans)
+            except (OSError, ValueError) as exc:
+                raise AccountManagementException("ERROR reading transaction file") from exc
+        if self.ledger_snapshot is not None:
+            try:
+                with self.metrics.timer(BALANCE_OPERATION, "read"):
+                    totals = self.ledger_snapshot.totals_many(ibans)
+            except (OSError, ValueError) as exc:
+                raise AccountManagementException("ERROR reading transaction file") from exc
+            if totals is not None:
+                return totals
+        if self.streaming:
+            with self.metrics.timer(BALANCE_OPERATION, "read"):
+                return self.__stream_amounts_by_iban(ibans)
+        return self.__load_amounts_by_iban(ibans)
+
+    def accumulate_balance(self, iban: str, total_balance: float, timestamp: float):
+        """Guarda o actualiza el saldo del IBAN en saldos.json acumulando el anterior"""
+        self.accumulate_balances([(iban, total_balance)], timestamp)
+
+    def accumulate_balances(self, balances: list, timestamp: float):
+        """Guarda o actualiza en saldos.json el saldo de cada (iban, saldo) acumulando
+        el anterior, con una sola lectura y una sola escritura del fichero"""
+        self.create_folder()
+        if os.path.exists(self.balances_file):
+            try:
+                entries = self.read_json(BALANCE_OPERATION, self.balances_file)
+            except json.JSONDecodeError:
+                entries = []
+        else:
+            entries = []
+
+        # Primera entrada de cada IBAN (la que se actualiza si se repite)
+        entries_by_iban = {}
+        for entry in entries:
+            entries_by_iban.setdefault(entry.get("iban"), entry)
+
+        for iban, total_balance in balances:
+            entry = entries_by_iban.get(iban)
+            if entry is not None:
+                # Acumular el nuevo saldo
+                entry["saldos"] = round(entry.get("saldos", 0.0) + total_balance, 2)
+                entry["timestamp"] = timestamp
+            else:
+                # Si no estaba, lo añadimos como nuevo
+                entry = {"iban": iban, "saldos": round(total_balance, 2),
+                         "timestamp": timestamp}
+                entries.append(entry)
+                entries_by_iban[iban] = entry
+
+        # Guardar de vuelta (los saldos pueden ser NaN si lo es algun importe)
+        self.write_json(BALANCE_OPERATION, self.balances_file, entries, allow_nan=True)
+
+    def load_balances(self) -> list:
+        """Devuelve la lista de saldos.json"""
+        if not os.path.exists(self.balances_file):
+            return []
+        return self.read_json(BALANCE_OPERATION, self.balances_file)
+
+    def read_json(self, operation: str, path: str):
+        """Lee y decodifica un fichero JSON midiendo por separado lectura y parseo"""
+        with self.metrics.timer(operation, "read"):
+            with open(path, "rb") as file:
+                raw = file.read()
+        self.metrics.count(operation, "bytes_read", len(raw))
+        with self.metrics.timer(operation, "parse"):
+            data = json_codec.loads(raw)
+        if isinstance(data, list):
+            self.metrics.count(operation, "records_read", len(data))
+        return data
+
+    def write_json(self, operation: str, path: str, data: list,
+                   atomic: bool = False, durable: bool = False, allow_nan: bool = False):
+        """Escribe data en path; con atomic en un temporal que se renombra sobre path,
+        y con durable ademas sincronizado con fsync antes del renombrado"""
+        with self.metrics.timer(operation, "write"):
+            raw = json_codec.dumps(data, self.pretty, allow_nan)
+            target = path + ".tmp" if atomic else path
+            with open(target, "wb") as file:
+                file.write(raw)
+                if durable:
+                    file.flush()
+                    os.fsync(file.fileno())
+            if atomic:
+                os.replace(target, path)
+        self.metrics.count(operation, "bytes_written", len(raw))
+
+    def __recover_wal(self):
+        """Recuperacion: lo que quedo en el WAL tras una caida se pasa a deposits.json"""
+        if not self.__wal_recovered:
+            self.flush()
+
+    def __load_deposits_file(self) -> list:
+        if not os.path.exists(self.deposits_file):
+            return []
+        return self.read_json(DEPOSIT_OPERATION, self.deposits_file)
+
+    def __load_iban_amounts(self, iban: str):
+        """Carga transactions2.json entero y suma los importes del IBAN"""
+        try:
+            transactions = self.read_json(BALANCE_OPERATION, self.ledger_file)
+        except Exception as exc:
+            raise AccountManagementException("ERROR reading transaction file") from exc
+
+        # Buscar y sumar movimientos del IBAN
+        amounts = []
+        for entry in transactions:
+            if entry.get("IBAN") == iban:
+                try:
+                    amounts.append(float(entry.get("amount")))
+                except (ValueError, TypeError):
+                    continue
+        return sum(amounts), len(amounts)
+
+    def __stream_iban_amounts(self, iban: str):
+        """Suma los importes del IBAN recorriendo el array sin cargarlo en memoria"""
+        total_balance = 0
+        count = 0
+        try:
+            for entry in LedgerReader(self.ledger_file):
+                if entry.get("IBAN") == iban:
+                    try:
+                        total_balance += float(entry.get("amount"))
+                    except (ValueError, TypeError):
+                        continue
+                    count += 1
+        except (OSError, ValueError) as exc:
+            raise AccountManagementException("ERROR reading transaction file") from exc
+        return total_balance, count
+
+    def __load_amounts_by_iban(self, ibans: set) -> dict:
+        """Carga transactions2.json entero y suma los importes de cada IBAN"""
+        try:
+            transactions = self.read_json(BALANCE_OPERATION, self.ledger_file)
+        except Exception as exc:
+            raise AccountManagementException("ERROR reading transaction file") from exc
+
+        # Se suman con sum() como en __load_iban_amounts para dar el mismo resultado
+        amounts = {iban: [] for iban in ibans}
+        for entry in transactions:
+            iban = entry.get("IBAN")
+            if isinstance(iban, str) and iban in amounts:
+                try:
+                    amounts[iban].append(float(entry.get("amount")))
+                except (ValueError, TypeError):
+                    continue
+        return {iban: (sum(values), len(values)) for iban, values in amounts.items()}
+
+    def __stream_amounts_by_iban(self, ibans: set) -> dict:
+        """Suma los importes de cada IBAN recorriendo el array sin cargarlo en memoria"""
+        totals = {iban: [0, 0] for iban in ibans}
+        try:
+            for entry in LedgerReader(self.ledger_file):
+                iban = entry.get("IBAN")
+                if isinstance(iban, str) and iban in totals:
+                    try:
+                        totals[iban][0] += float(entry.get("amount"))
+                    except (ValueError, TypeError):
+                        continue
+                    totals[iban][1] += 1
+        except (OSError, ValueError) as exc:
+            raise AccountManagementException("ERROR reading transaction file") from exc
+        return {iban: tuple(accumulator) for iban, accumulator in totals.items()}
+
+
+class JournalStorage(JsonFileStorage):
+    """Como JsonFileStorage, pero las transferencias se guardan en transactions.jsonl
+    (JSON Lines) añadiendo una linea por transferencia en lugar de reescribir el fichero"""
+
+    def __init__(self, json_folder: str, streaming: bool = False, balance_index: bool = False,
+                 deposit_wal: str = None, wal_checkpoint: int = 1000, metrics=NO_METRICS,
+                 pretty: bool = False, ledger_snapshot: bool = False,
+                 wal_batch_records: int = 100, wal_batch_ms: int = 50):
+        super().__init__(json_folder, streaming, balance_index, deposit_wal, wal_checkpoint,
+                         metrics, pretty, ledger_snapshot, wal_batch_records, wal_batch_ms)
+        self.journal = TransferJournal(os.path.join(json_folder, "transactions.jsonl"))
+        self.transfer_index = TransferIndex(self.journal.journal_file, self.load_transfers)
+
+    def add_transfers(self, transfers_data: list):
+        """Añade una linea por transferencia al final del diario"""
+        self.create_folder()
+        with self.metrics.timer(TRANSFER_OPERATION, "write"):
+            self.journal.append_many(transfers_data)
+        self.transfer_index.add_many([data["transfer_code"] for data in transfers_data])
+
+    def load_transfers(self) -> list:
+        """Devuelve las transferencias del diario"""
+        return self.journal.load()
@@ -0,0 +1,14 @@
+"""MODULE: lazy_numpy. Importacion diferida de numpy, que es opcional"""
+import importlib
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def numpy():
+    """Devuelve el modulo numpy, o None si no esta instalado. Se importa en la primera
+    llamada y no al importar uc3m_money: cuesta decenas de milisegundos y la mayoria
+    de las ejecuciones cortas no lo usan"""
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
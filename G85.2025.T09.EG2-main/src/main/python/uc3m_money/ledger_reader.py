@@ -0,0 +1,123 @@
+"""MODULE: ledger_reader. Lectura incremental de ficheros con un array JSON"""
+
+# pylint: disable=too-few-public-methods
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class LedgerReader:
+    """Recorre un array JSON elemento a elemento con memoria constante.
+    Tras cada elemento devuelto, offset es la posicion (en bytes) justo despues de el,
+    y se puede usar para continuar la lectura mas adelante desde ese punto."""
+
+    def __init__(self, file_path: str, offset: int = 0, chunk_size: int = 65536):
+        self.file_path = file_path
+        self.offset = offset
+        self.chunk_size = chunk_size
+        self.__decoder = json.JSONDecoder()
+
+    def __iter__(self):
+        with open(self.file_path, "rb") as file:
+            file.seek(self.offset)
+            yield from self.__entries(file)
+
+    def __entries(self, file):
+        """Automata: '[' inicial (o ',' si se continua), elementos separados por ',' y ']'"""
+        reader = _ChunkBuffer(file, self.chunk_size, self.offset)
+        if self.offset == 0:
+            if reader.next_char() != "[":
+                raise json.JSONDecodeError("Expecting '['", reader.text, reader.pos)
+            reader.advance(1)
+            if reader.next_char() == "]":
+                reader.advance(1)
+                reader.expect_end()
+                return
+        else:
+            # Continuacion: justo despues de un elemento viene ',' o ']'
+            if self.__after_entry(reader):
+                return
+        while True:
+            reader.next_char()
+            entry = self.__decode(reader)
+            self.offset = reader.byte_offset
+            yield entry
+            if self.__after_entry(reader):
+                return
+
+    @staticmethod
+    def __after_entry(reader) -> bool:
+        """Consume el separador tras un elemento; devuelve True si el array ha terminado"""
+        char = reader.next_char()
+        if char == ",":
+            reader.advance(1)
+            return False
+        if char == "]":
+            reader.advance(1)
+            reader.expect_end()
+            return True
+        raise json.JSONDecodeError("Expecting ',' delimiter", reader.text, reader.pos)
+
+    def __decode(self, reader):
+        """Decodifica el siguiente valor, leyendo mas datos si esta incompleto"""
+        while True:
+            try:
+                entry, end = self.__decoder.raw_decode(reader.text, reader.pos)
+            except json.JSONDecodeError:
+                if reader.fill():
+                    continue
+                raise
+            # Un numero al final del buffer podria continuar en el siguiente bloque
+            if end == len(reader.text) and reader.fill():
+                continue
+            reader.advance(end - reader.pos)
+            return entry
+
+
+class _ChunkBuffer:
+    """Buffer de texto sobre el fichero que lleva la cuenta de la posicion en bytes"""
+
+    def __init__(self, file, chunk_size: int, byte_offset: int):
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__eof = False
+        self.text = ""
+        self.pos = 0
+        self.byte_offset = byte_offset
+
+    def fill(self) -> bool:
+        """Añade el siguiente bloque al buffer; devuelve False al final del fichero"""
+        if self.__eof:
+            return False
+        chunk = self.__file.read(self.__chunk_size)
+        if not chunk:
+            self.__eof = True
+            self.text = self.text[self.pos:] + self.__decoder.decode(b"", final=True)
+        else:
+            self.text = self.text[self.pos:] + self.__decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def advance(self, length: int):
+        """Avanza sobre texto ya procesado"""
+        consumed = self.text[self.pos:self.pos + length]
+        self.byte_offset += len(consumed) if consumed.isascii() else len(consumed.encode())
+        self.pos += length
+
+    def next_char(self) -> str:
+        """Salta espacios en blanco y devuelve el siguiente caracter ('' al final)"""
+        while True:
+            end = WHITESPACE.match(self.text, self.pos).end()
+            self.advance(end - self.pos)
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect_end(self):
+        """Tras el ']' final solo puede haber espacios en blanco"""
+        if self.next_char() != "":
+            raise json.JSONDecodeError("Extra data", self.text, self.pos)
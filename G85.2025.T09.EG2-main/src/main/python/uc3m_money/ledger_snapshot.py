@@ -0,0 +1,202 @@
+"""MODULE: ledger_snapshot. Copia binaria por columnas de transactions2.json"""
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from uc3m_money.lazy_numpy import numpy
+from uc3m_money.ledger_reader import LedgerReader
+from uc3m_money.balance_index import valid_movements
+
+MAGIC = b"UC3MLSN1"
+# Cabecera: marca, tamaño y mtime_ns del ledger copiado, 1 si todos los importes son
+# centimos exactos, bytes del diccionario de IBAN y numero de filas
+HEADER = struct.Struct("<8sqqqqq")
+ALIGNMENT = 8
+MAX_CENTS = 2 ** 53
+
+
+def _padding(length: int) -> bytes:
+    return b"\0" * (-length % ALIGNMENT)
+
+
+def _to_cents(amount: float):
+    """Importe en centimos enteros, o None si no es un numero exacto de centimos"""
+    if not math.isfinite(amount):
+        return None
+    cents = round(amount * 100)
+    if abs(cents) >= MAX_CENTS or cents / 100 != amount:
+        return None
+    return cents
+
+
+class LedgerSnapshot:
+    """
+    Copia de transactions2.json en transactions2.json.snap con los movimientos por
+    columnas: el IBAN como identificador entero (int32) de un diccionario y el importe
+    como centimos (int64). El fichero se lee con mmap y la suma de un IBAN recorre las
+    dos columnas (con numpy si esta instalado) sin parsear JSON ni convertir textos.
+    La copia guarda el tamaño y el mtime del ledger y se regenera si ha cambiado.
+    Si algun importe no es un numero exacto de centimos (NaN, mas de dos decimales...)
+    la copia se marca como no exacta y totals() devuelve None.
+    """
+
+    def __init__(self, ledger_file: str):
+        self.ledger_file = ledger_file
+        self.snapshot_file = ledger_file + ".snap"
+        self.__mapping = None
+        self.__header = None
+        self.__ibans = None
+
+    def totals(self, iban: str):
+        """Devuelve (suma, numero de importes) del IBAN con la copia al dia,
+        o None si la copia no es exacta"""
+        self.update()
+        if not self.__header[3]:
+            return None
+        iban_id = self.__ibans.get(iban)
+        if iban_id is None:
+            return 0, 0
+        rows, ids_offset, cents_offset = self.__columns()
+        if numpy() is not None:
+            return self.__numpy_totals(iban_id, rows, ids_offset, cents_offset)
+
+        total_cents = 0
+        count = 0
+        for row_id, row_cents in self.__rows(rows, ids_offset, cents_offset):
+            if row_id == iban_id:
+                total_cents += row_cents
+                count += 1
+        return total_cents / 100, count
+
+    def totals_many(self, ibans):
+        """Devuelve {iban: (suma, numero de importes)} de varios IBAN recorriendo las
+        columnas una sola vez, o None si la copia no es exacta"""
+        self.update()
+        if not self.__header[3]:
+            return None
+        wanted = {self.__ibans[iban]: iban for iban in ibans if iban in self.__ibans}
+        totals = {iban: (0, 0) for iban in ibans}
+        if not wanted:
+            return totals
+        if numpy() is not None:
+            cents_by_id = self.__numpy_cents_by_id(*self.__columns())
+        else:
+            cents_by_id = {iban_id: [0, 0] for iban_id in wanted}
+            for row_id, row_cents in self.__rows(*self.__columns()):
+                if row_id in cents_by_id:
+                    cents_by_id[row_id][0] += row_cents
+                    cents_by_id[row_id][1] += 1
+        for iban_id, iban in wanted.items():
+            total_cents, count = cents_by_id[iban_id]
+            totals[iban] = total_cents / 100, count
+        return totals
+
+    def __columns(self):
+        """(filas, posicion de la columna de ids, posicion de la de centimos)"""
+        dictionary_bytes, rows = self.__header[4:6]
+        ids_offset = HEADER.size + dictionary_bytes + len(_padding(dictionary_bytes))
+        cents_offset = ids_offset + rows * 4 + len(_padding(rows * 4))
+        return rows, ids_offset, cents_offset
+
+    def __rows(self, rows: int, ids_offset: int, cents_offset: int):
+        """(id, centimos) de cada fila sin numpy"""
+        ids = array("i", self.__mapping[ids_offset:ids_offset + rows * 4])
+        cents = array("q", self.__mapping[cents_offset:cents_offset + rows * 8])
+        if sys.byteorder == "big":
+            ids.byteswap()
+            cents.byteswap()
+        return zip(ids, cents)
+
+    def __numpy_cents_by_id(self, rows: int, ids_offset: int, cents_offset: int):
+        """(centimos, numero de importes) de cada identificador en una sola pasada"""
+        np = numpy()
+        ids = np.frombuffer(self.__mapping, dtype="<i4", count=rows, offset=ids_offset)
+        cents = np.frombuffer(self.__mapping, dtype="<i8", count=rows, offset=cents_offset)
+        # Sumas enteras exactas, como cents[mask].sum() en totals
+        sums = np.zeros(len(self.__ibans), dtype=np.int64)
+        np.add.at(sums, ids, cents)
+        counts = np.bincount(ids, minlength=len(self.__ibans))
+        return [(int(total_cents), int(count)) for total_cents, count in zip(sums, counts)]
+
+    def __numpy_totals(self, iban_id: int, rows: int, ids_offset: int, cents_offset: int):
+        """Suma vectorizada sobre las columnas mapeadas, sin copiarlas"""
+        np = numpy()
+        ids = np.frombuffer(self.__mapping, dtype="<i4", count=rows, offset=ids_offset)
+        cents = np.frombuffer(self.__mapping, dtype="<i8", count=rows, offset=cents_offset)
+        mask = ids == iban_id
+        return int(cents[mask].sum()) / 100, int(np.count_nonzero(mask))
+
+    def update(self):
+        """Regenera la copia si el ledger ha cambiado y la abre"""
+        stat = os.stat(self.ledger_file)
+        source = (stat.st_size, stat.st_mtime_ns)
+        if self.__header is not None and self.__header[1:3] == source:
+            return
+        self.close()
+        if self.__read_header() != source:
+            self.convert()
+        self.__open()
+
+    def convert(self):
+        """Recorre transactions2.json y escribe la copia por columnas (con un temporal
+        que se renombra encima). Los importes no numericos no se copian, igual que
+        calculate_balance no los suma."""
+        stat = os.stat(self.ledger_file)
+        dictionary = {}
+        ids = array("i")
+        cents = array("q")
+        exact = True
+        for iban, amount in valid_movements(LedgerReader(self.ledger_file)):
+            amount_cents = _to_cents(amount)
+            if amount_cents is None:
+                exact = False
+                break
+            ids.append(dictionary.setdefault(iban, len(dictionary)))
+            cents.append(amount_cents)
+        if not exact:
+            dictionary = {}
+            ids = array("i")
+            cents = array("q")
+        if sys.byteorder == "big":
+            ids.byteswap()
+            cents.byteswap()
+
+        dictionary_raw = json.dumps(list(dictionary)).encode("utf-8")
+        temp_file = self.snapshot_file + ".tmp"
+        with open(temp_file, "wb") as file:
+            file.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, int(exact),
+                                   len(dictionary_raw), len(ids)))
+            file.write(dictionary_raw + _padding(len(dictionary_raw)))
+            file.write(ids.tobytes() + _padding(len(ids) * 4))
+            file.write(cents.tobytes())
+        os.replace(temp_file, self.snapshot_file)
+
+    def close(self):
+        """Cierra el fichero mapeado"""
+        if self.__mapping is not None:
+            self.__mapping.close()
+        self.__mapping = None
+        self.__header = None
+        self.__ibans = None
+
+    def __read_header(self):
+        """(tamaño, mtime_ns) del ledger copiado, o None si no hay copia valida"""
+        try:
+            with open(self.snapshot_file, "rb") as file:
+                header = HEADER.unpack(file.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        if header[0] != MAGIC:
+            return None
+        return header[1:3]
+
+    def __open(self):
+        with open(self.snapshot_file, "rb") as file:
+            self.__mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__header = HEADER.unpack_from(self.__mapping)
+        dictionary_bytes = self.__header[4]
+        ibans = json.loads(self.__mapping[HEADER.size:HEADER.size + dictionary_bytes])
+        self.__ibans = {iban: iban_id for iban_id, iban in enumerate(ibans)}
@@ -0,0 +1,80 @@
+"""MODULE: memory_storage. Almacen en memoria de AccountManager (sin E/S)"""
+from uc3m_money.metrics import NO_METRICS
+from uc3m_money.balance_index import accumulate_movements
+
+
+class MemoryStorage:
+    """Guarda transferencias, ingresos, movimientos y saldos en estructuras de Python.
+    No escribe nada en disco: pensado para benchmarks y tests, o como punto de
+    partida para almacenes mas rapidos. Los movimientos se agregan por IBAN al
+    añadirlos, en el mismo orden en que se sumarian leyendo transactions2.json."""
+
+    def __init__(self, transfers: list = None, deposits: list = None, movements: list = None):
+        self.metrics = NO_METRICS
+        self.__transfers = []
+        self.__transfer_codes = set()
+        self.__deposits = []
+        self.__movements = {}
+        self.__balances = {}
+        self.add_transfers(transfers or [])
+        self.add_deposits(deposits or [])
+        self.add_movements(movements or [])
+
+    def has_transfer(self, transfer_code: str) -> bool:
+        """Indica si ya existe una transferencia con ese codigo"""
+        return transfer_code in self.__transfer_codes
+
+    def add_transfers(self, transfers_data: list):
+        """Guarda transferencias con el formato de TransferRequest.to_json"""
+        for data in transfers_data:
+            self.__transfers.append(dict(data))
+            self.__transfer_codes.add(data.get("transfer_code"))
+
+    def load_transfers(self) -> list:
+        """Devuelve copias de las transferencias en el orden en que se guardaron"""
+        return [dict(data) for data in self.__transfers]
+
+    def add_deposits(self, deposits_data: list):
+        """Guarda ingresos con el formato de deposits.json"""
+        self.__deposits.extend(dict(data) for data in deposits_data)
+
+    def load_deposits(self) -> list:
+        """Devuelve copias de los ingresos en el orden en que se guardaron"""
+        return [dict(data) for data in self.__deposits]
+
+    def add_movements(self, movements: list):
+        """Añade movimientos con el formato de transactions2.json"""
+        accumulate_movements(self.__movements, movements)
+
+    def iban_movements(self, iban: str):
+        """Devuelve la suma y el numero de importes validos de un IBAN"""
+        return self.__movements.get(iban, (0, 0))
+
+    def movements_by_iban(self, ibans: set) -> dict:
+        """Devuelve la suma y el numero de importes validos de cada IBAN"""
+        return {iban: self.__movements.get(iban, (0, 0)) for iban in ibans}
+
+    def accumulate_balances(self, balances: list, timestamp: float):
+        """Acumula los saldos calculados"""
+        for iban, total_balance in balances:
+            self.accumulate_balance(iban, total_balance, timestamp)
+
+    def accumulate_balance(self, iban: str, total_balance: float, timestamp: float):
+        """Acumula el saldo calculado"""
+        entry = self.__balances.get(iban)
+        if entry is None:
+            self.__balances[iban] = {"iban": iban, "saldos": round(total_balance, 2),
+                                     "timestamp": timestamp}
+        else:
+            entry["saldos"] = round(entry["saldos"] + total_balance, 2)
+            entry["timestamp"] = timestamp
+
+    def load_balances(self) -> list:
+        """Devuelve los saldos con el formato de saldos.json"""
+        return [dict(entry) for entry in self.__balances.values()]
+
+    def flush(self):
+        """No hay nada pendiente"""
+
+    def close(self):
+        """No hay recursos que liberar"""
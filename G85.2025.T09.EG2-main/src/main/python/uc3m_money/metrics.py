@@ -0,0 +1,167 @@
+"""MODULE: metrics. Registro de metricas de las operaciones de AccountManager"""
+
+# pylint: disable=unused-argument
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Limites superiores (segundos) de los cubos de los histogramas de latencia
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNTERS = ("records_read", "records_written", "bytes_read", "bytes_written")
+TRANSFER_OPERATION = "transfer_request"
+DEPOSIT_OPERATION = "deposit_into_account"
+BALANCE_OPERATION = "calculate_balance"
+NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    """Mide el tiempo de un bloque with y lo añade al histograma de su fase"""
+    __slots__ = ("__metrics", "__operation", "__phase", "__start")
+
+    def __init__(self, metrics, operation: str, phase: str):
+        self.__metrics = metrics
+        self.__operation = operation
+        self.__phase = phase
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.__metrics.observe(self.__operation, self.__phase,
+                               time.perf_counter() - self.__start)
+        return False
+
+
+class Metrics:
+    """Histogramas de latencia por operacion y fase (validation, read, parse, hashing,
+    write) y contadores de registros y bytes leidos y escritos por operacion"""
+    enabled = True
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+        self.__counters = {}
+
+    def timer(self, operation: str, phase: str):
+        """Context manager que mide la fase de la operacion"""
+        return _Timer(self, operation, phase)
+
+    def observe(self, operation: str, phase: str, seconds: float):
+        """Añade una medida al histograma (operacion, fase)"""
+        with self.__lock:
+            histogram = self.__histograms.get((operation, phase))
+            if histogram is None:
+                histogram = {"buckets": [0] * (len(BUCKETS) + 1), "sum": 0.0, "count": 0}
+                self.__histograms[(operation, phase)] = histogram
+            histogram["buckets"][bisect.bisect_left(BUCKETS, seconds)] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    def count(self, operation: str, counter: str, value: int = 1):
+        """Suma value al contador (records_read, records_written, bytes_read o
+        bytes_written) de la operacion"""
+        with self.__lock:
+            key = (operation, counter)
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def reset(self):
+        """Borra todas las medidas"""
+        with self.__lock:
+            self.__histograms = {}
+            self.__counters = {}
+
+    def stats(self) -> dict:
+        """
+        Copia de las metricas:
+        {"latency": {operacion: {fase: {"count", "sum_seconds", "buckets"}}},
+         "counters": {operacion: {contador: valor}}}
+        donde buckets es {limite superior: numero acumulado de medidas} como en Prometheus.
+        """
+        with self.__lock:
+            latency = {}
+            for (operation, phase), histogram in sorted(self.__histograms.items()):
+                cumulative = 0
+                buckets = {}
+                for bound, observed in zip(BUCKETS + ("+Inf",), histogram["buckets"]):
+                    cumulative += observed
+                    buckets[str(bound)] = cumulative
+                latency.setdefault(operation, {})[phase] = {
+                    "count": histogram["count"], "sum_seconds": histogram["sum"],
+                    "buckets": buckets}
+            counters = {}
+            for (operation, counter), value in sorted(self.__counters.items()):
+                counters.setdefault(operation, {})[counter] = value
+        return {"latency": latency, "counters": counters}
+
+    def prometheus(self) -> str:
+        """Metricas en el formato de texto de Prometheus"""
+        stats = self.stats()
+        lines = ["# HELP uc3m_money_operation_seconds Latencia por operacion y fase",
+                 "# TYPE uc3m_money_operation_seconds histogram"]
+        for operation, phases in stats["latency"].items():
+            for phase, histogram in phases.items():
+                labels = f'operation="{operation}",phase="{phase}"'
+                for bound, cumulative in histogram["buckets"].items():
+                    lines.append(f'uc3m_money_operation_seconds_bucket{{{labels},le="{bound}"}} '
+                                 f'{cumulative}')
+                lines.append(f"uc3m_money_operation_seconds_sum{{{labels}}} "
+                             f"{histogram['sum_seconds']!r}")
+                lines.append(f"uc3m_money_operation_seconds_count{{{labels}}} "
+                             f"{histogram['count']}")
+        for name, help_text in (("records", "Registros leidos y escritos"),
+                                ("bytes", "Bytes leidos y escritos")):
+            lines.append(f"# HELP uc3m_money_{name}_total {help_text}")
+            lines.append(f"# TYPE uc3m_money_{name}_total counter")
+            for operation, counters in stats["counters"].items():
+                for direction in ("read", "written"):
+                    value = counters.get(f"{name}_{direction}")
+                    if value is not None:
+                        lines.append(f'uc3m_money_{name}_total{{operation="{operation}",'
+                                     f'direction="{direction}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Escribe las metricas en formato Prometheus (temporal y renombrado atomico)"""
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.prometheus())
+        os.replace(temp_path, path)
+
+
+class DisabledMetrics:
+    """Registro vacio que se usa sin metricas: no mide nada y no cuesta casi nada"""
+    enabled = False
+
+    def timer(self, operation: str, phase: str):
+        """Context manager que no hace nada"""
+        return NULL_TIMER
+
+    def observe(self, operation: str, phase: str, seconds: float):
+        """No guarda la medida"""
+
+    def count(self, operation: str, counter: str, value: int = 1):
+        """No cuenta nada"""
+
+    def reset(self):
+        """No hay nada que borrar"""
+
+    def stats(self) -> dict:
+        """Metricas vacias"""
+        return {"latency": {}, "counters": {}}
+
+    def prometheus(self) -> str:
+        """Sin metricas no hay nada que exportar"""
+        return ""
+
+    def dump(self, path: str):
+        """Escribe un fichero vacio"""
+        with open(path, "w", encoding="utf-8"):
+            pass
+
+
+NO_METRICS = DisabledMetrics()
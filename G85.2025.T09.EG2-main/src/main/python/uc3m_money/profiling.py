@@ -0,0 +1,108 @@
+"""MODULE: profiling. Perfilado por muestreo de las llamadas a AccountManager"""
+
+# cProfile y tracemalloc (que carga pickle) se importan al perfilar la primera llamada
+# y no al arrancar, donde casi nunca se usan
+# pylint: disable=import-outside-toplevel
+import functools
+import itertools
+import os
+import threading
+import time
+
+PROFILE_ENV = "UC3M_MONEY_PROFILE"
+PROFILE_DIR_ENV = "UC3M_MONEY_PROFILE_DIR"
+PROFILE_TOP_ENV = "UC3M_MONEY_PROFILE_TOP"
+DEFAULT_TOP = 20
+
+
+class Profiler:
+    """Perfila una de cada sample_every llamadas con cProfile y tracemalloc y deja en
+    output_folder un fichero .prof (para pstats o snakeviz) y un informe .txt con las
+    top lineas que mas memoria han reservado. Solo cuentan y se muestrean las llamadas
+    mas externas de cada hilo: las llamadas a metodos envueltos hechas desde otro
+    (p. ej. validate_iban dentro de calculate_balance) se ejecutan sin perfilar aparte.
+    Solo se perfila una llamada a la vez; las que coinciden con otra ya perfilada se
+    ejecutan sin perfilar."""
+
+    def __init__(self, sample_every: int, output_folder: str, top: int = DEFAULT_TOP):
+        self.sample_every = max(1, sample_every)
+        self.output_folder = output_folder
+        self.top = top
+        self.__calls = itertools.count()
+        self.__busy = threading.Lock()
+        # Profundidad de llamadas envueltas en curso en cada hilo
+        self.__local = threading.local()
+
+    @classmethod
+    def from_environment(cls, default_folder: str):
+        """Profiler configurado con UC3M_MONEY_PROFILE (una de cada N llamadas),
+        UC3M_MONEY_PROFILE_DIR y UC3M_MONEY_PROFILE_TOP, o None si no esta activado"""
+        sample_every = os.environ.get(PROFILE_ENV, "")
+        if not sample_every.isdigit() or int(sample_every) == 0:
+            return None
+        top = os.environ.get(PROFILE_TOP_ENV, "")
+        return cls(int(sample_every),
+                   os.environ.get(PROFILE_DIR_ENV) or default_folder,
+                   int(top) if top.isdigit() else DEFAULT_TOP)
+
+    def wrap(self, name: str, method):
+        """Devuelve method envuelto para perfilar las llamadas que toquen"""
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            local = self.__local
+            depth = getattr(local, "depth", 0)
+            local.depth = depth + 1
+            try:
+                busy = self.__busy
+                # Las llamadas anidadas no consumen turno de muestreo
+                if (depth or next(self.__calls) % self.sample_every
+                        # pylint: disable-next=consider-using-with
+                        or not busy.acquire(blocking=False)):
+                    return method(*args, **kwargs)
+                try:
+                    return self.__profile(name, method, args, kwargs)
+                finally:
+                    busy.release()
+            finally:
+                local.depth = depth
+        return profiled
+
+    def __profile(self, name: str, method, args, kwargs):
+        import cProfile
+        import tracemalloc
+        profile = cProfile.Profile()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:
+            # Otro perfilador esta activo en el proceso: la llamada no se perfila
+            profile = None
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.disable()
+            elapsed = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+            self.__write(name, profile, snapshot, elapsed, peak)
+
+    def __write(self, name: str, profile, snapshot, elapsed: float, peak: int):
+        import tracemalloc
+        os.makedirs(self.output_folder, exist_ok=True)
+        base = os.path.join(self.output_folder, f"{name}-{time.time_ns()}-{os.getpid()}")
+        if profile is not None:
+            profile.dump_stats(base + ".prof")
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)))
+        lines = [f"{name}: {elapsed * 1000:.3f} ms, pico de memoria {peak} bytes",
+                 f"Top {self.top} lineas por memoria reservada:"]
+        lines.extend(str(stat) for stat in snapshot.statistics("lineno")[:self.top])
+        with open(base + ".txt", "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
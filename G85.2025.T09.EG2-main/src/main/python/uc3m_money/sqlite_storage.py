@@ -0,0 +1,220 @@
+"""MODULE: sqlite_storage. Almacenamiento opcional de AccountManager en SQLite"""
+import json
+import os
+import sqlite3
+import time
+from uc3m_money.transfer_journal import TransferJournal
+from uc3m_money.metrics import NO_METRICS, TRANSFER_OPERATION, DEPOSIT_OPERATION, \
+    BALANCE_OPERATION
+
+TRANSFER_FIELDS = ("from_iban", "to_iban", "transfer_type", "transfer_amount",
+                   "transfer_concept", "transfer_date", "time_stamp", "transfer_code")
+DEPOSIT_FIELDS = ("alg", "typ", "iban", "amount", "deposit_date", "deposit_signature")
+# IBAN por consulta de movements_by_iban (por debajo del limite de 999 parametros de
+# las versiones antiguas de SQLite)
+IBAN_QUERY_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    transfer_code TEXT PRIMARY KEY,
+    from_iban TEXT, to_iban TEXT, transfer_type TEXT, transfer_amount REAL,
+    transfer_concept TEXT, transfer_date TEXT, time_stamp REAL);
+CREATE INDEX IF NOT EXISTS transfers_from_iban ON transfers (from_iban);
+CREATE INDEX IF NOT EXISTS transfers_to_iban ON transfers (to_iban);
+CREATE INDEX IF NOT EXISTS transfers_date ON transfers (transfer_date);
+CREATE TABLE IF NOT EXISTS deposits (
+    id INTEGER PRIMARY KEY,
+    alg TEXT, typ TEXT, iban TEXT, amount TEXT, deposit_date REAL, deposit_signature TEXT);
+CREATE INDEX IF NOT EXISTS deposits_iban ON deposits (iban);
+CREATE INDEX IF NOT EXISTS deposits_date ON deposits (deposit_date);
+CREATE TABLE IF NOT EXISTS movements (
+    id INTEGER PRIMARY KEY,
+    iban TEXT, amount TEXT, value REAL);
+CREATE INDEX IF NOT EXISTS movements_iban ON movements (iban, value);
+CREATE TABLE IF NOT EXISTS balances (
+    iban TEXT PRIMARY KEY,
+    saldos REAL, timestamp REAL);
+CREATE TABLE IF NOT EXISTS migrations (
+    json_folder TEXT PRIMARY KEY,
+    migrated_at REAL);
+"""
+
+
+class SqliteStorage:
+    """Guarda transferencias, ingresos, movimientos y saldos en una base de datos SQLite.
+    Los movimientos son las entradas de transactions2.json ({"IBAN", "amount"})."""
+
+    def __init__(self, database_file: str):
+        self.database_file = database_file
+        self.metrics = NO_METRICS
+        # La conexion se abre en el primer acceso: el constructor no hace E/S
+        self.__database = None
+
+    @property
+    def __connection(self):
+        if self.__database is None:
+            os.makedirs(os.path.dirname(self.database_file) or ".", exist_ok=True)
+            # Los accesos se serializan en AccountManager (o en el escritor de
+            # AsyncAccountManager), que puede llamar desde hilos distintos
+            database = sqlite3.connect(self.database_file, check_same_thread=False)
+            database.execute("PRAGMA journal_mode=WAL")
+            database.execute("PRAGMA synchronous=NORMAL")
+            database.executescript(SCHEMA)
+            self.__database = database
+        return self.__database
+
+    def flush(self):
+        """Cada escritura se confirma en su propia transaccion: no hay nada pendiente"""
+
+    def close(self):
+        """Cierra la conexion con la base de datos"""
+        if self.__database is not None:
+            self.__database.close()
+            self.__database = None
+
+    def has_transfer(self, transfer_code: str) -> bool:
+        """Indica si ya existe una transferencia con ese codigo"""
+        row = self.__connection.execute(
+            "SELECT 1 FROM transfers WHERE transfer_code = ?", (transfer_code,)).fetchone()
+        return row is not None
+
+    def add_transfers(self, transfers_data: list):
+        """Inserta transferencias (diccionarios con el formato de TransferRequest.to_json)"""
+        with self.metrics.timer(TRANSFER_OPERATION, "write"), self.__connection:
+            self.__insert_transfers(transfers_data)
+
+    def __insert_transfers(self, transfers_data: list):
+        self.__connection.executemany(
+            "INSERT OR IGNORE INTO transfers (" + ", ".join(TRANSFER_FIELDS) + ") VALUES ("
+            + ", ".join("?" * len(TRANSFER_FIELDS)) + ")",
+            [tuple(data.get(field) for field in TRANSFER_FIELDS) for data in transfers_data
+             if data.get("transfer_code") is not None])
+
+    def load_transfers(self) -> list:
+        """Devuelve las transferencias en el orden en que se guardaron"""
+        return self.__select("SELECT " + ", ".join(TRANSFER_FIELDS)
+                             + " FROM transfers ORDER BY rowid", TRANSFER_FIELDS)
+
+    def add_deposits(self, deposits_data: list):
+        """Inserta ingresos con el formato de deposits.json"""
+        with self.metrics.timer(DEPOSIT_OPERATION, "write"), self.__connection:
+            self.__insert_deposits(deposits_data)
+
+    def __insert_deposits(self, deposits_data: list):
+        self.__connection.executemany(
+            "INSERT INTO deposits (" + ", ".join(DEPOSIT_FIELDS) + ") VALUES ("
+            + ", ".join("?" * len(DEPOSIT_FIELDS)) + ")",
+            [tuple(data.get(field) for field in DEPOSIT_FIELDS) for data in deposits_data])
+
+    def load_deposits(self) -> list:
+        """Devuelve los ingresos en el orden en que se guardaron"""
+        return self.__select("SELECT " + ", ".join(DEPOSIT_FIELDS)
+                             + " FROM deposits ORDER BY id", DEPOSIT_FIELDS)
+
+    def add_movements(self, movements: list):
+        """Inserta movimientos con el formato de transactions2.json"""
+        with self.__connection:
+            self.__insert_movements(movements)
+
+    def __insert_movements(self, movements: list):
+        rows = []
+        for entry in movements:
+            try:
+                value = float(entry.get("amount"))
+            except (ValueError, TypeError):
+                # Igual que calculate_balance: los importes no numericos no suman
+                value = None
+            rows.append((entry.get("IBAN"), entry.get("amount"), value))
+        self.__connection.executemany(
+            "INSERT INTO movements (iban, amount, value) VALUES (?, ?, ?)", rows)
+
+    def iban_movements(self, iban: str):
+        """Devuelve la suma y el numero de importes validos de un IBAN"""
+        with self.metrics.timer(BALANCE_OPERATION, "read"):
+            total_balance, count = self.__connection.execute(
+                "SELECT COALESCE(SUM(value), 0.0), COUNT(value) FROM movements WHERE iban = ?",
+                (iban,)).fetchone()
+        self.metrics.count(BALANCE_OPERATION, "records_read", count)
+        return total_balance, count
+
+    def movements_by_iban(self, ibans: set) -> dict:
+        """Devuelve la suma y el numero de importes validos de cada IBAN con una
+        consulta agrupada por bloques de IBAN_QUERY_CHUNK"""
+        ibans = list(ibans)
+        totals = {iban: (0.0, 0) for iban in ibans}
+        with self.metrics.timer(BALANCE_OPERATION, "read"):
+            for start in range(0, len(ibans), IBAN_QUERY_CHUNK):
+                chunk = ibans[start:start + IBAN_QUERY_CHUNK]
+                # Recorre el indice (iban, value) igual que iban_movements: mismas sumas
+                rows = self.__connection.execute(
+                    "SELECT iban, COALESCE(SUM(value), 0.0), COUNT(value) FROM movements "
+                    f"WHERE iban IN ({', '.join('?' * len(chunk))}) GROUP BY iban",
+                    chunk).fetchall()
+                for iban, total_balance, count in rows:
+                    totals[iban] = (total_balance, count)
+        self.metrics.count(BALANCE_OPERATION, "records_read",
+                           sum(count for _, count in totals.values()))
+        return totals
+
+    def accumulate_balance(self, iban: str, total_balance: float, timestamp: float):
+        """Acumula el saldo calculado en la tabla de saldos"""
+        self.accumulate_balances([(iban, total_balance)], timestamp)
+
+    def accumulate_balances(self, balances: list, timestamp: float):
+        """Acumula los saldos calculados en la tabla de saldos en una transaccion"""
+        with self.metrics.timer(BALANCE_OPERATION, "write"), self.__connection:
+            for iban, total_balance in balances:
+                row = self.__connection.execute(
+                    "SELECT saldos FROM balances WHERE iban = ?", (iban,)).fetchone()
+                if row is None:
+                    self.__connection.execute(
+                        "INSERT INTO balances (iban, saldos, timestamp) VALUES (?, ?, ?)",
+                        (iban, round(total_balance, 2), timestamp))
+                else:
+                    self.__connection.execute(
+                        "UPDATE balances SET saldos = ?, timestamp = ? WHERE iban = ?",
+                        (round(row[0] + total_balance, 2), timestamp, iban))
+
+    def load_balances(self) -> list:
+        """Devuelve los saldos con el formato de saldos.json"""
+        return self.__select("SELECT iban, saldos, timestamp FROM balances ORDER BY rowid",
+                             ("iban", "saldos", "timestamp"))
+
+    def migrate_from_json(self, json_folder: str) -> bool:
+        """
+        Importa los ficheros JSON existentes de la carpeta indicada en una sola
+        transaccion y la anota en la tabla migrations. Una carpeta ya importada no se
+        vuelve a importar (duplicaria ingresos y movimientos): devuelve False.
+        """
+        json_folder = os.path.realpath(json_folder)
+        with self.__connection:
+            if self.__connection.execute("SELECT 1 FROM migrations WHERE json_folder = ?",
+                                         (json_folder,)).fetchone() is not None:
+                return False
+            transfers = self.__read_json(os.path.join(json_folder, "transactions.json"))
+            transfers += TransferJournal(os.path.join(json_folder, "transactions.jsonl")).load()
+            self.__insert_transfers(transfers)
+            self.__insert_deposits(self.__read_json(os.path.join(json_folder, "deposits.json")))
+            self.__insert_movements(
+                self.__read_json(os.path.join(json_folder, "transactions2.json")))
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO balances (iban, saldos, timestamp) VALUES (?, ?, ?)",
+                [(entry.get("iban"), entry.get("saldos"), entry.get("timestamp"))
+                 for entry in self.__read_json(os.path.join(json_folder, "saldos.json"))])
+            self.__connection.execute(
+                "INSERT INTO migrations (json_folder, migrated_at) VALUES (?, ?)",
+                (json_folder, time.time()))
+        return True
+
+    def __select(self, query: str, fields) -> list:
+        return [dict(zip(fields, row)) for row in self.__connection.execute(query)]
+
+    @staticmethod
+    def __read_json(path: str) -> list:
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as file:
+            try:
+                return json.load(file)
+            except json.JSONDecodeError:
+                return []
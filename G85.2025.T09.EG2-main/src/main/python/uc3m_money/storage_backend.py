@@ -0,0 +1,58 @@
+"""MODULE: storage_backend. Interfaz de los almacenes de datos de AccountManager"""
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """
+    Almacen de transferencias, ingresos, movimientos y saldos que usa AccountManager.
+    Los registros tienen el mismo formato que los ficheros JSON originales:
+    transferencias como TransferRequest.to_json, ingresos como deposits.json,
+    movimientos como transactions2.json ({"IBAN", "amount"}) y saldos como saldos.json.
+    AccountManager valida, firma y descarta duplicados; el almacen solo guarda y lee.
+    Implementaciones: JsonFileStorage, JournalStorage, MemoryStorage y SqliteStorage.
+    """
+
+    # Registro (Metrics) en el que el almacen mide sus lecturas y escrituras
+    metrics: object
+
+    def has_transfer(self, transfer_code: str) -> bool:
+        """Indica si ya existe una transferencia con ese codigo"""
+
+    def add_transfers(self, transfers_data: list):
+        """Guarda transferencias nuevas con una sola escritura"""
+
+    def load_transfers(self) -> list:
+        """Devuelve las transferencias en el orden en que se guardaron"""
+
+    def add_deposits(self, deposits_data: list):
+        """Guarda ingresos ya firmados con una sola escritura"""
+
+    def load_deposits(self) -> list:
+        """Devuelve los ingresos en el orden en que se guardaron"""
+
+    def add_movements(self, movements: list):
+        """Añade movimientos de cuenta"""
+
+    def iban_movements(self, iban: str):
+        """Devuelve (suma, numero) de los importes validos del IBAN; lanza
+        AccountManagementException si no se pueden leer los movimientos"""
+
+    def movements_by_iban(self, ibans: set) -> dict:
+        """Devuelve {iban: (suma, numero)} de los importes validos de varios IBAN
+        recorriendo los movimientos una sola vez, con las mismas sumas que iban_movements"""
+
+    def accumulate_balance(self, iban: str, total_balance: float, timestamp: float):
+        """Suma total_balance al saldo guardado del IBAN (redondeado a 2 decimales)"""
+
+    def accumulate_balances(self, balances: list, timestamp: float):
+        """Aplica en orden accumulate_balance a cada (iban, saldo) con una sola escritura"""
+
+    def load_balances(self) -> list:
+        """Devuelve los saldos guardados"""
+
+    def flush(self):
+        """Hace persistente lo que el almacen tenga pendiente"""
+
+    def close(self):
+        """Hace persistente lo pendiente y libera los recursos del almacen"""
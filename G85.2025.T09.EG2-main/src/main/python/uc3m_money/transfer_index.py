@@ -0,0 +1,112 @@
+"""MODULE: transfer_index. Indice persistente de codigos de transferencia"""
+import os
+
+# Bytes leidos del final del indice para obtener la huella de su ultima linea
+TAIL_BYTES = 256
+
+
+class TransferIndex:
+    """Indice de transfer_code guardado junto al fichero de transferencias.
+    Cada linea del indice es "<transfer_code> <huella del fichero de datos>"; si la
+    huella no coincide con el fichero de datos actual el indice se reconstruye."""
+
+    def __init__(self, data_file: str, loader):
+        self.data_file = data_file
+        self.index_file = data_file + ".idx"
+        self.__loader = loader
+        self.__codes = None
+        self.__fingerprint = None
+
+    def __contains__(self, transfer_code) -> bool:
+        self.__refresh()
+        return transfer_code in self.__codes
+
+    def __len__(self):
+        self.__refresh()
+        return len(self.__codes)
+
+    def add(self, transfer_code: str):
+        """Registra un codigo recien escrito en el fichero de datos"""
+        self.add_many([transfer_code])
+
+    def add_many(self, transfer_codes):
+        """Registra varios codigos con una sola escritura al final del indice"""
+        if self.__codes is None or self.__last_fingerprint() != self.__fingerprint:
+            # Sin indice cargado, o con el fichero del indice borrado o escrito por otro
+            # gestor: se reconstruye desde el fichero de datos, que ya contiene los
+            # codigos nuevos. Añadir al final perderia los codigos anteriores.
+            self.rebuild()
+            return
+        self.__fingerprint = self.__data_fingerprint()
+        lines = []
+        for transfer_code in transfer_codes:
+            self.__codes.add(transfer_code)
+            lines.append(transfer_code + " " + self.__fingerprint + "\n")
+        with open(self.index_file, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    def rebuild(self):
+        """Reconstruye el indice a partir del fichero de datos"""
+        fingerprint = self.__data_fingerprint()
+        codes = set()
+        for entry in self.__loader():
+            transfer_code = entry.get("transfer_code")
+            if isinstance(transfer_code, str):
+                codes.add(transfer_code)
+        temp_file = self.index_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as file:
+            file.writelines(code + " " + fingerprint + "\n" for code in codes)
+        os.replace(temp_file, self.index_file)
+        self.__codes = codes
+        self.__fingerprint = fingerprint
+
+    def __refresh(self):
+        """Comprueba que el indice en memoria corresponde al fichero de datos"""
+        current = self.__data_fingerprint()
+        if self.__codes is not None and self.__fingerprint == current:
+            return
+        self.__load()
+        if self.__fingerprint != current:
+            self.rebuild()
+
+    def __load(self):
+        """Carga el indice persistido; la huella de la ultima linea indica su vigencia"""
+        self.__codes = set()
+        self.__fingerprint = self.__empty_fingerprint()
+        if not os.path.exists(self.index_file):
+            self.__fingerprint = None
+            return
+        with open(self.index_file, "r", encoding="utf-8") as file:
+            for line in file:
+                parts = line.split()
+                if len(parts) != 2:
+                    self.__fingerprint = None
+                    return
+                self.__codes.add(parts[0])
+                self.__fingerprint = parts[1]
+
+    def __last_fingerprint(self):
+        """Huella de la ultima linea del indice persistido (None si no existe)"""
+        try:
+            with open(self.index_file, "rb") as file:
+                file.seek(0, os.SEEK_END)
+                file.seek(max(0, file.tell() - TAIL_BYTES))
+                lines = file.read().splitlines()
+        except FileNotFoundError:
+            return None
+        if not lines:
+            return self.__empty_fingerprint()
+        parts = lines[-1].decode("utf-8", "replace").split()
+        return parts[1] if len(parts) == 2 else None
+
+    def __data_fingerprint(self) -> str:
+        """Tamaño y fecha de modificacion del fichero de datos"""
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return self.__empty_fingerprint()
+        return str(stat.st_size) + ":" + str(stat.st_mtime_ns)
+
+    @staticmethod
+    def __empty_fingerprint() -> str:
+        return "missing"
@@ -0,0 +1,66 @@
+"""MODULE: transfer_journal. Diario de transferencias en formato JSON Lines"""
+import json
+import os
+from uc3m_money import json_codec
+from uc3m_money.account_management_exception import AccountManagementException
+
+
+class TransferJournal:
+    """Almacen de transferencias de solo escritura al final (un objeto JSON por linea)"""
+
+    def __init__(self, journal_file: str):
+        self.journal_file = journal_file
+
+    def __iter__(self):
+        """Recorre las transferencias guardadas linea a linea sin cargar el fichero"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # Ultima linea incompleta (escritura interrumpida): se ignora
+                    return
+                if not line.strip():
+                    continue
+                try:
+                    yield json_codec.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise AccountManagementException(
+                        "ERROR reading transaction file") from exc
+
+    def load(self) -> list:
+        """Devuelve todas las transferencias como la lista del antiguo transactions.json"""
+        return list(self)
+
+    def append(self, transfer_data: dict):
+        """Añade una transferencia al final del diario sin reescribir el fichero"""
+        self.append_many([transfer_data])
+
+    def append_many(self, transfers_data: list):
+        """Añade varias transferencias con una sola escritura"""
+        self.__repair_tail()
+        with open(self.journal_file, "ab") as file:
+            file.write(b"".join(json_codec.dumps(data) + b"\n" for data in transfers_data))
+
+    def __repair_tail(self):
+        """Recorta una ultima linea incompleta para que no se mezcle con la siguiente"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, "rb+") as file:
+            end = file.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            file.seek(end - 1)
+            if file.read(1) == b"\n":
+                return
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                file.seek(start)
+                block = file.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    file.truncate(start + newline + 1)
+                    return
+                position = start
+            file.truncate(0)
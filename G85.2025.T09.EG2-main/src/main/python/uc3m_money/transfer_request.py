@@ -10,6 +10,9 @@ from datetime import datetime, timezone
 
 class TransferRequest:
     """Class representing a transfer request"""
+    __slots__ = ("__from_iban", "__to_iban", "__transfer_type", "__concept",
+                 "__transfer_date", "__transfer_amount", "__time_stamp", "__transfer_code")
+
     def __init__(self,
                  from_iban: str,
                  transfer_type: str,
@@ -25,9 +28,18 @@ class TransferRequest:
         self.__transfer_amount = transfer_amount
         justnow = datetime.now(timezone.utc)
         self.__time_stamp = datetime.timestamp(justnow)
+        self.__transfer_code = None
 
     def __str__(self):
-        return "Transfer:" + json.dumps(self.__dict__)
+        # Mismo texto que json.dumps(self.__dict__) antes de usar __slots__
+        return "Transfer:" + json.dumps({
+            "_TransferRequest__from_iban": self.__from_iban,
+            "_TransferRequest__to_iban": self.__to_iban,
+            "_TransferRequest__transfer_type": self.__transfer_type,
+            "_TransferRequest__concept": self.__concept,
+            "_TransferRequest__transfer_date": self.__transfer_date,
+            "_TransferRequest__transfer_amount": self.__transfer_amount,
+            "_TransferRequest__time_stamp": self.__time_stamp})
 
     def to_json(self):
         """returns the object information in json format"""
@@ -49,6 +61,7 @@ class TransferRequest:
     @from_iban.setter
     def from_iban(self, value):
         self.__from_iban = value
+        self.__transfer_code = None
 
     @property
     def to_iban(self):
@@ -58,6 +71,7 @@ class TransferRequest:
     @to_iban.setter
     def to_iban(self, value):
         self.__to_iban = value
+        self.__transfer_code = None
 
     @property
     def transfer_type(self):
@@ -66,6 +80,7 @@ class TransferRequest:
     @transfer_type.setter
     def transfer_type(self, value):
         self.__transfer_type = value
+        self.__transfer_code = None
 
     @property
     def transfer_amount(self):
@@ -74,14 +89,16 @@ class TransferRequest:
     @transfer_amount.setter
     def transfer_amount(self, value):
         self.__transfer_amount = value
+        self.__transfer_code = None
 
     @property
     def transfer_concept(self):
         """Property representing the transfer concept"""
-        return self.__transfer_concept
+        return self.__concept
     @transfer_concept.setter
     def transfer_concept(self, value):
-        self.__transfer_concept = value
+        self.__concept = value
+        self.__transfer_code = None
 
     @property
     def transfer_date( self ):
@@ -90,6 +107,7 @@ class TransferRequest:
     @transfer_date.setter
     def transfer_date( self, value ):
         self.__transfer_date = value
+        self.__transfer_code = None
 
     @property
     def time_stamp(self):
@@ -99,5 +117,7 @@ class TransferRequest:
 
     @property
     def transfer_code(self):
-        """Returns the md5 signature (transfer code)"""
-        return hashlib.md5(str(self).encode()).hexdigest()
+        """Returns the md5 signature (transfer code), computed once until a setter runs"""
+        if self.__transfer_code is None:
+            self.__transfer_code = hashlib.md5(str(self).encode()).hexdigest()
+        return self.__transfer_code
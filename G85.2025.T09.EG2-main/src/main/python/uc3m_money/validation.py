@@ -0,0 +1,165 @@
+"""MODULE: validation. Validacion por lotes de transferencias e ingresos que devuelve
+codigos de error en lugar de lanzar una excepcion por registro"""
+
+import json
+from datetime import datetime
+from uc3m_money.iban_validator import validate_iban
+from uc3m_money.date_validator import validate_date
+from uc3m_money.transfer_request import TransferRequest
+from uc3m_money.metrics import NO_METRICS, TRANSFER_OPERATION, DEPOSIT_OPERATION
+
+# Codigos de error de las reglas de transfer_request
+FROM_IBAN_NOT_VALID = "from_iban_not_valid"
+TO_IBAN_NOT_VALID = "to_iban_not_valid"
+CONCEPT_NOT_VALID = "concept_not_valid"
+TRANSFER_TYPE_NOT_VALID = "transfer_type_not_valid"
+DATE_NOT_VALID = "date_not_valid"
+AMOUNT_NOT_VALID = "amount_not_valid"
+TRANSFER_DATA_NOT_VALID = "transfer_data_not_valid"
+TRANSFER_ALREADY_EXISTS = "transfer_already_exists"
+# Codigos de error de las reglas de deposit_into_account
+JSON_FORMAT_NOT_VALID = "json_format_not_valid"
+INPUT_STRUCTURE_NOT_VALID = "input_structure_not_valid"
+IBAN_NOT_VALID = "iban_not_valid"
+AMOUNT_FORMAT_NOT_VALID = "amount_format_not_valid"
+# Ingresos que deposit_into_account rechazaria con otra excepcion (p. ej. ValueError
+# de un importe "EUR abc"): el mensaje es el de esa excepcion
+DEPOSIT_DATA_NOT_VALID = "deposit_data_not_valid"
+
+# Codigo -> mensaje de la AccountManagementException equivalente
+ERROR_MESSAGES = {
+    FROM_IBAN_NOT_VALID: "ERROR from iban not valid",
+    TO_IBAN_NOT_VALID: "ERROR to iban not valid",
+    CONCEPT_NOT_VALID: "ERROR concept not valid",
+    TRANSFER_TYPE_NOT_VALID: "ERROR transfer type not valid",
+    DATE_NOT_VALID: "ERROR date not valid",
+    AMOUNT_NOT_VALID: "ERROR amount not valid",
+    TRANSFER_DATA_NOT_VALID: "ERROR transfer data not valid",
+    TRANSFER_ALREADY_EXISTS: "ERROR transfer already exists",
+    JSON_FORMAT_NOT_VALID: "ERROR invalid JSON format",
+    INPUT_STRUCTURE_NOT_VALID: "ERROR invalid input structure",
+    IBAN_NOT_VALID: "ERROR IBAN not valid",
+    AMOUNT_FORMAT_NOT_VALID: "ERROR amount format invalid",
+}
+ERROR_CODES = {message: code for code, message in ERROR_MESSAGES.items()}
+
+TRANSFER_TYPES = {"ORDINARY", "URGENT", "INMEDIATE"}
+
+
+def check_transfer(today: datetime, from_iban: str, to_iban: str, concept: str,
+                   transfer_type: str, date: str, amount: float):
+    """Codigo del primer error de la transferencia (en el orden de transfer_request) o
+    None si es valida. Con tipos no validos (concept no str...) lanza TypeError"""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-return-statements
+    if not validate_iban(from_iban):
+        return FROM_IBAN_NOT_VALID
+    if not validate_iban(to_iban):
+        return TO_IBAN_NOT_VALID
+    if not (10 <= len(concept) <= 30 and len(concept.split()) >= 2):
+        return CONCEPT_NOT_VALID
+    if transfer_type not in TRANSFER_TYPES:
+        return TRANSFER_TYPE_NOT_VALID
+    if not validate_date(date, today):
+        return DATE_NOT_VALID
+    if not (10.00 <= amount <= 10000.00 and len(str(amount).split(".")) <= 2):
+        return AMOUNT_NOT_VALID
+    return None
+
+
+def check_deposit(data: dict):
+    """Codigo del primer error del ingreso {"IBAN", "AMOUNT"} (en el orden de
+    deposit_into_account) o None si es valido"""
+    if "IBAN" not in data or "AMOUNT" not in data:
+        return INPUT_STRUCTURE_NOT_VALID
+    if not validate_iban(data["IBAN"]):
+        return IBAN_NOT_VALID
+    if not data["AMOUNT"].startswith("EUR "):
+        return AMOUNT_FORMAT_NOT_VALID
+    return None
+
+
+class ValidationPipeline:
+    """
+    Valida lotes de transferencias o ingresos con las reglas de transfer_request y
+    deposit_into_account sin lanzar AccountManagementException: cada elemento da
+    (valor, codigo, mensaje), con codigo y mensaje None si es valido. Si se indica
+    rejected_file, los rechazados se añaden a ese fichero JSON Lines con su motivo.
+    """
+
+    def __init__(self, rejected_file: str = None, metrics=NO_METRICS):
+        self.rejected_file = rejected_file
+        self.metrics = metrics
+
+    def transfers(self, items, today: datetime = None) -> list:
+        """Valida transferencias (tuplas en el orden de transfer_request o dicts con sus
+        nombres de parametro). El valor de las validas es su TransferRequest"""
+        # La fecha de hoy se calcula una sola vez para todo el lote
+        if today is None:
+            today = datetime.today()
+        results = []
+        rejected = []
+        for index, item in enumerate(items):
+            with self.metrics.timer(TRANSFER_OPERATION, "validation"):
+                transfer, code = self.__check_transfer(today, item)
+            if code is None:
+                results.append((transfer, None, None))
+            else:
+                results.append((None, code, ERROR_MESSAGES[code]))
+                rejected.append((index, item, code, ERROR_MESSAGES[code]))
+        self.write_rejected(rejected)
+        return results
+
+    @staticmethod
+    def __check_transfer(today: datetime, item) -> tuple:
+        """(TransferRequest, None) o (None, codigo de error)"""
+        try:
+            if isinstance(item, dict):
+                code = check_transfer(today, **item)
+                arguments = (item["from_iban"], item["transfer_type"], item["to_iban"],
+                             item["concept"], item["date"], item["amount"])
+            else:
+                code = check_transfer(today, *item)
+                from_iban, to_iban, concept, transfer_type, date, amount = item
+                arguments = (from_iban, transfer_type, to_iban, concept, date, amount)
+        except TypeError:
+            # Parametros que faltan o sobran o de tipos no validos
+            return None, TRANSFER_DATA_NOT_VALID
+        if code is not None:
+            return None, code
+        return TransferRequest(*arguments), None
+
+    def deposits(self, items) -> list:
+        """Valida ingresos {"IBAN", "AMOUNT"}. El valor de los validos es (iban, importe)"""
+        results = []
+        rejected = []
+        for index, item in enumerate(items):
+            with self.metrics.timer(DEPOSIT_OPERATION, "validation"):
+                result = self.__check_deposit(item)
+            results.append(result)
+            if result[1] is not None:
+                rejected.append((index, item) + result[1:])
+        self.write_rejected(rejected)
+        return results
+
+    @staticmethod
+    def __check_deposit(item) -> tuple:
+        """((iban, importe), None, None) o (None, codigo, mensaje)"""
+        try:
+            code = check_deposit(item) if isinstance(item, dict) else INPUT_STRUCTURE_NOT_VALID
+            if code is not None:
+                return None, code, ERROR_MESSAGES[code]
+            return (item["IBAN"], float(item["AMOUNT"][4:])), None, None
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Importes como "EUR abc": deposit_into_account propagaria esta excepcion
+            return None, DEPOSIT_DATA_NOT_VALID, f"{type(exc).__name__}: {exc}"
+
+    def write_rejected(self, rejected: list):
+        """Añade al fichero de rechazados (si lo hay) una linea {"index", "code",
+        "error", "record"} por cada (posicion, elemento, codigo, mensaje)"""
+        if self.rejected_file is None or not rejected:
+            return
+        lines = [json.dumps({"index": index, "code": code, "error": message,
+                             "record": item}, default=str) + "\n"
+                 for index, item, code, message in rejected]
+        with open(self.rejected_file, "a", encoding="utf-8") as file:
+            file.write("".join(lines))
@@ -17,6 +17,7 @@ class MyTestCase(unittest.TestCase):
         cls.manager = AccountManager()
         cls.json_folder = os.path.abspath(os.path.join(os.path.dirname(__file__),
                                                        "..", "..", "JsonFiles"))
+        os.makedirs(cls.json_folder, exist_ok=True)
 
     @freeze_time("2025-05-23")
     def test_valid_tc1(self):
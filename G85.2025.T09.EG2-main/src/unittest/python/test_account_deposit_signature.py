@@ -0,0 +1,44 @@
+"""Tests para la firma memorizada de AccountDeposit"""
+
+import unittest
+import hashlib
+from uc3m_money import AccountDeposit
+from freezegun import freeze_time
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de AccountDeposit.deposit_signature"""
+
+    @freeze_time("2025-05-23")
+    def setUp(self):
+        self.deposit = AccountDeposit("ES9121000418450200051332", 123.45)
+
+    def test_signature_format(self):
+        """TC1: La firma es el SHA-256 del mismo texto que antes"""
+        text = ("{alg:SHA-256,typ:DEPOSIT,iban:ES9121000418450200051332,amount:123.45,"
+                "deposit_date:" + str(self.deposit.deposit_date) + "}")
+        self.assertEqual(self.deposit.deposit_signature,
+                         hashlib.sha256(text.encode()).hexdigest())
+        self.assertEqual(self.deposit.to_json()["deposit_signature"],
+                         self.deposit.deposit_signature)
+
+    def test_setters_invalidate_signature(self):
+        """TC2: Cambiar IBAN, importe o fecha recalcula la firma"""
+        for name, value in (("to_iban", "ES6160606457126971492537"),
+                            ("deposit_amount", 10.00),
+                            ("deposit_date", 1748000000.0)):
+            previous = self.deposit.deposit_signature
+            setattr(self.deposit, name, value)
+            self.assertNotEqual(self.deposit.deposit_signature, previous)
+        text = ("{alg:SHA-256,typ:DEPOSIT,iban:ES6160606457126971492537,amount:10.0,"
+                "deposit_date:1748000000.0}")
+        self.assertEqual(self.deposit.deposit_signature,
+                         hashlib.sha256(text.encode()).hexdigest())
+
+    def test_slots(self):
+        """TC3: Los objetos no tienen __dict__"""
+        self.assertFalse(hasattr(self.deposit, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
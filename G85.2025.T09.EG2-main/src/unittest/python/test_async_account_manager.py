@@ -0,0 +1,72 @@
+"""Tests para la fachada asyncio de AccountManager"""
+
+import unittest
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from uc3m_money import AccountManager, AsyncAccountManager
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+IBAN = "ES9121000418450200051332"
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de AsyncAccountManager"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_async_")
+        self.manager = AccountManager(json_folder=self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    @freeze_time("2025-05-23")
+    def test_concurrent_transfers_single_write(self):
+        """TC1: Peticiones concurrentes se guardan con una sola escritura"""
+        concepts = [f"Pago numero {index}" for index in range(20)] + ["Pago numero 0", "Mal"]
+
+        async def scenario():
+            async with AsyncAccountManager(self.manager) as front:
+                return await asyncio.gather(
+                    *[front.transfer_request(IBAN, "ES6160606457126971492537", concept,
+                                             "ORDINARY", "01/01/2027", 10.00)
+                      for concept in concepts],
+                    return_exceptions=True)
+
+        with mock.patch.object(self.manager.storage, "write_json",
+                               wraps=self.manager.storage.write_json) as write_json:
+            results = asyncio.run(scenario())
+        self.assertEqual(write_json.call_count, 1)
+        self.assertEqual(len(set(results[:20])), 20)
+        self.assertEqual(str(results[20]), "ERROR transfer already exists")
+        self.assertEqual(str(results[21]), "ERROR concept not valid")
+        self.assertEqual(len(self.manager.read_transactions()), 20)
+
+    @freeze_time("2025-05-23")
+    def test_deposit_and_balance(self):
+        """TC2: Ingresos y saldos dan el mismo resultado que las llamadas sincronas"""
+        input_file = os.path.join(self.manager.json_folder, "test_async_deposit.json")
+        with open(input_file, "w", encoding="utf-8") as f:
+            json.dump({"IBAN": IBAN, "AMOUNT": "EUR 123.45"}, f)
+        with open(self.manager.ledger_file, "w", encoding="utf-8") as f:
+            json.dump([{"IBAN": IBAN, "amount": "+10.00"}], f)
+
+        async def scenario():
+            async with AsyncAccountManager(self.manager) as front:
+                signature = await front.deposit_into_account(input_file)
+                balance = await front.calculate_balance(IBAN)
+                with self.assertRaises(AccountManagementException) as cm:
+                    await front.calculate_balance("ES6160606457126971492537")
+                return signature, balance, str(cm.exception)
+
+        self.assertEqual(asyncio.run(scenario()),
+                         ("3814f093d40db77f64796fef98a0467e8516dbedf5ff918c85c7a61b5f436c52",
+                          True, "ERROR iban not found"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Tests para el agregado incremental de saldos por IBAN"""
+
+import unittest
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from uc3m_money import AccountManager, balance_index
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+IBAN = "ES9121000418450200051332"
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de BalanceIndex a traves de calculate_balance"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_balance_index_")
+        self.manager = AccountManager(balance_index=True, json_folder=self.folder)
+        self.transactions_file = self.manager.ledger_file
+        self.balances_file = os.path.join(self.folder, "saldos.json")
+        self.entries = [{"IBAN": IBAN, "amount": "+100.00"},
+                        {"IBAN": "ES0000000000000000000000", "amount": "+20.00"}]
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def write_ledger(self):
+        """Reescribe transactions2.json como lo haria json.dump"""
+        with open(self.transactions_file, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=4)
+
+    def last_balance(self):
+        """Ultimo saldo guardado en saldos.json"""
+        with open(self.balances_file, "r", encoding="utf-8") as f:
+            return json.load(f)[-1]["saldos"]
+
+    def index_lines(self):
+        """Lineas del indice: estado completo y lineas de cambios"""
+        with open(self.manager.balance_index.index_file, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    @freeze_time("2025-05-23")
+    def test_only_new_entries_are_applied(self):
+        """TC1: Las llamadas siguientes parten de la marca guardada"""
+        self.write_ledger()
+        self.manager.calculate_balance(IBAN)
+        first_offset = self.index_lines()[0]["offset"]
+        self.assertGreater(first_offset, 0)
+
+        self.entries.append({"IBAN": IBAN, "amount": "-50.50"})
+        self.write_ledger()
+        # Un gestor nuevo parte del agregado persistido
+        AccountManager(balance_index=True, json_folder=self.folder).calculate_balance(IBAN)
+        delta = self.index_lines()[-1]
+        self.assertGreater(delta["offset"], first_offset)
+        # La linea de cambios solo lleva los IBAN tocados
+        self.assertEqual((delta["ibans"], delta["totals"], delta["counts"]),
+                         ([IBAN], [49.5], [2]))
+        self.assertEqual(self.last_balance(), 149.5)
+
+    @freeze_time("2025-05-23")
+    def test_rewritten_ledger_is_recomputed(self):
+        """TC2: Si el fichero cambia por delante de la marca se recalcula entero"""
+        self.write_ledger()
+        self.manager.calculate_balance(IBAN)
+        self.entries = [{"IBAN": IBAN, "amount": "+7.00"}]
+        self.write_ledger()
+        os.remove(self.balances_file)
+        self.manager.calculate_balance(IBAN)
+        self.assertEqual(self.last_balance(), 7.00)
+
+    @freeze_time("2025-05-23")
+    def test_same_errors_as_full_scan(self):
+        """TC3: Mismos errores que recorriendo todo el fichero"""
+        self.write_ledger()
+        with self.assertRaises(AccountManagementException) as cm:
+            self.manager.calculate_balance("ES6160606457126971492537")
+        self.assertEqual(str(cm.exception), "ERROR iban not found")
+
+        with open(self.transactions_file, "a", encoding="utf-8") as f:
+            f.write("{")
+        with self.assertRaises(AccountManagementException) as cm:
+            self.manager.calculate_balance(IBAN)
+        self.assertEqual(str(cm.exception), "ERROR reading transaction file")
+
+    def test_entry_edited_in_place(self):
+        """TC4: Un importe editado en su sitio por delante de la marca (mismo tamaño
+        de fichero) obliga a recalcular el agregado"""
+        self.write_ledger()
+        self.assertEqual(self.manager.balance_index.totals(IBAN), (100.0, 1))
+        self.entries[0]["amount"] = "+900.00"
+        self.write_ledger()
+        self.assertEqual(self.manager.balance_index.totals(IBAN), (900.0, 1))
+        # Tambien partiendo del agregado persistido
+        self.entries[0]["amount"] = "+500.00"
+        self.write_ledger()
+        fresh = AccountManager(balance_index=True, json_folder=self.folder)
+        self.assertEqual(fresh.balance_index.totals(IBAN), (500.0, 1))
+
+    def test_deltas_and_compaction(self):
+        """TC5: Cada actualizacion añade una linea y cada COMPACT_DELTAS lineas el indice
+        se reescribe entero, con el mismo agregado"""
+        self.write_ledger()
+        self.manager.balance_index.totals(IBAN)
+        with mock.patch.object(balance_index, "COMPACT_DELTAS", 3):
+            for index in range(3):
+                self.entries.append({"IBAN": IBAN, "amount": "+1.00"})
+                self.write_ledger()
+                self.manager.balance_index.totals(IBAN)
+                self.assertEqual(len(self.index_lines()), index + 2)
+            self.entries.append({"IBAN": IBAN, "amount": "+1.00"})
+            self.write_ledger()
+            self.assertEqual(self.manager.balance_index.totals(IBAN), (104.0, 5))
+        self.assertEqual(len(self.index_lines()), 1)
+        fresh = AccountManager(balance_index=True, json_folder=self.folder)
+        self.assertEqual(fresh.balance_index.totals(IBAN), (104.0, 5))
+
+    def test_prefix_check_is_bounded(self):
+        """TC6: Con el fichero creciendo solo se comprueban los ultimos bloques; si
+        encoge o su mtime retrocede se comprueban todos"""
+        with mock.patch.object(balance_index, "DIGEST_BLOCK_BYTES", 16):
+            self.write_ledger()
+            self.assertEqual(self.manager.balance_index.totals(IBAN), (100.0, 1))
+            stat = os.stat(self.transactions_file)
+            # Importe antiguo editado con la misma longitud y el mtime anterior
+            self.entries[0]["amount"] = "+900.00"
+            self.write_ledger()
+            os.utime(self.transactions_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1))
+            self.assertEqual(self.manager.balance_index.totals(IBAN), (900.0, 1))
+
+            self.entries.append({"IBAN": IBAN, "amount": "+1.00"})
+            self.write_ledger()
+            with mock.patch.object(hashlib, "sha256", wraps=hashlib.sha256) as sha256:
+                self.assertEqual(self.manager.balance_index.totals(IBAN), (901.0, 2))
+            offset = self.index_lines()[-1]["offset"]
+            self.assertLess(sha256.call_count, offset // 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Tests para el calculo de los saldos de varios IBAN en una sola pasada"""
+
+import unittest
+import os
+import random
+import shutil
+import tempfile
+from unittest import mock
+from freezegun import freeze_time
+from uc3m_money import AccountManager, AccountManagementException, MemoryStorage
+from uc3m_money import JsonFileStorage
+from uc3m_money import ledger_snapshot
+
+IBANS = ["ES9121000418450200051332", "ES6160606457126971492537",
+         "ES7921000813610123456789", "ES1720852066623456789011"]
+UNKNOWN_IBAN = "ES3800811234561234567890"
+CONFIGURATIONS = [{}, {"streaming": True}, {"balance_index": True},
+                  {"ledger_snapshot": True}, {"ledger_snapshot": True, "numpy": False},
+                  {"database": "balances.db"}, {"storage": "memory"}]
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de AccountManager.calculate_balances"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_balances_")
+        generator = random.Random(25)
+        self.movements = [{"IBAN": generator.choice(IBANS),
+                           "amount": f"{generator.uniform(-500, 500):+.2f}"}
+                          for _ in range(500)]
+        self.movements += [{"IBAN": IBANS[0], "amount": "abc"},
+                           {"IBAN": None, "amount": "5.00"}]
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def manager(self, options: dict) -> AccountManager:
+        """Gestor en una carpeta nueva con los movimientos de prueba"""
+        folder = tempfile.mkdtemp(dir=self.folder)
+        options = dict(options)
+        options.pop("numpy", None)
+        if options.get("storage") == "memory":
+            options["storage"] = MemoryStorage()
+        if "database" in options:
+            options["database"] = os.path.join(folder, options["database"])
+        manager = AccountManager(json_folder=folder, **options)
+        manager.storage.add_movements(self.movements)
+        return manager
+
+    @staticmethod
+    def balances(manager: AccountManager) -> list:
+        """(iban, saldo) de los saldos guardados"""
+        return [(entry["iban"], entry["saldos"]) for entry in manager.storage.load_balances()]
+
+    @freeze_time("2025-05-23")
+    def test_same_balances_as_separate_calls(self):
+        """TC1: Los resultados y los saldos guardados son los de calculate_balance uno a
+        uno, con todos los almacenes"""
+        requested = [IBANS[1], "ES00", IBANS[0], UNKNOWN_IBAN, IBANS[2], IBANS[1], None]
+        for options in CONFIGURATIONS:
+            numpy = ledger_snapshot.numpy() if options.get("numpy", True) else None
+            with self.subTest(options=options), \
+                    mock.patch.object(ledger_snapshot, "numpy", return_value=numpy):
+                separate = self.manager(options)
+                together = self.manager(options)
+                for manager in (separate, together):
+                    # Saldo ya guardado antes del lote
+                    manager.calculate_balance(IBANS[2])
+                expected = []
+                for iban_number in requested:
+                    try:
+                        expected.append(separate.calculate_balance(iban_number))
+                    except AccountManagementException as exc:
+                        expected.append(exc.message)
+                self.assertEqual(together.calculate_balances(iter(requested)), expected)
+                self.assertIn("ERROR iban not found", expected)
+                self.assertEqual(self.balances(together), self.balances(separate))
+                separate.close()
+                together.close()
+
+    def test_one_read_and_one_write(self):
+        """TC2: transactions2.json se lee una vez y saldos.json se escribe una vez"""
+        manager = self.manager({})
+        with mock.patch.object(JsonFileStorage, "read_json",
+                               autospec=True, side_effect=JsonFileStorage.read_json) as read, \
+                mock.patch.object(JsonFileStorage, "write_json", autospec=True,
+                                  side_effect=JsonFileStorage.write_json) as write:
+            self.assertEqual(manager.calculate_balances(IBANS * 3), [True] * 12)
+        self.assertEqual([call.args[2] for call in read.call_args_list],
+                         [manager.storage.ledger_file])
+        self.assertEqual([call.args[2] for call in write.call_args_list],
+                         [manager.storage.balances_file])
+        self.assertEqual(len(manager.storage.load_balances()), 4)
+
+    def test_ledger_errors(self):
+        """TC3: Sin transactions2.json se lanza el error sin guardar saldos, salvo si
+        ningun IBAN es valido"""
+        manager = AccountManager(json_folder=os.path.join(self.folder, "empty"))
+        self.assertEqual(manager.calculate_balances(["ES00", 12]),
+                         ["ERROR iban not valid"] * 2)
+        with self.assertRaises(AccountManagementException) as context:
+            manager.calculate_balances(["ES00", IBANS[0]])
+        self.assertEqual(context.exception.message, "ERROR file not found")
+        self.assertEqual(manager.storage.load_balances(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
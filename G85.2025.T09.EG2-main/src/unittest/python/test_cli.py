@@ -0,0 +1,201 @@
+"""Tests para la carga masiva desde JSON Lines"""
+
+import unittest
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from contextlib import redirect_stdout, redirect_stderr
+from freezegun import freeze_time
+from uc3m_money import AccountManager, JsonFileStorage
+from uc3m_money.cli import main, read_batches
+
+IBAN = "ES9121000418450200051332"
+OTHER_IBAN = "ES6160606457126971492537"
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de uc3m_money.cli"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_cli_")
+        self.json_folder = os.path.join(self.folder, "JsonFiles")
+        self.results_file = os.path.join(self.folder, "results.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def write_input(self, lines: list) -> str:
+        """Escribe las lineas (objetos o texto) en un fichero JSON Lines"""
+        input_file = os.path.join(self.folder, "input.jsonl")
+        with open(input_file, "w", encoding="utf-8") as file:
+            for line in lines:
+                file.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+        return input_file
+
+    def run_cli(self, *argv) -> tuple:
+        """Ejecuta la linea de comandos y devuelve el resumen y los resultados por linea"""
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            self.assertEqual(main(list(argv) + ["--json-folder", self.json_folder,
+                                                "--results", self.results_file]), 0)
+        with open(self.results_file, "r", encoding="utf-8") as file:
+            results = [json.loads(line) for line in file]
+        return json.loads(stdout.getvalue()), results
+
+    def transfers(self, count: int) -> list:
+        """Transferencias validas distintas"""
+        return [{"from_iban": IBAN, "to_iban": OTHER_IBAN, "concept": f"Pago numero {index}",
+                 "transfer_type": "ORDINARY", "date": "01/01/2049", "amount": 10.0 + index}
+                for index in range(count)]
+
+    def test_transfers_in_batches(self):
+        """TC1: Las transferencias se guardan por lotes con el resultado de cada linea"""
+        transfers = self.transfers(25)
+        input_file = self.write_input(transfers + [
+            "not json", "", {"from_iban": IBAN}, [1, 2],
+            dict(transfers[0], concept="Pago")])
+        summary, results = self.run_cli("transfers", input_file, "--batch-size", "7")
+        self.assertEqual((summary["records"], summary["accepted"], summary["rejected"]),
+                         (29, 25, 4))
+        self.assertEqual(results[25:], [
+            {"line": 26, "error": "ERROR invalid JSON format"},
+            {"line": 28, "error": "ERROR transfer data not valid"},
+            {"line": 29, "error": "ERROR transfer data not valid"},
+            {"line": 30, "error": "ERROR concept not valid"}])
+        stored = AccountManager(json_folder=self.json_folder).read_transactions()
+        self.assertEqual([data["transfer_code"] for data in stored],
+                         [result["result"] for result in results[:25]])
+
+    def test_deposits_with_workers(self):
+        """TC2: Con --workers los ingresos se firman en otros procesos y se guardan en orden"""
+        deposits = [{"IBAN": IBAN, "AMOUNT": f"EUR {100 + index}.00"} for index in range(40)]
+        input_file = self.write_input(deposits + [{"IBAN": IBAN, "AMOUNT": "100.00"},
+                                                  {"IBAN": "ES00", "AMOUNT": "EUR 1.00"}])
+        summary, results = self.run_cli("deposits", input_file, "--workers", "2",
+                                        "--batch-size", "5")
+        self.assertEqual((summary["accepted"], summary["rejected"]), (40, 2))
+        self.assertEqual([result["line"] for result in results], list(range(1, 43)))
+        self.assertEqual(results[40:], [{"line": 41, "error": "ERROR amount format invalid"},
+                                        {"line": 42, "error": "ERROR IBAN not valid"}])
+        stored = AccountManager(json_folder=self.json_folder).read_deposits()
+        self.assertEqual([deposit["amount"] for deposit in stored],
+                         [f"{100 + index}.00" for index in range(40)])
+        self.assertEqual([deposit["deposit_signature"] for deposit in stored],
+                         [result["result"] for result in results[:40]])
+
+    def test_batches_are_read_lazily(self):
+        """TC3: La entrada se consume lote a lote, sin leerla entera"""
+        consumed = []
+
+        def lines():
+            for index in range(10):
+                consumed.append(index)
+                yield b"{}\n"
+        batches = read_batches(lines(), 4)
+        self.assertEqual(next(batches), (1, [b"{}\n"] * 4))
+        self.assertEqual(len(consumed), 4)
+        self.assertEqual([first_line for first_line, _ in batches], [5, 9])
+
+    def test_rejected_file(self):
+        """TC4: Con --rejected las lineas rechazadas se escriben con su codigo y motivo"""
+        transfers = self.transfers(2)
+        input_file = self.write_input(transfers + ["not json", [1, 2],
+                                                   dict(transfers[1], date="01/01/2020")])
+        rejected_file = os.path.join(self.folder, "rejected.jsonl")
+        summary, _ = self.run_cli("transfers", input_file, "--rejected", rejected_file)
+        self.assertEqual(summary["rejected"], 3)
+        with open(rejected_file, "r", encoding="utf-8") as file:
+            rejected = [json.loads(line) for line in file]
+        self.assertEqual([(line["line"], line["code"], line["error"]) for line in rejected],
+                         [(3, "json_format_not_valid", "ERROR invalid JSON format"),
+                          (4, "transfer_data_not_valid", "ERROR transfer data not valid"),
+                          (5, "date_not_valid", "ERROR date not valid")])
+        self.assertEqual(rejected[0]["record"], "not json")
+        self.assertEqual(rejected[2]["record"], dict(transfers[1], date="01/01/2020"))
+
+    def test_line_not_utf8(self):
+        """TC5: Una linea que no es UTF-8 se rechaza como JSON no valido y el resto del
+        lote se guarda"""
+        input_file = self.write_input([{"IBAN": IBAN, "AMOUNT": "EUR 10.00"}])
+        with open(input_file, "ab") as file:
+            file.write(b'{"IBAN": "\xff"}\n')
+            file.write(json.dumps({"IBAN": IBAN, "AMOUNT": "EUR 20.00"}).encode() + b"\n")
+        summary, results = self.run_cli("deposits", input_file)
+        self.assertEqual((summary["accepted"], summary["rejected"]), (2, 1))
+        self.assertEqual(results[1], {"line": 2, "error": "ERROR invalid JSON format"})
+        stored = AccountManager(json_folder=self.json_folder).read_deposits()
+        self.assertEqual([deposit["amount"] for deposit in stored], ["10.00", "20.00"])
+
+    def test_append_only_storage(self):
+        """TC6: Con --journal y --deposit-wal los lotes se añaden al diario y al WAL sin
+        reescribir transactions.json ni deposits.json (deposits.json se escribe una vez
+        al final)"""
+        transfers_file = self.write_input(self.transfers(20))
+        with mock.patch.object(JsonFileStorage, "write_json", autospec=True,
+                               side_effect=JsonFileStorage.write_json) as write:
+            summary, _ = self.run_cli("transfers", transfers_file, "--batch-size", "4",
+                                      "--journal")
+            deposits_file = self.write_input([{"IBAN": IBAN, "AMOUNT": f"EUR {index}.00"}
+                                              for index in range(1, 21)])
+            self.run_cli("deposits", deposits_file, "--batch-size", "4",
+                         "--deposit-wal", "batch")
+        self.assertEqual(summary["accepted"], 20)
+        self.assertEqual([os.path.basename(call.args[2]) for call in write.call_args_list],
+                         ["deposits.json"])
+        self.assertFalse(os.path.exists(os.path.join(self.json_folder, "transactions.json")))
+        self.assertEqual(len(AccountManager(json_folder=self.json_folder).read_deposits()), 20)
+
+    @freeze_time("2025-05-23")
+    def test_default_storage_is_library_storage(self):
+        """TC7: Por defecto se guarda donde lee AccountManager() y se detectan los
+        duplicados ya guardados"""
+        transfers = self.transfers(2)
+        self.run_cli("transfers", self.write_input(transfers))
+        summary, results = self.run_cli("transfers", self.write_input(transfers[:1]))
+        self.assertEqual(summary["rejected"], 1)
+        self.assertEqual(results, [{"line": 1, "error": "ERROR transfer already exists"}])
+        self.assertEqual(len(AccountManager(json_folder=self.json_folder)
+                             .read_transactions()), 2)
+
+    def test_transfer_store_mismatch(self):
+        """TC8: Se rechaza cargar en el diario si ya existe transactions.json y al reves"""
+        input_file = self.write_input(self.transfers(1))
+        self.run_cli("transfers", input_file)
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["transfers", input_file, "--json-folder", self.json_folder, "--journal"])
+        other_folder = os.path.join(self.folder, "journal")
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            main(["transfers", input_file, "--json-folder", other_folder, "--journal"])
+            with self.assertRaises(SystemExit):
+                main(["transfers", input_file, "--json-folder", other_folder])
+
+    def test_interrupted_wal_recovered(self):
+        """TC9: Los ingresos que quedan en deposits.wal (carga interrumpida, tambien con
+        Ctrl+C) se pasan a deposits.json"""
+        deposits_file = self.write_input([{"IBAN": IBAN, "AMOUNT": "EUR 10.00"}])
+        with mock.patch.object(JsonFileStorage, "close"), \
+                mock.patch("uc3m_money.cli.BulkLoader.report", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_cli("deposits", deposits_file, "--deposit-wal", "always")
+        # Sin close (proceso muerto): el ingreso sigue en el WAL
+        self.assertTrue(os.path.getsize(os.path.join(self.json_folder, "deposits.wal")))
+        self.run_cli("deposits", self.write_input([{"IBAN": IBAN, "AMOUNT": "EUR 20.00"}]))
+        with open(os.path.join(self.json_folder, "deposits.json"), "r", encoding="utf-8") as f:
+            self.assertEqual([deposit["amount"] for deposit in json.load(f)],
+                             ["10.00", "20.00"])
+
+    def test_interrupt_checkpoints_wal(self):
+        """TC10: Con Ctrl+C el WAL se pasa a deposits.json antes de salir"""
+        deposits_file = self.write_input([{"IBAN": IBAN, "AMOUNT": "EUR 10.00"}])
+        with mock.patch("uc3m_money.cli.BulkLoader.report", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_cli("deposits", deposits_file, "--deposit-wal", "always")
+        with open(os.path.join(self.json_folder, "deposits.json"), "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
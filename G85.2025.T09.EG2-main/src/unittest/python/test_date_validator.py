@@ -0,0 +1,69 @@
+"""Tests para la validacion memorizada de fechas de transferencia"""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+from uc3m_money import AccountManager
+from uc3m_money import account_manager, date_validator
+from uc3m_money.date_validator import parse_date, validate_date
+from freezegun import freeze_time
+
+DATES = ["01/01/2027", "1/1/2027", " 1/01/2027", "31/12/2050", "01/01/2051",
+         "31/12/2024", "22/05/2025", "23/05/2025", "24/05/2025", "29/02/2028",
+         "29/02/2027", "32/01/2027", "01/13/2027", "2027-01-01", "01/01/27",
+         "01/01/2027 ", "", "aa/bb/cccc", "０１/０１/２０２７"]
+
+
+def original_validation(date: str, today: datetime) -> bool:
+    """Validacion de fechas anterior a la cache"""
+    try:
+        transfer_date = datetime.strptime(date, "%d/%m/%Y")
+        return 2025 <= transfer_date.year < 2051 and transfer_date >= today
+    except ValueError:
+        return False
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de date_validator y de su uso en transfer_request(s)"""
+
+    def setUp(self):
+        parse_date.cache_clear()
+
+    @freeze_time("2025-05-23 10:00:00")
+    def test_same_results_as_strptime(self):
+        """TC1: Acepta y rechaza exactamente las mismas fechas que antes"""
+        today = datetime.today()
+        for _ in range(2):
+            for date in DATES:
+                with self.subTest(date=date):
+                    self.assertEqual(validate_date(date, today),
+                                     original_validation(date, today))
+        with self.assertRaises(TypeError):
+            validate_date(20270101, today)
+
+    def test_repeated_dates_are_cached(self):
+        """TC2: Las fechas repetidas no vuelven a pasar por strptime"""
+        today = datetime(2025, 5, 23)
+        with mock.patch.object(date_validator, "datetime", wraps=datetime) as wrapped:
+            for _ in range(100):
+                self.assertTrue(validate_date("01/01/2027", today))
+                self.assertFalse(validate_date("01/01/2051", today))
+        self.assertEqual(wrapped.strptime.call_count, 2)
+        self.assertEqual(parse_date.cache_info().hits, 198)
+
+    @freeze_time("2025-05-23")
+    def test_today_once_per_batch(self):
+        """TC3: transfer_requests calcula la fecha de hoy una vez por lote"""
+        transfers = [("ES9121000418450200051332", "ES6160606457126971492537",
+                      f"Pago numero {index}", "ORDINARY", "01/01/2027", 10.0 + index)
+                     for index in range(20)]
+        manager = AccountManager(storage=mock.MagicMock(has_transfer=lambda code: False))
+        with mock.patch.object(account_manager, "datetime", wraps=datetime) as wrapped:
+            results = manager.transfer_requests(transfers)
+        self.assertEqual(wrapped.today.call_count, 1)
+        self.assertEqual(len(set(results)), 20)
+        self.assertFalse(any(result.startswith("ERROR") for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests para la ingesta de un directorio de ingresos"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from uc3m_money import AccountManager
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+INPUTS = {
+    "01_valid.json": '{"IBAN": "ES9121000418450200051332", "AMOUNT": "EUR 123.45"}',
+    "02_valid.json": '{"IBAN": "ES6160606457126971492537", "AMOUNT": "EUR 10.00"}',
+    "03_bad_json.json": '{"IBAN": "ES9121000418450200051332", ',
+    "04_bad_iban.json": '{"IBAN": "ES9999999999999999999999", "AMOUNT": "EUR 1.00"}',
+    "05_bad_structure.json": '{}',
+    "06_bad_amount.json": '{"IBAN": "ES9121000418450200051332", "AMOUNT": "123.45"}',
+}
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de AccountManager.deposit_directory"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_directory_")
+        self.manager = AccountManager(json_folder=self.folder)
+        self.deposits_file = os.path.join(self.folder, "deposits.json")
+        self.input_folder = os.path.join(self.folder, "deposit_directory")
+        os.makedirs(self.input_folder)
+        for name, content in INPUTS.items():
+            with open(os.path.join(self.input_folder, name), "w", encoding="utf-8") as f:
+                f.write(content)
+        with open(os.path.join(self.input_folder, "notas.txt"), "w", encoding="utf-8") as f:
+            f.write("no es un ingreso")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def single_file_results(self):
+        """Resultado de deposit_into_account fichero a fichero"""
+        results = {}
+        for name in sorted(INPUTS):
+            input_file = os.path.join(self.input_folder, name)
+            try:
+                results[input_file] = self.manager.deposit_into_account(input_file)
+            except AccountManagementException as exc:
+                results[input_file] = exc.message
+        os.remove(self.deposits_file)
+        return results
+
+    @freeze_time("2025-05-23")
+    def test_matches_single_file_behavior(self):
+        """TC1: Cada fichero obtiene la misma firma o el mismo error que por separado"""
+        expected = self.single_file_results()
+        summary = self.manager.deposit_directory(self.input_folder, workers=1, batch_size=1)
+        results = dict(summary["accepted"])
+        results.update(summary["rejected"])
+        self.assertEqual(results, expected)
+        self.assertEqual(len(summary["accepted"]), 2)
+
+        with open(self.deposits_file, "r", encoding="utf-8") as f:
+            deposits = json.load(f)
+        self.assertEqual([deposit["deposit_signature"] for deposit in deposits],
+                         list(summary["accepted"].values()))
+
+    def test_process_pool(self):
+        """TC2: Con varios procesos se aceptan y rechazan los mismos ficheros"""
+        summary = self.manager.deposit_directory(self.input_folder, workers=2)
+        self.assertEqual(sorted(os.path.basename(name) for name in summary["accepted"]),
+                         ["01_valid.json", "02_valid.json"])
+        self.assertEqual(summary["rejected"][os.path.join(self.input_folder, "04_bad_iban.json")],
+                         "ERROR IBAN not valid")
+        with open(self.deposits_file, "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_directory_not_found(self):
+        """TC3: Directorio inexistente"""
+        with self.assertRaises(AccountManagementException) as cm:
+            self.manager.deposit_directory(os.path.join(self.input_folder, "no_existe"))
+        self.assertEqual(str(cm.exception), "ERROR input directory not found")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests para el WAL de ingresos"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from uc3m_money import AccountManager, DepositWal
+from uc3m_money import deposit_wal
+from uc3m_money.account_management_exception import AccountManagementException
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de AccountManager con deposit_wal"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_wal_")
+        self.input_files = []
+        for index in range(5):
+            input_file = os.path.join(self.folder, f"deposit_{index}.json")
+            with open(input_file, "w", encoding="utf-8") as file:
+                json.dump({"IBAN": "ES9121000418450200051332",
+                           "AMOUNT": f"EUR {100 + index}.00"}, file)
+            self.input_files.append(input_file)
+        self.deposits_file = os.path.join(self.folder, "deposits.json")
+        self.wal_file = os.path.join(self.folder, "deposits.wal")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def read_deposits_file(self):
+        """Contenido de deposits.json"""
+        with open(self.deposits_file, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_wal_modes_checkpoint(self):
+        """TC1: En los tres modos los ingresos pasan a deposits.json en el checkpoint"""
+        for mode in ("always", "batch", "none"):
+            for name in ("deposits.json", "deposits.wal"):
+                if os.path.exists(os.path.join(self.folder, name)):
+                    os.remove(os.path.join(self.folder, name))
+            manager = AccountManager(json_folder=self.folder, deposit_wal=mode,
+                                     wal_checkpoint=3)
+            signatures = [manager.deposit_into_account(input_file)
+                          for input_file in self.input_files]
+            self.assertEqual(len(self.read_deposits_file()), 3)
+            self.assertEqual([deposit["deposit_signature"]
+                              for deposit in manager.read_deposits()], signatures)
+            manager.close()
+            self.assertEqual([deposit["deposit_signature"]
+                              for deposit in self.read_deposits_file()], signatures)
+            self.assertEqual(os.path.getsize(self.wal_file), 0)
+
+    def test_wal_recovery_on_startup(self):
+        """TC2: Los ingresos que quedaron en el WAL se recuperan en el primer uso"""
+        manager = AccountManager(json_folder=self.folder, deposit_wal="always")
+        signatures = [manager.deposit_into_account(input_file)
+                      for input_file in self.input_files]
+        self.assertFalse(os.path.exists(self.deposits_file))
+        # Caida: no se llama a close() y queda una linea escrita a medias
+        with open(self.wal_file, "a", encoding="utf-8") as file:
+            file.write('{"iban": "ES91')
+
+        recovered = AccountManager(json_folder=self.folder, deposit_wal="always")
+        # El constructor no hace E/S: la recuperacion espera al primer uso
+        self.assertFalse(os.path.exists(self.deposits_file))
+        self.assertEqual([deposit["deposit_signature"]
+                          for deposit in recovered.read_deposits()], signatures)
+        self.assertEqual([deposit["deposit_signature"]
+                          for deposit in self.read_deposits_file()], signatures)
+        self.assertEqual(recovered.deposit_wal.records(), [])
+
+    def test_wal_replay_is_idempotent(self):
+        """TC3: Si la caida fue tras renombrar deposits.json no se duplican ingresos"""
+        manager = AccountManager(json_folder=self.folder, deposit_wal="batch")
+        manager.deposit_into_account(self.input_files[0])
+        records = manager.deposit_wal.records()
+        manager.close()
+        with open(self.wal_file, "w", encoding="utf-8") as file:
+            file.write(json.dumps(records[0]) + "\n")
+
+        AccountManager(json_folder=self.folder, deposit_wal="batch").read_deposits()
+        self.assertEqual(len(self.read_deposits_file()), 1)
+
+    def test_wal_not_valid_mode(self):
+        """TC4: Un modo de durabilidad desconocido se rechaza"""
+        with self.assertRaises(AccountManagementException) as cm:
+            DepositWal(self.wal_file, "sometimes")
+        self.assertEqual(cm.exception.message, "ERROR durability mode not valid")
+
+    def test_without_wal_writes_atomically(self):
+        """TC5: Sin WAL deposits.json se reescribe sin dejar temporales"""
+        manager = AccountManager(json_folder=self.folder)
+        manager.deposit_into_account(self.input_files[0])
+        manager.deposit_into_account(self.input_files[1])
+        self.assertEqual(len(self.read_deposits_file()), 2)
+        self.assertFalse(os.path.exists(self.deposits_file + ".tmp"))
+
+    def test_batch_sync_every_n_records(self):
+        """TC6: En modo batch el fsync se hace cada wal_batch_records ingresos"""
+        manager = AccountManager(json_folder=self.folder, deposit_wal="batch",
+                                 wal_batch_records=2, wal_batch_ms=60000)
+        synced = []
+        with mock.patch.object(deposit_wal.os, "fsync",
+                               side_effect=lambda fd: synced.append(fd)):
+            for index, input_file in enumerate(self.input_files[:4]):
+                manager.deposit_into_account(input_file)
+                self.assertEqual(len(synced), (index + 1) // 2)
+        self.assertEqual(manager.storage.deposit_wal.batch_ms, 60000)
+        manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests para el codec JSON compacto"""
+
+import unittest
+import json
+import math
+import os
+import shutil
+import tempfile
+from unittest import mock
+from uc3m_money import AccountManager, JsonFileStorage
+from uc3m_money import json_codec
+from freezegun import freeze_time
+
+RECORDS = [{"iban": "ES9121000418450200051332", "saldos": 16.1, "timestamp": 1747958400.0},
+           {"concept": "Pago ñandú", "amount": 10, "big": 2 ** 70, "none": None}]
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de json_codec y de su uso en JsonFileStorage"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_codec_")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_compact_round_trip(self):
+        """TC1: El formato compacto no tiene espacios y se lee igual que con json"""
+        for orjson in (json_codec.orjson, None):
+            with mock.patch.object(json_codec, "orjson", orjson):
+                raw = json_codec.dumps(RECORDS)
+                self.assertNotIn(b"\n", raw)
+                self.assertNotIn(b'", "', raw)
+                self.assertEqual(json.loads(raw.decode("utf-8")), RECORDS)
+                self.assertEqual(json_codec.loads(raw), RECORDS)
+
+    def test_pretty_and_legacy_files(self):
+        """TC2: pretty=True es el formato original y los ficheros indentados se leen"""
+        raw = json_codec.dumps(RECORDS, pretty=True)
+        self.assertEqual(raw, json.dumps(RECORDS, indent=4).encode("utf-8"))
+        self.assertEqual(json_codec.loads(raw), RECORDS)
+
+    def test_nan(self):
+        """TC3: Con allow_nan se conservan NaN e Infinity y se vuelven a leer"""
+        raw = json_codec.dumps([float("nan"), float("inf")], allow_nan=True)
+        self.assertEqual(raw, b"[NaN,Infinity]")
+        values = json_codec.loads(raw)
+        self.assertTrue(math.isnan(values[0]))
+        self.assertEqual(values[1], float("inf"))
+
+    def test_invalid_json(self):
+        """TC4: El JSON no valido lanza json.JSONDecodeError"""
+        with self.assertRaises(json.JSONDecodeError):
+            json_codec.loads(b'[{"IBAN": ')
+
+    @freeze_time("2025-05-23")
+    def test_storage_writes_compact_and_reads_indented(self):
+        """TC5: El almacen JSON escribe compacto y acepta ficheros con indent=4"""
+        with open(os.path.join(self.folder, "transactions.json"), "w",
+                  encoding="utf-8") as file:
+            json.dump([{"transfer_code": "a"}], file, indent=4)
+        manager = AccountManager(json_folder=self.folder)
+        code = manager.transfer_request("ES9121000418450200051332",
+                                        "ES6160606457126971492537", "Pago alquiler",
+                                        "ORDINARY", "01/01/2027", 10.00)
+        self.assertEqual(code, "60cf4031a7af271f0c5c3c4f1bb806d5")
+        with open(manager.transactions_file, "r", encoding="utf-8") as file:
+            text = file.read()
+        self.assertNotIn("\n", text)
+        self.assertEqual([data["transfer_code"] for data in json.loads(text)], ["a", code])
+
+        pretty = AccountManager(json_folder=self.folder,
+                                storage=JsonFileStorage(self.folder, pretty=True))
+        pretty.transfer_request("ES9121000418450200051332", "ES6160606457126971492537",
+                                "Pago del coche", "ORDINARY", "01/01/2027", 10.00)
+        with open(manager.transactions_file, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), json.dumps(pretty.read_transactions(), indent=4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests para la lectura incremental de transactions2.json"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from uc3m_money import AccountManager, LedgerReader
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+IBAN = "ES9121000418450200051332"
+ENTRIES = [
+    {"IBAN": IBAN, "amount": "+100.00"},
+    {"IBAN": "ES0000000000000000000000", "amount": "+20.00", "concepto": "Año ñandú €"},
+    {"IBAN": IBAN, "amount": "NO_ES_NUMERO"},
+    {"IBAN": IBAN, "amount": "-50.25"},
+]
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de LedgerReader y del modo streaming de calculate_balance"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_ledger_")
+        self.manager = AccountManager(streaming=True, json_folder=self.folder)
+        self.transactions_file = os.path.join(self.folder, "transactions2.json")
+        self.balances_file = os.path.join(self.folder, "saldos.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def write_ledger(self, text):
+        """Escribe transactions2.json con el texto indicado"""
+        with open(self.transactions_file, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_reader_matches_json_load(self):
+        """TC1: Mismos elementos que json.load con distintos formatos y tamaños de bloque"""
+        for text in [json.dumps(ENTRIES, indent=4), json.dumps(ENTRIES, ensure_ascii=False),
+                     "[]", " [ ] \n", "[1, 22, 333]"]:
+            self.write_ledger(text)
+            for chunk_size in [1, 3, 7, 65536]:
+                entries = list(LedgerReader(self.transactions_file, chunk_size=chunk_size))
+                self.assertEqual(entries, json.loads(text))
+
+    def test_reader_resumes_from_offset(self):
+        """TC2: Se puede continuar desde el offset del ultimo elemento leido"""
+        self.write_ledger(json.dumps(ENTRIES, ensure_ascii=False, indent=2))
+        reader = LedgerReader(self.transactions_file, chunk_size=5)
+        iterator = iter(reader)
+        first = [next(iterator), next(iterator)]
+        rest = list(LedgerReader(self.transactions_file, offset=reader.offset))
+        self.assertEqual(first + rest, ENTRIES)
+
+    def test_reader_rejects_invalid_json(self):
+        """TC3: Un array mal formado produce un error de formato"""
+        for text in ['{"IBAN": "x"}', '[{"IBAN": "x"}', '[{"IBAN": "x"}] []', '[1 2]', ""]:
+            self.write_ledger(text)
+            with self.assertRaises(ValueError):
+                list(LedgerReader(self.transactions_file, chunk_size=4))
+
+    @freeze_time("2025-05-23")
+    def test_streaming_balance_matches(self):
+        """TC4: El saldo en modo streaming coincide con el calculado con json.load"""
+        self.write_ledger(json.dumps(ENTRIES, indent=4))
+        self.assertTrue(self.manager.calculate_balance(IBAN))
+        self.assertTrue(AccountManager(json_folder=self.folder).calculate_balance(IBAN))
+        with open(self.balances_file, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)[0]["saldos"], 99.50)
+
+    @freeze_time("2025-05-23")
+    def test_streaming_errors(self):
+        """TC5: Mismos mensajes de error que sin streaming"""
+        self.write_ledger('{"IBAN": "ES9121000418450200051332", "amount": "+123.45"')
+        with self.assertRaises(AccountManagementException) as cm:
+            self.manager.calculate_balance(IBAN)
+        self.assertEqual(str(cm.exception), "ERROR reading transaction file")
+
+        self.write_ledger(json.dumps(ENTRIES[1:2]))
+        with self.assertRaises(AccountManagementException) as cm:
+            self.manager.calculate_balance(IBAN)
+        self.assertEqual(str(cm.exception), "ERROR iban not found")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests para la copia binaria por columnas de transactions2.json"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from uc3m_money import AccountManager, LedgerSnapshot
+from uc3m_money import ledger_snapshot
+from freezegun import freeze_time
+
+IBAN = "ES9121000418450200051332"
+OTHER_IBAN = "ES6160606457126971492537"
+MOVEMENTS = [{"IBAN": IBAN, "amount": "+100.10"},
+             {"IBAN": OTHER_IBAN, "amount": "+20.00"},
+             {"IBAN": IBAN, "amount": "-0.29"},
+             {"IBAN": IBAN, "amount": "abc"},
+             {"IBAN": None, "amount": "5.00"},
+             {"IBAN": IBAN, "amount": 12}]
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de LedgerSnapshot y de su uso en calculate_balance"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_snapshot_")
+        self.ledger_file = os.path.join(self.folder, "transactions2.json")
+        self.write_ledger(MOVEMENTS)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def write_ledger(self, movements):
+        """Reescribe transactions2.json como lo haria json.dump"""
+        with open(self.ledger_file, "w", encoding="utf-8") as file:
+            json.dump(movements, file, indent=4)
+
+    def balances(self, **options):
+        """saldos.json tras calcular los dos saldos en una carpeta con MOVEMENTS"""
+        folder = tempfile.mkdtemp(dir=self.folder)
+        shutil.copy(self.ledger_file, folder)
+        manager = AccountManager(json_folder=folder, **options)
+        manager.calculate_balance(IBAN)
+        manager.calculate_balance(OTHER_IBAN)
+        manager.close()
+        with open(os.path.join(folder, "saldos.json"), "r", encoding="utf-8") as file:
+            return [(entry["iban"], entry["saldos"]) for entry in json.load(file)]
+
+    def test_totals(self):
+        """TC1: La suma y el numero de importes son los del ledger, con y sin numpy"""
+        for numpy in (ledger_snapshot.numpy(), None):
+            with mock.patch.object(ledger_snapshot, "numpy", return_value=numpy):
+                snapshot = LedgerSnapshot(self.ledger_file)
+                total_balance, count = snapshot.totals(IBAN)
+                self.assertAlmostEqual(total_balance, 111.81, places=9)
+                self.assertEqual(count, 3)
+                self.assertEqual(snapshot.totals(OTHER_IBAN), (20.0, 1))
+                self.assertEqual(snapshot.totals("ES0000000000000000000000"), (0, 0))
+                snapshot.close()
+
+    @freeze_time("2025-05-23")
+    def test_same_balances_as_json(self):
+        """TC2: calculate_balance guarda los mismos saldos que leyendo el JSON"""
+        self.assertEqual(self.balances(ledger_snapshot=True), self.balances())
+
+    def test_rebuilt_when_ledger_changes(self):
+        """TC3: La copia se regenera si transactions2.json ha cambiado"""
+        snapshot = LedgerSnapshot(self.ledger_file)
+        self.assertEqual(snapshot.totals(OTHER_IBAN), (20.0, 1))
+        self.write_ledger(MOVEMENTS + [{"IBAN": OTHER_IBAN, "amount": "-5.50"},
+                                       {"IBAN": OTHER_IBAN, "amount": "-5.50"}])
+        self.assertEqual(snapshot.totals(OTHER_IBAN), (9.0, 3))
+        snapshot.close()
+        # Otra instancia reutiliza la copia ya escrita sin volver a convertir
+        with mock.patch.object(LedgerSnapshot, "convert") as convert:
+            self.assertEqual(LedgerSnapshot(self.ledger_file).totals(OTHER_IBAN), (9.0, 3))
+        convert.assert_not_called()
+
+    @freeze_time("2025-05-23")
+    def test_inexact_amounts_fall_back_to_json(self):
+        """TC4: Con importes que no son centimos exactos se suma sobre el JSON"""
+        self.write_ledger(MOVEMENTS + [{"IBAN": IBAN, "amount": "0.005"}])
+        snapshot = LedgerSnapshot(self.ledger_file)
+        self.assertIsNone(snapshot.totals(IBAN))
+        snapshot.close()
+        self.assertEqual(self.balances(ledger_snapshot=True), self.balances())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests para el registro de metricas de AccountManager"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from uc3m_money import AccountManager, Metrics
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de stats() y dump_metrics()"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_metrics_")
+        self.manager = AccountManager(json_folder=self.folder, metrics=True)
+        self.deposit_file = os.path.join(self.folder, "deposit.json")
+        with open(self.deposit_file, "w", encoding="utf-8") as file:
+            json.dump({"IBAN": "ES9121000418450200051332", "AMOUNT": "EUR 123.45"}, file)
+        with open(os.path.join(self.folder, "transactions2.json"), "w",
+                  encoding="utf-8") as file:
+            json.dump([{"IBAN": "ES9121000418450200051332", "amount": "10.00"},
+                       {"IBAN": "ES6160606457126971492537", "amount": "5.00"}], file)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    @freeze_time("2025-05-23")
+    def run_operations(self):
+        """Una operacion de cada tipo"""
+        self.manager.transfer_request("ES9121000418450200051332", "ES6160606457126971492537",
+                                      "Pago alquiler", "ORDINARY", "01/01/2027", 10.00)
+        self.manager.deposit_into_account(self.deposit_file)
+        self.manager.calculate_balance("ES9121000418450200051332")
+
+    def test_stats_phases_and_counters(self):
+        """TC1: Cada operacion registra sus fases y sus contadores"""
+        self.run_operations()
+        stats = self.manager.stats()
+        self.assertEqual(set(stats["latency"]["transfer_request"]),
+                         {"validation", "hashing", "write"})
+        self.assertEqual(set(stats["latency"]["deposit_into_account"]),
+                         {"read", "parse", "validation", "hashing", "write"})
+        self.assertEqual(set(stats["latency"]["calculate_balance"]),
+                         {"validation", "read", "parse", "write"})
+        validation = stats["latency"]["transfer_request"]["validation"]
+        self.assertEqual(validation["count"], 1)
+        self.assertEqual(validation["buckets"]["+Inf"], 1)
+
+        counters = stats["counters"]
+        self.assertEqual(counters["transfer_request"]["records_written"], 1)
+        self.assertEqual(counters["transfer_request"]["bytes_written"],
+                         os.path.getsize(self.manager.transactions_file))
+        self.assertEqual(counters["deposit_into_account"]["records_read"], 1)
+        self.assertEqual(counters["deposit_into_account"]["bytes_read"],
+                         os.path.getsize(self.deposit_file))
+        self.assertEqual(counters["calculate_balance"]["records_read"], 2)
+
+    def test_errors_are_timed(self):
+        """TC2: Las validaciones que fallan tambien se miden"""
+        with self.assertRaises(AccountManagementException):
+            self.manager.calculate_balance("ES0000000000000000000000")
+        stats = self.manager.stats()
+        self.assertEqual(stats["latency"]["calculate_balance"]["validation"]["count"], 1)
+        self.assertNotIn("calculate_balance", stats["counters"])
+
+    def test_prometheus_dump(self):
+        """TC3: dump_metrics escribe el formato de texto de Prometheus"""
+        self.run_operations()
+        path = self.manager.dump_metrics()
+        with open(path, "r", encoding="utf-8") as file:
+            text = file.read()
+        self.assertIn("# TYPE uc3m_money_operation_seconds histogram", text)
+        self.assertIn('uc3m_money_operation_seconds_count{operation="transfer_request",'
+                      'phase="validation"} 1', text)
+        self.assertIn('uc3m_money_records_total{operation="transfer_request",'
+                      'direction="written"} 1', text)
+        self.assertIn('le="+Inf"', text)
+
+    def test_disabled(self):
+        """TC4: Sin metricas stats() esta vacio"""
+        manager = AccountManager(json_folder=self.folder)
+        manager.deposit_into_account(self.deposit_file)
+        self.assertEqual(manager.stats(), {"latency": {}, "counters": {}})
+
+    def test_histogram_buckets(self):
+        """TC5: Los cubos son acumulados y el limite es inclusivo"""
+        metrics = Metrics()
+        metrics.observe("op", "read", 0.001)
+        metrics.observe("op", "read", 0.002)
+        metrics.observe("op", "read", 60)
+        buckets = metrics.stats()["latency"]["op"]["read"]["buckets"]
+        self.assertEqual(buckets["0.0005"], 0)
+        self.assertEqual(buckets["0.001"], 1)
+        self.assertEqual(buckets["0.0025"], 2)
+        self.assertEqual(buckets["10.0"], 2)
+        self.assertEqual(buckets["+Inf"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests de escritura concurrente desde varios procesos (cerrojo + group commit)"""
+
+import unittest
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from uc3m_money import AccountManager
+from uc3m_money.file_lock import FileLock
+
+IBAN = "ES9121000418450200051332"
+WRITERS = 4
+RECORDS_PER_WRITER = 15
+
+
+def write_transfers(folder, writer):
+    """Proceso escritor: solicita RECORDS_PER_WRITER transferencias distintas"""
+    manager = AccountManager(json_folder=folder, process_safe=True)
+    for index in range(RECORDS_PER_WRITER):
+        manager.transfer_request(IBAN, "ES6160606457126971492537",
+                                 f"Pago {writer} numero {index}", "ORDINARY", "01/01/2049",
+                                 10.0 + index)
+
+
+def write_deposits(folder, writer):
+    """Proceso escritor: procesa RECORDS_PER_WRITER ingresos"""
+    manager = AccountManager(json_folder=folder, process_safe=True)
+    for index in range(RECORDS_PER_WRITER):
+        input_file = os.path.join(folder, f"deposit_{writer}_{index}.json")
+        with open(input_file, "w", encoding="utf-8") as f:
+            json.dump({"IBAN": IBAN, "AMOUNT": f"EUR {index}.00"}, f)
+        manager.deposit_into_account(input_file)
+
+
+class MyTestCase(unittest.TestCase):
+    """Varios procesos escriben a la vez en la misma carpeta sin perder registros"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def run_writers(self, target):
+        """Lanza WRITERS procesos y espera a que terminen bien"""
+        processes = [multiprocessing.Process(target=target, args=(self.folder, writer))
+                     for writer in range(WRITERS)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+    def test_no_transfer_lost(self):
+        """TC1: Todas las transferencias de todos los procesos quedan guardadas"""
+        self.run_writers(write_transfers)
+        transactions = AccountManager(json_folder=self.folder).read_transactions()
+        self.assertEqual(len(transactions), WRITERS * RECORDS_PER_WRITER)
+        self.assertEqual(len({item["transfer_code"] for item in transactions}),
+                         WRITERS * RECORDS_PER_WRITER)
+
+    def test_no_deposit_lost(self):
+        """TC2: Todos los ingresos de todos los procesos quedan guardados"""
+        self.run_writers(write_deposits)
+        with open(os.path.join(self.folder, "deposits.json"), "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), WRITERS * RECORDS_PER_WRITER)
+        self.assertEqual(os.listdir(os.path.join(self.folder, "deposits.spool")), [])
+
+    def test_lock_between_threads(self):
+        """TC3: Varios hilos con el mismo FileLock no solapan sus secciones criticas"""
+        lock = FileLock(os.path.join(self.folder, "threads.lock"))
+        inside = []
+        overlaps = []
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    with lock:
+                        inside.append(1)
+                        overlaps.append(len(inside))
+                        time.sleep(0.001)
+                        inside.pop()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                errors.append(exc)
+        threads = [threading.Thread(target=worker) for _ in range(WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(overlaps, [1] * WRITERS * 20)
+
+    def test_threads_share_manager(self):
+        """TC4: Varios hilos con el mismo gestor process_safe no pierden transferencias"""
+        manager = AccountManager(json_folder=self.folder, process_safe=True)
+
+        def worker(writer):
+            for index in range(RECORDS_PER_WRITER):
+                manager.transfer_request(IBAN, "ES6160606457126971492537",
+                                         f"Pago {writer} numero {index}", "ORDINARY",
+                                         "01/01/2049", 10.0 + index)
+        threads = [threading.Thread(target=worker, args=(writer,))
+                   for writer in range(WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        transactions = AccountManager(json_folder=self.folder).read_transactions()
+        self.assertEqual(len(transactions), WRITERS * RECORDS_PER_WRITER)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests para el perfilado por muestreo de AccountManager"""
+
+import unittest
+import json
+import os
+import pstats
+import shutil
+import tempfile
+from unittest import mock
+from uc3m_money import AccountManager
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests del modo de perfilado"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_profile_")
+        self.profile_folder = os.path.join(self.folder, "profiles")
+        self.input_folder = os.path.join(self.folder, "inputs")
+        os.makedirs(self.input_folder)
+        for index in range(3):
+            with open(os.path.join(self.input_folder, f"{index}.json"), "w",
+                      encoding="utf-8") as file:
+                json.dump({"IBAN": "ES9121000418450200051332",
+                           "AMOUNT": f"EUR {index + 1}.00"}, file)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def profiles(self, extension):
+        """Ficheros de perfil generados con la extension indicada"""
+        if not os.path.isdir(self.profile_folder):
+            return []
+        return sorted(name for name in os.listdir(self.profile_folder)
+                      if name.endswith(extension))
+
+    def test_sample_one_in_n(self):
+        """TC1: Con profile=2 se perfila una de cada dos llamadas"""
+        manager = AccountManager(json_folder=self.folder, profile=2)
+        for _ in range(4):
+            self.assertTrue(manager.validate_iban("ES9121000418450200051332"))
+        self.assertEqual(len(self.profiles(".prof")), 2)
+        self.assertEqual(len(self.profiles(".txt")), 2)
+        prof_file = os.path.join(self.profile_folder, self.profiles(".prof")[0])
+        self.assertTrue(self.profiles(".prof")[0].startswith("validate_iban-"))
+        self.assertGreater(pstats.Stats(prof_file).total_calls, 0)
+        with open(os.path.join(self.profile_folder, self.profiles(".txt")[0]), "r",
+                  encoding="utf-8") as file:
+            self.assertIn("Top 20", file.read())
+
+    def test_environment_switch(self):
+        """TC2: La variable de entorno activa el perfilado y elige la carpeta"""
+        other_folder = os.path.join(self.folder, "other")
+        with mock.patch.dict(os.environ, {"UC3M_MONEY_PROFILE": "1",
+                                          "UC3M_MONEY_PROFILE_DIR": other_folder,
+                                          "UC3M_MONEY_PROFILE_TOP": "5"}):
+            manager = AccountManager(json_folder=self.folder)
+        manager.deposit_into_account(os.path.join(self.input_folder, "0.json"))
+        names = os.listdir(other_folder)
+        self.assertEqual(len(names), 2)
+        self.assertTrue(all(name.startswith("deposit_into_account-") for name in names))
+
+    def test_nested_calls_profiled_once(self):
+        """TC3: Una llamada publica dentro de otra perfilada no se perfila aparte"""
+        manager = AccountManager(json_folder=self.folder, profile=1)
+        summary = manager.deposit_directory(self.input_folder, workers=1)
+        self.assertEqual(len(summary["accepted"]), 3)
+        self.assertEqual(len(self.profiles(".prof")), 1)
+        self.assertTrue(self.profiles(".prof")[0].startswith("deposit_directory-"))
+
+    def test_disabled(self):
+        """TC4: Sin configuracion no se envuelve nada"""
+        with mock.patch.dict(os.environ, {"UC3M_MONEY_PROFILE": ""}):
+            manager = AccountManager(json_folder=self.folder)
+        self.assertIsNone(manager.profiler)
+        self.assertNotIn("deposit_into_account", vars(manager))
+
+    def test_nested_calls_do_not_count(self):
+        """TC5: Las llamadas anidadas no cuentan para el muestreo ni se perfilan solas"""
+        with open(os.path.join(self.folder, "transactions2.json"), "w",
+                  encoding="utf-8") as file:
+            json.dump([{"IBAN": "ES9121000418450200051332", "amount": "+10.00"}], file)
+        manager = AccountManager(json_folder=self.folder, profile=3)
+        for _ in range(3):
+            self.assertTrue(manager.calculate_balance("ES9121000418450200051332"))
+        self.assertEqual(len(self.profiles(".prof")), 1)
+        self.assertTrue(self.profiles(".prof")[0].startswith("calculate_balance-"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests para el almacenamiento en SQLite de AccountManager"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from uc3m_money import AccountManager
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+IBAN = "ES9121000418450200051332"
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests del modo base de datos"""
+
+    def setUp(self):
+        """Crea una base de datos vacia en una carpeta temporal"""
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_sqlite_")
+        self.database_file = os.path.join(self.folder, "test_uc3m_money.db")
+        self.transactions2_file = os.path.join(self.folder, "transactions2.json")
+        self.balances_file = os.path.join(self.folder, "saldos.json")
+        self.manager = AccountManager(database=self.database_file, json_folder=self.folder)
+
+    def tearDown(self):
+        self.manager.database.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    @freeze_time("2025-05-23")
+    def test_transfer_request_database(self):
+        """TC1: Mismo codigo que en JSON y deteccion de duplicados por la clave primaria"""
+        transfer = ("ES9121000418450200051332", "ES6160606457126971492537", "Pago alquiler",
+                    "ORDINARY", "01/01/2027", 10.00)
+        self.assertEqual(self.manager.transfer_request(*transfer),
+                         "60cf4031a7af271f0c5c3c4f1bb806d5")
+        with self.assertRaises(AccountManagementException) as cm:
+            self.manager.transfer_request(*transfer)
+        self.assertEqual(str(cm.exception), "ERROR transfer already exists")
+        self.assertEqual(len(self.manager.read_transactions()), 1)
+
+    @freeze_time("2025-05-23")
+    def test_deposit_database(self):
+        """TC2: El ingreso se guarda en la tabla deposits con la misma firma"""
+        input_file = os.path.join(self.manager.json_folder, "test_sqlite_deposit.json")
+        with open(input_file, "w", encoding="utf-8") as f:
+            json.dump({"IBAN": IBAN, "AMOUNT": "EUR 123.45"}, f)
+        signature = self.manager.deposit_into_account(input_file)
+        self.assertEqual(signature,
+                         "3814f093d40db77f64796fef98a0467e8516dbedf5ff918c85c7a61b5f436c52")
+        self.assertEqual(self.manager.database.load_deposits()[0]["deposit_signature"],
+                         signature)
+
+    @freeze_time("2025-05-23")
+    def test_migration_and_balance(self):
+        """TC3: Tras migrar transactions2.json el saldo coincide con el modo JSON"""
+        with open(self.transactions2_file, "w", encoding="utf-8") as f:
+            json.dump([{"IBAN": IBAN, "amount": "+100.00"},
+                       {"IBAN": IBAN, "amount": "NO_ES_NUMERO"},
+                       {"IBAN": "ES0000000000000000000000", "amount": "+10.00"},
+                       {"IBAN": IBAN, "amount": "-50.00"}], f)
+        self.manager.migrate_to_database()
+
+        self.assertTrue(self.manager.calculate_balance(IBAN))
+        self.assertTrue(self.manager.calculate_balance(IBAN))
+        self.assertEqual(self.manager.database.load_balances()[0]["saldos"], 100.00)
+
+        self.assertTrue(AccountManager(json_folder=self.folder).calculate_balance(IBAN))
+        with open(self.balances_file, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)[0]["saldos"], 50.00)
+
+    def test_balance_iban_not_found(self):
+        """TC4: Sin movimientos del IBAN se lanza el mismo error que en modo JSON"""
+        with self.assertRaises(AccountManagementException) as cm:
+            self.manager.calculate_balance(IBAN)
+        self.assertEqual(str(cm.exception), "ERROR iban not found")
+
+    def test_migration_runs_once(self):
+        """TC5: Migrar otra vez la misma carpeta no duplica movimientos ni ingresos"""
+        with open(self.transactions2_file, "w", encoding="utf-8") as f:
+            json.dump([{"IBAN": IBAN, "amount": "+100.00"}], f)
+        self.assertTrue(self.manager.migrate_to_database())
+        self.assertFalse(self.manager.migrate_to_database())
+        other = AccountManager(database=self.database_file, json_folder=self.folder)
+        self.assertFalse(other.migrate_to_database())
+        other.close()
+        self.assertEqual(self.manager.database.iban_movements(IBAN), (100.0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests para el arranque en frio de uc3m_money"""
+
+import unittest
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import uc3m_money
+
+HEAVY_MODULES = ["asyncio", "concurrent.futures.process", "cProfile", "multiprocessing",
+                 "numpy", "tracemalloc"]
+STARTUP = """
+import json, sys
+import uc3m_money
+uc3m_money.AccountManager(json_folder=sys.argv[1])
+print(json.dumps(sorted(set(sys.argv[2:]) & set(sys.modules))))
+"""
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de la carga diferida del paquete y del constructor sin E/S"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_startup_")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_cold_start(self):
+        """TC1: Importar el paquete y crear el gestor no carga modulos pesados ni
+        crea carpetas"""
+        json_folder = os.path.join(self.folder, "JsonFiles")
+        env = dict(os.environ)
+        env.pop("UC3M_MONEY_PROFILE", None)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(uc3m_money.__file__)),
+             env.get("PYTHONPATH", "")])
+        result = subprocess.run([sys.executable, "-c", STARTUP, json_folder] + HEAVY_MODULES,
+                                env=env, capture_output=True, text=True, check=True)
+        self.assertEqual(json.loads(result.stdout), [])
+        self.assertFalse(os.path.exists(json_folder))
+
+    def test_lazy_attributes(self):
+        """TC2: Los nombres publicos se resuelven al usarlos y los desconocidos fallan"""
+        self.assertIn("AsyncAccountManager", dir(uc3m_money))
+        for name in uc3m_money.__all__:
+            self.assertEqual(getattr(uc3m_money, name).__name__, name)
+        self.assertIs(uc3m_money.validate_iban,
+                      sys.modules["uc3m_money.iban_validator"].validate_iban)
+        with self.assertRaises(AttributeError):
+            _ = uc3m_money.NotAClass
+
+    def test_first_write_creates_folder(self):
+        """TC3: La carpeta de datos se crea con la primera escritura"""
+        json_folder = os.path.join(self.folder, "nested", "JsonFiles")
+        manager = uc3m_money.AccountManager(json_folder=json_folder)
+        self.assertFalse(os.path.exists(json_folder))
+        code = manager.transfer_request("ES9121000418450200051332",
+                                        "ES6160606457126971492537", "Pago alquiler",
+                                        "ORDINARY", "01/01/2049", 10.00)
+        self.assertEqual(manager.read_transactions()[0]["transfer_code"], code)
+        self.assertTrue(os.path.isdir(json_folder))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Tests para los almacenes intercambiables de AccountManager"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from uc3m_money import AccountManager, StorageBackend, JsonFileStorage, JournalStorage, \
+    MemoryStorage, SqliteStorage
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+MOVEMENTS = [{"IBAN": "ES9121000418450200051332", "amount": "10.10"},
+             {"IBAN": "ES6160606457126971492537", "amount": "5.00"},
+             {"IBAN": "ES9121000418450200051332", "amount": "-2.05"},
+             {"IBAN": "ES9121000418450200051332", "amount": "abc"}]
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de StorageBackend y sus implementaciones"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_storage_")
+        self.deposit_file = os.path.join(self.folder, "deposit.json")
+        with open(self.deposit_file, "w", encoding="utf-8") as file:
+            json.dump({"IBAN": "ES9121000418450200051332", "AMOUNT": "EUR 123.45"}, file)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def backends(self):
+        """Un almacen de cada tipo, cada uno en su carpeta"""
+        backends = {}
+        for name in ("json", "journal", "memory", "sqlite"):
+            folder = os.path.join(self.folder, name)
+            os.makedirs(folder)
+            if name == "json":
+                backends[name] = JsonFileStorage(folder)
+            elif name == "journal":
+                backends[name] = JournalStorage(folder)
+            elif name == "memory":
+                backends[name] = MemoryStorage()
+            else:
+                backends[name] = SqliteStorage(os.path.join(folder, "uc3m_money.db"))
+        return backends
+
+    def test_backends_follow_protocol(self):
+        """TC1: Todos los almacenes cumplen StorageBackend"""
+        for name, storage in self.backends().items():
+            self.assertIsInstance(storage, StorageBackend, name)
+            storage.close()
+
+    @freeze_time("2025-05-23")
+    def test_same_results_in_every_backend(self):
+        """TC2: Las operaciones dan el mismo resultado con cualquier almacen"""
+        results = {}
+        for name, storage in self.backends().items():
+            storage.add_movements(MOVEMENTS)
+            manager = AccountManager(json_folder=os.path.join(self.folder, name),
+                                     storage=storage)
+            code = manager.transfer_request("ES9121000418450200051332",
+                                            "ES6160606457126971492537", "Pago alquiler",
+                                            "ORDINARY", "01/01/2027", 10.00)
+            with self.assertRaises(AccountManagementException) as cm:
+                manager.transfer_request("ES9121000418450200051332",
+                                         "ES6160606457126971492537", "Pago alquiler",
+                                         "ORDINARY", "01/01/2027", 10.00)
+            self.assertEqual(cm.exception.message, "ERROR transfer already exists")
+            signature = manager.deposit_into_account(self.deposit_file)
+            manager.calculate_balance("ES9121000418450200051332")
+            manager.calculate_balance("ES9121000418450200051332")
+            with self.assertRaises(AccountManagementException) as cm:
+                manager.calculate_balance("ES6421000418450200051333")
+            self.assertEqual(cm.exception.message, "ERROR iban not found")
+            results[name] = (code, signature, manager.read_transactions(),
+                             manager.read_deposits(),
+                             [(entry["iban"], entry["saldos"])
+                              for entry in storage.load_balances()])
+            manager.close()
+        self.assertEqual(results["json"][2][0]["transfer_code"],
+                         "60cf4031a7af271f0c5c3c4f1bb806d5")
+        self.assertEqual(results["json"][4], [("ES9121000418450200051332", 16.1)])
+        for name in ("journal", "memory", "sqlite"):
+            self.assertEqual(results[name], results["json"], name)
+
+    def test_memory_storage_writes_nothing(self):
+        """TC3: Con MemoryStorage no se escribe ningun fichero de datos"""
+        manager = AccountManager(json_folder=self.folder,
+                                 storage=MemoryStorage(movements=MOVEMENTS))
+        manager.deposit_into_account(self.deposit_file)
+        manager.calculate_balance("ES6160606457126971492537")
+        self.assertEqual(os.listdir(self.folder), ["deposit.json"])
+        self.assertIsNone(manager.database)
+        self.assertIsNone(manager.journal)
+
+    def test_shortcut_flags(self):
+        """TC4: journal y database siguen creando su almacen"""
+        manager = AccountManager(json_folder=self.folder, journal=True)
+        self.assertIsInstance(manager.storage, JournalStorage)
+        manager = AccountManager(json_folder=self.folder,
+                                 database=os.path.join(self.folder, "uc3m_money.db"))
+        self.assertIsInstance(manager.storage, SqliteStorage)
+        self.assertIs(manager.database, manager.storage)
+        manager.close()
+        self.assertIsInstance(AccountManager(json_folder=self.folder).storage,
+                              JsonFileStorage)
+
+    def test_conflicting_options(self):
+        """TC5: Las opciones de almacen incompatibles lanzan ValueError"""
+        database = os.path.join(self.folder, "uc3m_money.db")
+        for options in ({"storage": MemoryStorage(), "journal": True},
+                        {"storage": MemoryStorage(), "database": database},
+                        {"database": database, "journal": True},
+                        {"database": database, "deposit_wal": "batch"},
+                        {"balance_index": True, "ledger_snapshot": True},
+                        {"balance_index": True, "streaming": True},
+                        {"process_safe": True, "deposit_wal": "batch"}):
+            with self.subTest(options=sorted(options)):
+                with self.assertRaises(ValueError):
+                    AccountManager(json_folder=self.folder, **options)
+        manager = AccountManager(json_folder=self.folder, journal=True, streaming=True,
+                                 ledger_snapshot=True, deposit_wal="batch")
+        self.assertIsInstance(manager.storage, JournalStorage)
+        self.assertFalse(os.path.exists(database))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests para el indice persistente de transferencias duplicadas"""
+
+import unittest
+import os
+import shutil
+import tempfile
+from uc3m_money import AccountManager
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests del indice de transfer_code"""
+
+    def setUp(self):
+        """Diario e indice vacios en una carpeta temporal"""
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_index_")
+        self.manager = self.new_manager()
+        self.index_file = self.manager.transfer_index.index_file
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def new_manager(self):
+        """Otro AccountManager en modo diario sobre la misma carpeta"""
+        return AccountManager(journal=True, json_folder=self.folder)
+
+    def transfer(self, manager, concept="Pago alquiler"):
+        """Solicita una transferencia valida con el concepto indicado"""
+        return manager.transfer_request(
+            from_iban="ES9121000418450200051332",
+            to_iban="ES6160606457126971492537",
+            concept=concept,
+            transfer_type="ORDINARY",
+            date="01/01/2027",
+            amount=10.00)
+
+    @freeze_time("2025-05-23")
+    def test_index_persisted_between_managers(self):
+        """TC1: Un nuevo AccountManager detecta el duplicado usando el indice guardado"""
+        code = self.transfer(self.manager)
+        with open(self.index_file, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read().split()[0], code)
+
+        with self.assertRaises(AccountManagementException) as cm:
+            self.transfer(self.new_manager())
+        self.assertEqual(str(cm.exception), "ERROR transfer already exists")
+
+    @freeze_time("2025-05-23")
+    def test_index_rebuilt_when_missing(self):
+        """TC2: Si se borra el indice se reconstruye desde el fichero de datos"""
+        code = self.transfer(self.manager)
+        self.transfer(self.manager, "Compra coche nueva")
+        os.remove(self.index_file)
+
+        manager = self.new_manager()
+        self.assertIn(code, manager.transfer_index)
+        self.assertEqual(len(manager.transfer_index), 2)
+        with self.assertRaises(AccountManagementException):
+            self.transfer(manager)
+
+    @freeze_time("2025-05-23")
+    def test_index_rebuilt_when_data_removed(self):
+        """TC3: Un indice que ya no corresponde al fichero de datos no da falsos duplicados"""
+        self.transfer(self.manager)
+        os.remove(self.manager.journal.journal_file)
+        self.assertEqual(self.transfer(self.new_manager()),
+                         "60cf4031a7af271f0c5c3c4f1bb806d5")
+
+    @freeze_time("2025-05-23")
+    def test_index_deleted_while_in_use(self):
+        """TC4: Si se borra el indice mientras un gestor lo tiene en memoria, la siguiente
+        escritura lo reconstruye con todos los codigos"""
+        code = self.transfer(self.manager)
+        os.remove(self.index_file)
+        other_code = self.transfer(self.manager, "Compra coche nueva")
+        manager = self.new_manager()
+        self.assertIn(code, manager.transfer_index)
+        self.assertIn(other_code, manager.transfer_index)
+        with self.assertRaises(AccountManagementException):
+            self.transfer(manager)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Tests para el modo diario (JSON Lines) de transfer_request"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from uc3m_money import AccountManager
+from uc3m_money.account_management_exception import AccountManagementException
+from freezegun import freeze_time
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests del almacen de transferencias en modo diario"""
+
+    def setUp(self):
+        """Diario vacio en una carpeta temporal"""
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_journal_")
+        self.manager = AccountManager(journal=True, json_folder=self.folder)
+        self.journal_file = self.manager.journal.journal_file
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    @freeze_time("2025-05-23")
+    def test_journal_appends_one_line_per_transfer(self):
+        """TC1: Cada transferencia añade una linea con el mismo codigo que el modo JSON"""
+        result = self.manager.transfer_request(
+            from_iban="ES9121000418450200051332",
+            to_iban="ES6160606457126971492537",
+            concept="Pago alquiler",
+            transfer_type="ORDINARY",
+            date="01/01/2027",
+            amount=10.00)
+        self.assertEqual(result, "60cf4031a7af271f0c5c3c4f1bb806d5")
+        self.manager.transfer_request(
+            from_iban="ES9121000418450200051332",
+            to_iban="ES6160606457126971492537",
+            concept="Compra coche",
+            transfer_type="URGENT",
+            date="01/01/2027",
+            amount=10000.00)
+
+        with open(self.journal_file, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["transfer_code"], result)
+
+    @freeze_time("2025-05-23")
+    def test_journal_duplicate(self):
+        """TC2: Una transferencia repetida se rechaza igual que en modo JSON"""
+        for _ in range(2):
+            try:
+                self.manager.transfer_request(
+                    from_iban="ES9121000418450200051332",
+                    to_iban="ES6160606457126971492537",
+                    concept="Pago alquiler",
+                    transfer_type="ORDINARY",
+                    date="01/01/2027",
+                    amount=10.00)
+            except AccountManagementException as exc:
+                self.assertEqual(str(exc), "ERROR transfer already exists")
+        self.assertEqual(len(self.manager.read_transactions()), 1)
+
+    def test_journal_ignores_truncated_last_line(self):
+        """TC3: Una ultima linea incompleta no rompe la lectura"""
+        with open(self.journal_file, "w", encoding="utf-8") as file:
+            file.write('{"transfer_code": "a"}\n{"transfer_co')
+        self.assertEqual(self.manager.read_transactions(), [{"transfer_code": "a"}])
+
+    def test_journal_repairs_truncated_last_line(self):
+        """TC4: Al añadir tras una escritura interrumpida se descarta la linea incompleta"""
+        with open(self.journal_file, "w", encoding="utf-8") as file:
+            file.write('{"transfer_code": "a"}\n{"transfer_co')
+        self.manager.journal.append({"transfer_code": "b"})
+        self.assertEqual(self.manager.read_transactions(),
+                         [{"transfer_code": "a"}, {"transfer_code": "b"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
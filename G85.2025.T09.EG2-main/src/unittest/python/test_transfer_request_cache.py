@@ -0,0 +1,61 @@
+"""Tests para el transfer_code cacheado de TransferRequest"""
+
+import unittest
+import hashlib
+import json
+from uc3m_money import TransferRequest
+from freezegun import freeze_time
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests del calculo del codigo de TransferRequest"""
+
+    @freeze_time("2025-05-23")
+    def setUp(self):
+        self.request = TransferRequest("ES9121000418450200051332", "ORDINARY",
+                                       "ES6160606457126971492537", "Pago alquiler",
+                                       "01/01/2027", 10.00)
+
+    def test_code_matches_previous_format(self):
+        """TC1: El codigo es el MD5 del mismo texto que generaba json.dumps(__dict__)"""
+        legacy = "Transfer:" + json.dumps({
+            "_TransferRequest__from_iban": "ES9121000418450200051332",
+            "_TransferRequest__to_iban": "ES6160606457126971492537",
+            "_TransferRequest__transfer_type": "ORDINARY",
+            "_TransferRequest__concept": "Pago alquiler",
+            "_TransferRequest__transfer_date": "01/01/2027",
+            "_TransferRequest__transfer_amount": 10.00,
+            "_TransferRequest__time_stamp": self.request.time_stamp})
+        self.assertEqual(str(self.request), legacy)
+        self.assertEqual(self.request.transfer_code, hashlib.md5(legacy.encode()).hexdigest())
+        self.assertEqual(self.request.transfer_code, "60cf4031a7af271f0c5c3c4f1bb806d5")
+
+    def test_setters_invalidate_code(self):
+        """TC2: Cambiar cualquier campo recalcula el codigo"""
+        original = self.request.transfer_code
+        for name, value in (("from_iban", "ES6160606457126971492537"),
+                            ("to_iban", "ES9121000418450200051332"),
+                            ("transfer_type", "URGENT"),
+                            ("transfer_amount", 20.00),
+                            ("transfer_concept", "Pago del coche"),
+                            ("transfer_date", "02/01/2027")):
+            previous = self.request.transfer_code
+            setattr(self.request, name, value)
+            self.assertNotEqual(self.request.transfer_code, previous)
+            self.assertEqual(self.request.to_json()["transfer_code"],
+                             hashlib.md5(str(self.request).encode()).hexdigest())
+        self.assertNotEqual(self.request.transfer_code, original)
+
+    def test_concept_property(self):
+        """TC3: transfer_concept lee y escribe el concepto de la transferencia"""
+        self.assertEqual(self.request.transfer_concept, "Pago alquiler")
+        self.request.transfer_concept = "Pago del coche"
+        self.assertEqual(self.request.to_json()["transfer_concept"], "Pago del coche")
+
+    def test_slots(self):
+        """TC4: Los objetos no tienen __dict__"""
+        self.assertFalse(hasattr(self.request, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
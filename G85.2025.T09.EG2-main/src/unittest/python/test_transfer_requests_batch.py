@@ -0,0 +1,70 @@
+"""Tests para el procesamiento por lotes de transferencias"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from uc3m_money import AccountManager
+from freezegun import freeze_time
+
+VALID_TRANSFER = ("ES9121000418450200051332", "ES6160606457126971492537", "Pago alquiler",
+                  "ORDINARY", "01/01/2027", 10.00)
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de AccountManager.transfer_requests"""
+
+    def setUp(self):
+        """Fichero de transferencias vacio en una carpeta temporal"""
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_batch_")
+        self.manager = AccountManager(json_folder=self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    @freeze_time("2025-05-23")
+    def test_batch_results_per_item(self):
+        """TC1: Cada elemento devuelve su codigo o su mensaje de error sin detener el lote"""
+        results = self.manager.transfer_requests([
+            VALID_TRANSFER,
+            {"from_iban": "ES9121000418450200051332",
+             "to_iban": "ES6160606457126971492537",
+             "concept": "Compra coche",
+             "transfer_type": "URGENT",
+             "date": "01/01/2027",
+             "amount": 10000.00},
+            ("ES9121000418450200051332", "INVALIDO", "Pago alquiler",
+             "ORDINARY", "01/01/2027", 10.00),
+            ("ES9121000418450200051332",),
+        ])
+        self.assertEqual(results, ["60cf4031a7af271f0c5c3c4f1bb806d5",
+                                   "d5ec3dcc63cb81cd8eb416e57f494473",
+                                   "ERROR to iban not valid",
+                                   "ERROR transfer data not valid"])
+
+        with open(self.manager.transactions_file, "r", encoding="utf-8") as file:
+            data_list = json.load(file)
+        self.assertEqual([item["transfer_code"] for item in data_list], results[:2])
+
+    @freeze_time("2025-05-23")
+    def test_batch_duplicates(self):
+        """TC2: Se detectan duplicados dentro del lote y contra lo ya guardado"""
+        results = self.manager.transfer_requests([VALID_TRANSFER, VALID_TRANSFER])
+        self.assertEqual(results[1], "ERROR transfer already exists")
+        results = self.manager.transfer_requests([VALID_TRANSFER])
+        self.assertEqual(results, ["ERROR transfer already exists"])
+        self.assertEqual(len(self.manager.read_transactions()), 1)
+
+    @freeze_time("2025-05-23")
+    def test_batch_matches_single_requests(self):
+        """TC3: El lote guarda lo mismo que llamadas sueltas a transfer_request"""
+        code = self.manager.transfer_request(*VALID_TRANSFER)
+        single = self.manager.read_transactions()
+        os.remove(self.manager.transactions_file)
+        self.assertEqual(self.manager.transfer_requests([VALID_TRANSFER]), [code])
+        self.assertEqual(self.manager.read_transactions(), single)
+
+
+if __name__ == '__main__':
+    unittest.main()
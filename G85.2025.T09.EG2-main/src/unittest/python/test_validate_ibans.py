@@ -0,0 +1,79 @@
+"""Tests para la validacion masiva de IBAN"""
+
+import unittest
+import random
+from unittest import mock
+from uc3m_money import AccountManager, iban_validator
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+IBANS = [
+    "ES9121000418450200051332",
+    "ES6160606457126971492537",
+    "es91 2100 0418 4502 0005 1332",
+    "ES9121000418450200051333",
+    "ES9999999999999999999999",
+    "ES91ABCDE418450200051332",
+    "DE1111111111111111111111",
+    "ES76 2085 9291 6400 1234 56800",
+    "ES918450200051332",
+    "INVALIDO",
+    "",
+    "ES٩١21000418450200051332",
+    None,
+    12345,
+]
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de AccountManager.validate_ibans"""
+
+    def test_same_result_as_scalar(self):
+        """TC1: La mascara coincide con validate_iban en cada elemento"""
+        self.assertEqual(AccountManager.validate_ibans(IBANS),
+                         [AccountManager.validate_iban(iban) for iban in IBANS])
+
+    def test_random_ibans(self):
+        """TC2: Coincidencia con validate_iban sobre IBAN aleatorios"""
+        generator = random.Random(97)
+        ibans = ["ES" + "".join(generator.choice("0123456789") for _ in range(22))
+                 for _ in range(5000)]
+        expected = [AccountManager.validate_iban(iban) for iban in ibans]
+        self.assertEqual(AccountManager.validate_ibans(ibans), expected)
+        self.assertTrue(any(expected))
+
+    @unittest.skipIf(np is None, "numpy no instalado")
+    def test_numpy_array(self):
+        """TC3: Admite arrays de numpy y devuelve una lista de bool"""
+        mask = AccountManager.validate_ibans(np.array(IBANS[:11]))
+        self.assertIs(type(mask), list)
+        self.assertTrue(all(isinstance(valid, bool) for valid in mask))
+        self.assertEqual(mask, [AccountManager.validate_iban(iban) for iban in IBANS[:11]])
+
+    def test_scalar_matches_big_int_mod97(self):
+        """TC5: La reduccion por bloques coincide con el modulo 97 sobre el entero completo"""
+        generator = random.Random(1)
+        for _ in range(5000):
+            iban = "ES" + "".join(generator.choice("0123456789") for _ in range(22))
+            expected = int(iban[4:] + "1428" + iban[2:4]) % 97 == 1
+            self.assertEqual(AccountManager.validate_iban(iban), expected)
+            # Segunda llamada servida desde la cache
+            self.assertEqual(AccountManager.validate_iban(iban), expected)
+
+    def test_empty_input(self):
+        """TC4: Una entrada vacia devuelve una mascara vacia"""
+        self.assertEqual(AccountManager.validate_ibans([]), [])
+
+    def test_without_numpy(self):
+        """TC6: Sin numpy el resultado es el mismo y del mismo tipo"""
+        with mock.patch.object(iban_validator, "numpy", return_value=None) as numpy:
+            mask = AccountManager.validate_ibans(iter(IBANS))
+        numpy.assert_called()
+        self.assertIs(type(mask), list)
+        self.assertEqual(mask, AccountManager.validate_ibans(IBANS))
+
+
+if __name__ == '__main__':
+    unittest.main()
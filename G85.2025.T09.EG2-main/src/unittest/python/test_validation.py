@@ -0,0 +1,107 @@
+"""Tests para la validacion por lotes con codigos de error"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from freezegun import freeze_time
+from uc3m_money import AccountManager, AccountManagementException, ValidationPipeline
+from uc3m_money import validation
+
+IBAN = "ES9121000418450200051332"
+OTHER_IBAN = "ES6160606457126971492537"
+
+
+class MyTestCase(unittest.TestCase):
+    """Tests de uc3m_money.validation"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix="uc3m_money_validation_")
+        self.rejected_file = os.path.join(self.folder, "rejected.jsonl")
+        self.manager = AccountManager(json_folder=os.path.join(self.folder, "JsonFiles"))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def read_rejected(self) -> list:
+        """Lineas del fichero de rechazados"""
+        with open(self.rejected_file, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    @freeze_time("2025-05-23")
+    def test_transfer_codes_match_exceptions(self):
+        """TC1: Cada transferencia no valida da un codigo cuyo mensaje es el de la
+        excepcion de transfer_request, sin lanzar AccountManagementException"""
+        transfers = [
+            ("ES00", OTHER_IBAN, "Pago alquiler", "ORDINARY", "01/01/2027", 10.0),
+            (IBAN, "ES00", "Pago alquiler", "ORDINARY", "01/01/2027", 10.0),
+            (IBAN, OTHER_IBAN, "Pago", "ORDINARY", "01/01/2027", 10.0),
+            (IBAN, OTHER_IBAN, "Pago alquiler", "NORMAL", "01/01/2027", 10.0),
+            (IBAN, OTHER_IBAN, "Pago alquiler", "ORDINARY", "01/01/2024", 10.0),
+            (IBAN, OTHER_IBAN, "Pago alquiler", "ORDINARY", "01/01/2027", 9.99),
+        ]
+        with mock.patch.object(validation, "TransferRequest") as transfer_request, \
+                mock.patch.object(AccountManagementException, "__init__",
+                                  side_effect=AssertionError("exception raised")):
+            results = ValidationPipeline().transfers(transfers)
+        transfer_request.assert_not_called()
+        self.assertEqual([code for _, code, _ in results],
+                         [validation.FROM_IBAN_NOT_VALID, validation.TO_IBAN_NOT_VALID,
+                          validation.CONCEPT_NOT_VALID, validation.TRANSFER_TYPE_NOT_VALID,
+                          validation.DATE_NOT_VALID, validation.AMOUNT_NOT_VALID])
+        for transfer, (value, _, message) in zip(transfers, results):
+            self.assertIsNone(value)
+            with self.assertRaises(AccountManagementException) as context:
+                self.manager.transfer_request(*transfer)
+            self.assertEqual(context.exception.message, message)
+
+    @freeze_time("2025-05-23")
+    def test_rejected_transfers_side_file(self):
+        """TC2: transfer_requests guarda las validas y escribe las rechazadas con su
+        posicion, codigo y mensaje en el fichero de rechazados"""
+        valid = {"from_iban": IBAN, "to_iban": OTHER_IBAN, "concept": "Pago alquiler",
+                 "transfer_type": "URGENT", "date": "01/01/2027", "amount": 100.0}
+        results = self.manager.transfer_requests(
+            [valid, dict(valid, transfer_type="NORMAL"), {"from_iban": IBAN},
+             (IBAN, OTHER_IBAN, None, "ORDINARY", "01/01/2027", 10.0)],
+            rejected_file=self.rejected_file)
+        self.assertEqual(results[1:], ["ERROR transfer type not valid",
+                                       "ERROR transfer data not valid",
+                                       "ERROR transfer data not valid"])
+        self.assertEqual(self.manager.read_transactions()[0]["transfer_code"], results[0])
+        self.assertEqual(self.read_rejected(), [
+            {"index": 1, "code": "transfer_type_not_valid",
+             "error": "ERROR transfer type not valid",
+             "record": dict(valid, transfer_type="NORMAL")},
+            {"index": 2, "code": "transfer_data_not_valid",
+             "error": "ERROR transfer data not valid", "record": {"from_iban": IBAN}},
+            {"index": 3, "code": "transfer_data_not_valid",
+             "error": "ERROR transfer data not valid",
+             "record": [IBAN, OTHER_IBAN, None, "ORDINARY", "01/01/2027", 10.0]}])
+
+    def test_deposit_codes_match_exceptions(self):
+        """TC3: Los ingresos dan los codigos y mensajes de deposit_into_account"""
+        deposits = [{"IBAN": IBAN, "AMOUNT": "EUR 10.50"}, {"IBAN": IBAN},
+                    {"IBAN": "ES00", "AMOUNT": "EUR 1.00"}, {"IBAN": IBAN, "AMOUNT": "1.00"},
+                    {"IBAN": IBAN, "AMOUNT": "EUR abc"}, [IBAN, "EUR 1.00"]]
+        results = ValidationPipeline(self.rejected_file).deposits(deposits)
+        self.assertEqual(results[0], ((IBAN, 10.5), None, None))
+        self.assertEqual([code for _, code, _ in results[1:]],
+                         [validation.INPUT_STRUCTURE_NOT_VALID, validation.IBAN_NOT_VALID,
+                          validation.AMOUNT_FORMAT_NOT_VALID,
+                          validation.DEPOSIT_DATA_NOT_VALID,
+                          validation.INPUT_STRUCTURE_NOT_VALID])
+        for index, deposit in enumerate(deposits[1:], 1):
+            input_file = os.path.join(self.folder, f"deposit_{index}.json")
+            with open(input_file, "w", encoding="utf-8") as file:
+                json.dump(deposit, file)
+            summary = self.manager.deposit_files([input_file], workers=1)
+            self.assertEqual(summary["rejected"][input_file], results[index][2])
+        self.assertEqual([(line["index"], line["error"]) for line in self.read_rejected()],
+                         [(index, results[index][2]) for index in range(1, 6)])
+
+
+if __name__ == '__main__':
+    unittest.main()